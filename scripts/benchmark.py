@@ -0,0 +1,306 @@
+"""
+Benchmark suite for the news and price pipeline on synthetic data.
+
+Times each stage (news loading, date parsing, exact and sketched keyword
+counting, phrase counting, near-duplicate clustering, indicators, daily and
+multi-window financial metrics, event study, grid backtest) on data from
+``src.synthetic``, records throughput and peak traced memory to JSON and
+compares the run with a stored baseline, exiting with status 1 when a stage
+got slower or used more memory than the threshold allows.
+
+Usage:
+    python -m scripts.benchmark --rows 1000000 --symbols 5000 --output bench.json
+    python -m scripts.benchmark --baseline benchmarks/baseline.json --threshold 0.2
+    python -m scripts.benchmark --baseline benchmarks/baseline.json --update-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.backtest import backtest_grid
+from src.dates import parse_mixed_dates
+from src.events import EventStudy
+from src.heavy_hitters import stream_keywords
+from src.keywords import FINANCIAL_STOPWORDS, count_keywords
+from src.metrics import window_metrics
+from src.near_duplicates import NearDuplicateClusters
+from src.news_loader import load_news
+from src.panel import PricePanel
+from src.phrases import count_phrases
+from src.synthetic import make_news, make_stock_frames
+
+
+STAGES = ('load_news', 'load_news_cached', 'parse_dates', 'keywords', 'keyword_sketch', 'phrases',
+          'near_duplicates', 'indicators', 'metrics', 'window_metrics', 'event_study',
+          'backtest')
+DEFAULT_THRESHOLD = 0.2
+# Increases below these absolute amounts are treated as noise.
+MIN_INCREASE = {'seconds': 0.01, 'peak_mb': 1.0}
+
+
+@dataclass(frozen=True)
+class BenchmarkConfig:
+    """Size and shape of the synthetic data."""
+
+    rows: int = 100_000
+    symbols: int = 500
+    days: int = 252
+    publishers: int = 200
+    duplicate_ratio: float = 0.3
+    offset_ratio: float = 0.5
+    seed: int = 42
+
+
+def measure(func, repeat=3):
+    """Best wall time of ``repeat`` calls and the peak traced memory of one more.
+
+    Peak memory covers Python and NumPy allocations (``tracemalloc``); it is
+    measured in a separate call so tracing does not distort the timings.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def _stage_setups(config, workdir):
+    """Map stage name -> setup returning ``(func, n_items, unit)``.
+
+    Setups run outside the timed region and share generated data.
+    """
+    data = {}
+
+    def news():
+        if 'news' not in data:
+            data['news'] = make_news(config.rows, config.symbols, config.publishers,
+                                     config.duplicate_ratio, config.offset_ratio, config.seed)
+        return data['news']
+
+    def news_csv():
+        if 'csv' not in data:
+            data['csv'] = os.path.join(workdir, 'raw_analyst_ratings.csv')
+            news().to_csv(data['csv'], index=False)
+        return data['csv']
+
+    def panel():
+        if 'panel' not in data:
+            data['panel'] = PricePanel.from_frames(make_stock_frames(config.symbols, config.days, seed=config.seed))
+        return data['panel']
+
+    def load_cold():
+        path = news_csv()
+        return lambda: load_news(path, cache_dir=workdir, refresh=True), config.rows, 'rows'
+
+    def load_cached():
+        path = news_csv()
+        load_news(path, cache_dir=workdir)
+        return lambda: load_news(path, cache_dir=workdir), config.rows, 'rows'
+
+    def parse_dates():
+        values = news()['date']
+        return lambda: parse_mixed_dates(values), config.rows, 'rows'
+
+    def keywords():
+        headlines = news()['headline']
+        return lambda: count_keywords(headlines, stop_words=FINANCIAL_STOPWORDS), config.rows, 'headlines'
+
+    def keyword_sketch():
+        headlines = news()['headline']
+        return (lambda: stream_keywords(headlines, capacity=1_000, stop_words=FINANCIAL_STOPWORDS),
+                config.rows, 'headlines')
+
+    def phrases():
+        headlines = news()['headline']
+        return lambda: count_phrases(headlines), config.rows, 'headlines'
+
+    def near_duplicates():
+        headlines = news()['headline']
+        return lambda: NearDuplicateClusters.from_headlines(headlines), config.rows, 'headlines'
+
+    def indicators():
+        prices = panel()
+        return prices.indicators, config.symbols * config.days, 'symbol-days'
+
+    def metrics():
+        prices = panel()
+
+        def run():
+            returns = prices.daily_returns()
+            prices.cumulative_returns(returns)
+            prices.volatility(returns=returns)
+        return run, config.symbols * config.days, 'symbol-days'
+
+    def multi_window_metrics():
+        prices = panel()
+        return lambda: window_metrics(prices), config.symbols * config.days, 'symbol-days'
+
+    def event_study():
+        prices = panel()
+        rng = np.random.default_rng(config.seed)
+        events = pd.DataFrame({
+            'stock': prices.symbols[rng.integers(0, len(prices.symbols), config.rows)],
+            'date': prices.dates[rng.integers(0, len(prices.dates), config.rows)] + pd.Timedelta(hours=12),
+            'event_type': rng.choice(['upgrade', 'downgrade', 'price target'], config.rows),
+        })
+
+        def run():
+            EventStudy.from_events(events, prices).summary()
+        return run, config.rows, 'events'
+
+    def backtest():
+        prices = panel()
+        grid = {'fast': (5, 10, 20), 'slow': (30, 50, 100)}
+        return lambda: backtest_grid(prices, 'sma_cross', grid), 9 * config.symbols * config.days, 'cells'
+
+    return {
+        'load_news': load_cold,
+        'load_news_cached': load_cached,
+        'parse_dates': parse_dates,
+        'keywords': keywords,
+        'keyword_sketch': keyword_sketch,
+        'phrases': phrases,
+        'near_duplicates': near_duplicates,
+        'indicators': indicators,
+        'metrics': metrics,
+        'window_metrics': multi_window_metrics,
+        'event_study': event_study,
+        'backtest': backtest,
+    }
+
+
+def run_benchmarks(config=BenchmarkConfig(), stages=STAGES, repeat=3, verbose=False):
+    """Run the selected stages and return the results as a JSON-ready dict."""
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stages {sorted(unknown)}; expected some of {STAGES}")
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='benchmark-') as workdir:
+        setups = _stage_setups(config, workdir)
+        for name in stages:
+            func, n_items, unit = setups[name]()
+            seconds, peak = measure(func, repeat)
+            results[name] = {
+                'seconds': seconds,
+                'throughput': n_items / seconds if seconds > 0 else float('inf'),
+                'unit': f'{unit}/s',
+                'peak_mb': peak / 2**20,
+            }
+            if verbose:
+                print(f"{name:<18} {seconds:9.3f}s {results[name]['throughput']:14,.0f} {unit}/s "
+                      f"{results[name]['peak_mb']:9.1f} MB", flush=True)
+
+    return {
+        'config': asdict(config),
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+        },
+        'stages': results,
+    }
+
+
+def compare_to_baseline(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """List stages whose time or peak memory grew by more than ``threshold``.
+
+    Increases smaller than ``MIN_INCREASE`` (timer noise on tiny stages) are
+    ignored.
+
+    Returns:
+        List of dicts with 'stage', 'metric', 'baseline', 'current' and
+        'change' (relative increase), for stages present in both runs.
+    """
+    regressions = []
+    for stage, current in results['stages'].items():
+        previous = baseline.get('stages', {}).get(stage)
+        if previous is None:
+            continue
+        for metric, min_increase in MIN_INCREASE.items():
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = new / old - 1.0
+            if change > threshold and new - old > min_increase:
+                regressions.append({'stage': stage, 'metric': metric, 'baseline': old,
+                                    'current': new, 'change': change})
+    return regressions
+
+
+def read_results(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_results(path, results):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    defaults = BenchmarkConfig()
+    parser.add_argument('--rows', type=int, default=defaults.rows)
+    parser.add_argument('--symbols', type=int, default=defaults.symbols)
+    parser.add_argument('--days', type=int, default=defaults.days)
+    parser.add_argument('--publishers', type=int, default=defaults.publishers)
+    parser.add_argument('--duplicate-ratio', type=float, default=defaults.duplicate_ratio)
+    parser.add_argument('--offset-ratio', type=float, default=defaults.offset_ratio)
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('--stages', default=','.join(STAGES), help='Comma-separated stage names')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='Write results to this JSON file')
+    parser.add_argument('--baseline', help='Baseline JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Allowed relative increase of time / peak memory')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Overwrite the baseline with this run instead of comparing')
+    args = parser.parse_args(argv)
+
+    config = BenchmarkConfig(args.rows, args.symbols, args.days, args.publishers,
+                             args.duplicate_ratio, args.offset_ratio, args.seed)
+    stages = [name.strip() for name in args.stages.split(',') if name.strip()]
+    results = run_benchmarks(config, stages, args.repeat, verbose=True)
+    if args.output:
+        write_results(args.output, results)
+
+    if args.baseline and args.update_baseline:
+        write_results(args.baseline, results)
+        print(f"Baseline written to {args.baseline}")
+    elif args.baseline and os.path.exists(args.baseline):
+        baseline = read_results(args.baseline)
+        if baseline.get('config') != results['config']:
+            print("Warning: baseline was recorded with a different configuration")
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        for item in regressions:
+            print(f"REGRESSION {item['stage']} {item['metric']}: {item['baseline']:.3f} -> "
+                  f"{item['current']:.3f} (+{item['change']:.0%})")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+Cold-start import report for the analysis modules.
+
+Imports each module in a fresh interpreter with ``python -X importtime``,
+parses the timings and prints the total import time per module, the
+packages that dominate it and any heavy optional dependency (SciPy, NLTK,
+plotting libraries, ...) that was pulled in. Exits with status 1 when a
+module exceeds the time budget or, with ``--no-heavy``, imports a heavy
+dependency.
+
+Usage:
+    python -m scripts.import_time
+    python -m scripts.import_time src.keywords src.panel --budget 1.0 --no-heavy
+    python -m scripts.import_time scripts.pipeline --top 15 --output imports.json
+"""
+import argparse
+import functools
+import json
+import os
+import re
+import subprocess
+import sys
+
+import pandas as pd
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_PACKAGES = ('scipy', 'matplotlib', 'seaborn', 'nltk', 'wordcloud', 'textblob', 'gensim',
+                  'sklearn', 'talib', 'pynance')
+DEFAULT_MODULES = (
+    'src', 'src.keywords', 'src.heavy_hitters', 'src.phrases', 'src.near_duplicates', 'src.sentiment',
+    'src.news_loader', 'src.indicators', 'src.panel', 'src.metrics', 'src.events', 'src.backtest',
+    'src.correlation', 'scripts.pipeline',
+)
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$')
+
+
+def parse_importtime(text):
+    """Parse ``-X importtime`` output into a frame.
+
+    Returns:
+        DataFrame with 'module', 'self_s', 'cumulative_s' and 'depth'
+        (1 for modules imported directly by the measured statement), in
+        the order the interpreter reported them.
+    """
+    rows = []
+    for line in text.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us) / 1e6, int(cumulative_us) / 1e6, (len(indent) - 1) // 2 + 1))
+    return pd.DataFrame(rows, columns=['module', 'self_s', 'cumulative_s', 'depth'])
+
+
+def _run_importtime(statement, python):
+    """``-X importtime`` timings of one statement in a fresh interpreter."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [PROJECT_ROOT, os.environ.get('PYTHONPATH')])))
+    completed = subprocess.run([python, '-X', 'importtime', '-c', statement],
+                               cwd=PROJECT_ROOT, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{statement!r} failed:\n{completed.stderr.strip()[-2000:]}")
+    return parse_importtime(completed.stderr)
+
+
+@functools.lru_cache(maxsize=None)
+def startup_modules(python=sys.executable):
+    """Modules the interpreter imports before running any code (encodings, site, ...)."""
+    return frozenset(_run_importtime('pass', python)['module'])
+
+
+def measure_import(module, repeat=3, python=sys.executable):
+    """Import ``module`` in ``repeat`` fresh interpreters and keep the fastest run.
+
+    Interpreter start-up imports are left out of the timings.
+
+    Returns:
+        Tuple ``(seconds, timings)``: total import time of the fastest run
+        and its parsed timings.
+    """
+    startup = startup_modules(python)
+    best = None
+    for _ in range(repeat):
+        timings = _run_importtime(f'import {module}', python)
+        timings = timings[~timings['module'].isin(startup)].reset_index(drop=True)
+        seconds = timings.loc[timings['depth'] == 1, 'cumulative_s'].sum()
+        if best is None or seconds < best[0]:
+            best = (seconds, timings)
+    return best
+
+
+def package_times(timings):
+    """Self time summed per top-level package, slowest first."""
+    packages = timings['module'].str.split('.').str[0]
+    return timings.groupby(packages)['self_s'].sum().sort_values(ascending=False).rename('seconds')
+
+
+def heavy_imports(timings, heavy=HEAVY_PACKAGES):
+    """Heavy packages present in the import tree."""
+    loaded = set(timings['module'].str.split('.').str[0])
+    return [package for package in heavy if package in loaded]
+
+
+def import_report(modules=DEFAULT_MODULES, repeat=3):
+    """Measure every module and return a JSON-ready dict."""
+    report = {}
+    for module in modules:
+        seconds, timings = measure_import(module, repeat)
+        report[module] = {
+            'seconds': seconds,
+            'heavy': heavy_imports(timings),
+            'packages': package_times(timings).head(10).to_dict(),
+        }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=list(DEFAULT_MODULES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--top', type=int, default=5, help='Slowest packages shown per module')
+    parser.add_argument('--budget', type=float, help='Maximum import seconds per module')
+    parser.add_argument('--no-heavy', action='store_true', help='Fail if a heavy dependency is imported')
+    parser.add_argument('--output', help='Write the report to this JSON file')
+    args = parser.parse_args(argv)
+
+    report = import_report(args.modules, args.repeat)
+    failures = []
+    for module, result in report.items():
+        heavy = ', '.join(result['heavy']) or '-'
+        print(f"{module:<22} {result['seconds']:7.3f}s  heavy: {heavy}")
+        for package, seconds in list(result['packages'].items())[:args.top]:
+            print(f"    {package:<18} {seconds:7.3f}s")
+        if args.budget is not None and result['seconds'] > args.budget:
+            failures.append(f"{module} took {result['seconds']:.3f}s (budget {args.budget:.3f}s)")
+        if args.no_heavy and result['heavy']:
+            failures.append(f"{module} imports {heavy}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,451 @@
+"""
+Headless, incremental analysis pipeline with stage-level caching.
+
+The notebooks' work is expressed as a DAG of stages:
+
+    news -> news_clean -> sentiment -> daily_sentiment ----------.
+    prices:SYM -> prices_clean:SYM -> indicators:SYM -> metrics:SYM -> correlation
+                                                                  `-> metrics_summary
+
+Each task's fingerprint hashes its stage function's source code and that of
+every project module the stage can reach (so editing e.g.
+``src/indicators.py`` reruns the indicator stages), its version and
+parameters, the size and mtime of its source files and the fingerprints of
+its inputs. A
+task whose stored fingerprint still matches is skipped and its pickled
+output reused, so when one ticker's CSV changes only that ticker's branch
+and the stages combining all tickers run again. Tasks whose inputs are ready
+run concurrently (e.g. the per-symbol branches) in a thread or process pool.
+
+Usage:
+    python -m scripts.pipeline --news data/raw_analyst_ratings.csv --data-dir data \\
+        --symbols AAPL AMZN GOOG META MSFT NVDA
+    python -m scripts.pipeline --data-dir data --pattern 'data/*.csv' --dry-run
+
+Notebooks read the cached results instead of recomputing them:
+    from scripts.pipeline import load_output
+    correlations = load_output('correlation', cache_dir='../data/.cache/pipeline')
+"""
+import argparse
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import pickle
+import sys
+import sysconfig
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from src.alignment import align_news
+from src.cache import default_cache_dir, file_fingerprint
+from src.compact import compact_news
+from src.correlation import DEFAULT_LAGS, lagged_correlations
+from src.indicators import add_indicators
+from src.news_loader import load_news
+from src.sentiment import score_headlines
+from src.stock_loader import parse_stock_csv, resolve_stock_paths
+
+
+PIPELINE_DIR_NAME = 'pipeline'
+DEFAULT_SCORER = 'src.sentiment:textblob_scorer'
+TRADING_DAYS = 252
+
+
+@dataclass(frozen=True)
+class Task:
+    """One node of the pipeline DAG.
+
+    ``func`` is called as ``func(*outputs_of_inputs, **params)``; it must be a
+    module-level function when tasks run in a process pool.
+    """
+
+    key: str
+    func: object
+    inputs: tuple = ()
+    params: dict = field(default_factory=dict)
+    sources: tuple = ()
+    version: int = 1
+
+
+def code_fingerprint(func):
+    """Hash of a stage function's code and of the project modules it uses.
+
+    Besides the function itself, the source files of its module and of every
+    project module reachable from it (through imported modules, functions
+    and classes, transitively) are hashed, so editing a helper the stage
+    calls reruns the stage. Modules from the standard library and
+    site-packages are left out. Falls back to the bytecode and constants
+    when the source is not available (e.g. functions defined interactively),
+    and to the name for builtins.
+    """
+    try:
+        text = inspect.getsource(func)
+    except (OSError, TypeError):
+        code = getattr(func, '__code__', None)
+        if code is None:
+            text = f'{func.__module__}.{func.__qualname__}'
+        else:
+            text = repr((code.co_code, code.co_consts))
+    digest = hashlib.sha256(text.encode('utf-8'))
+    for name, path in sorted(_project_module_files(inspect.getmodule(func)).items()):
+        with open(path, 'rb') as f:
+            digest.update(name.encode('utf-8') + b'\0' + hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def _library_dirs():
+    """Directories holding the standard library and installed packages."""
+    paths = sysconfig.get_paths()
+    return tuple(os.path.normcase(os.path.abspath(paths[name]))
+                 for name in ('stdlib', 'platstdlib', 'purelib', 'platlib') if name in paths)
+
+
+def _project_module_files(module):
+    """Dict of module name -> source file for project modules reachable from ``module``."""
+    library = _library_dirs()
+    files = {}
+    pending = [module] if module is not None else []
+    seen = set()
+    while pending:
+        module = pending.pop()
+        if module.__name__ in seen:
+            continue
+        seen.add(module.__name__)
+        path = getattr(module, '__file__', None)
+        if not path or not path.endswith('.py') or os.path.normcase(os.path.abspath(path)).startswith(library):
+            continue
+        files[module.__name__] = path
+        for value in list(vars(module).values()):
+            if inspect.ismodule(value):
+                pending.append(value)
+            elif inspect.isfunction(value) or inspect.isclass(value):
+                owner = sys.modules.get(getattr(value, '__module__', None) or '')
+                if owner is not None:
+                    pending.append(owner)
+    return files
+
+
+class Pipeline:
+    """DAG of cached tasks.
+
+    Args:
+        cache_dir: Directory holding one ``.pkl`` output and ``.json``
+            manifest per task.
+        max_workers: Pool size (defaults to the executor's default).
+        use_processes: Use a process pool instead of threads.
+    """
+
+    def __init__(self, cache_dir, max_workers=None, use_processes=False):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self.tasks = {}
+        self._fingerprints = {}
+        self._outputs = {}
+
+    def add(self, key, func, inputs=(), params=None, sources=(), version=1):
+        """Add a task; its inputs must already have been added."""
+        if key in self.tasks:
+            raise ValueError(f"Duplicate task {key!r}")
+        unknown = [name for name in inputs if name not in self.tasks]
+        if unknown:
+            raise ValueError(f"Task {key!r} depends on unknown tasks {unknown}")
+        self.tasks[key] = Task(key, func, tuple(inputs), dict(params or {}), tuple(sources), version)
+        return key
+
+    def fingerprint(self, key):
+        """Hash of everything the task's output depends on."""
+        if key not in self._fingerprints:
+            task = self.tasks[key]
+            payload = {
+                'key': key,
+                'func': f'{task.func.__module__}.{task.func.__qualname__}',
+                'code': code_fingerprint(task.func),
+                'version': task.version,
+                'params': task.params,
+                'sources': [file_fingerprint(path) for path in task.sources],
+                'inputs': [self.fingerprint(name) for name in task.inputs],
+            }
+            encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+            self._fingerprints[key] = hashlib.sha256(encoded).hexdigest()
+        return self._fingerprints[key]
+
+    def _paths(self, key):
+        stem = os.path.join(self.cache_dir, key.replace(':', '__').replace(os.sep, '_'))
+        return stem + '.pkl', stem + '.json'
+
+    def is_cached(self, key):
+        """Whether a valid output for the task's current fingerprint is stored."""
+        output_path, manifest_path = self._paths(key)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+        return manifest.get('fingerprint') == self.fingerprint(key) and os.path.exists(output_path)
+
+    def plan(self, targets=None, force=False):
+        """Map each needed task (in dependency order) to 'run' or 'cached'."""
+        needed = self._ancestors(targets if targets is not None else list(self.tasks))
+        return {key: 'run' if force or not self.is_cached(key) else 'cached'
+                for key in self.tasks if key in needed}
+
+    def _ancestors(self, targets):
+        needed, stack = set(), list(targets)
+        while stack:
+            key = stack.pop()
+            if key not in self.tasks:
+                raise KeyError(f"Unknown task {key!r}")
+            if key not in needed:
+                needed.add(key)
+                stack.extend(self.tasks[key].inputs)
+        return needed
+
+    def run(self, targets=None, force=False):
+        """Run stale tasks, each as soon as its inputs are available.
+
+        Returns:
+            Dict of task -> {'status': 'ran' | 'cached', 'seconds': float}.
+        """
+        plan = self.plan(targets, force)
+        report = {key: {'status': 'cached', 'seconds': 0.0} for key, status in plan.items() if status == 'cached'}
+        waiting = {key: {name for name in self.tasks[key].inputs if plan.get(name) == 'run'}
+                   for key, status in plan.items() if status == 'run'}
+        if not waiting:
+            return report
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        pool_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+        with pool_class(max_workers=self.max_workers) as pool:
+            running = {}
+
+            def submit_ready():
+                for key in [key for key, deps in waiting.items() if not deps]:
+                    del waiting[key]
+                    task = self.tasks[key]
+                    args = [self.output(name) for name in task.inputs]
+                    running[pool.submit(_timed_call, task.func, args, task.params)] = key
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    try:
+                        result, seconds = future.result()
+                    except Exception as exc:
+                        for other in running:
+                            other.cancel()
+                        raise RuntimeError(f"Stage {key!r} failed: {exc}") from exc
+                    self._store(key, result)
+                    report[key] = {'status': 'ran', 'seconds': seconds}
+                    for deps in waiting.values():
+                        deps.discard(key)
+                submit_ready()
+        return {key: report[key] for key in plan}
+
+    def _store(self, key, result):
+        """Write the output, then its manifest, each atomically."""
+        self._outputs[key] = result
+        output_path, manifest_path = self._paths(key)
+        _atomic_write(output_path, 'wb', lambda f: pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL))
+        manifest = {'key': key, 'fingerprint': self.fingerprint(key), 'created': time.time()}
+        _atomic_write(manifest_path, 'w', lambda f: json.dump(manifest, f))
+
+    def output(self, key):
+        """Output of a task, from this run or from the cache."""
+        if key not in self._outputs:
+            with open(self._paths(key)[0], 'rb') as f:
+                self._outputs[key] = pickle.load(f)
+        return self._outputs[key]
+
+
+def _atomic_write(path, mode, write):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, mode, **({} if 'b' in mode else {'encoding': 'utf-8'})) as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def _timed_call(func, args, params):
+    start = time.perf_counter()
+    result = func(*args, **params)
+    return result, time.perf_counter() - start
+
+
+# Stage functions -----------------------------------------------------------
+
+def load_news_stage(path):
+    """Raw news frame via the columnar news cache."""
+    return load_news(path)
+
+
+def clean_news(df):
+    """Compact frame (categorical publisher/stock, Arrow strings) with a date."""
+    return compact_news(df.dropna(subset=['date']).reset_index(drop=True))
+
+
+def load_prices(path, symbol):
+    """Parsed and validated OHLCV frame of one symbol."""
+    return parse_stock_csv(path, symbol)
+
+
+def clean_prices(df):
+    """Sort by date, keep the last row per date and drop rows without a Close."""
+    df = df.sort_index()
+    df = df[~df.index.duplicated(keep='last')]
+    return df.dropna(subset=['Close'])
+
+
+def financial_metrics(df, symbol):
+    """Per-day return columns and summary metrics (the notebook's
+    ``calculate_financial_metrics``).
+
+    Returns:
+        Tuple ``(frame, metrics)``: ``df`` with Daily_Return,
+        Cumulative_Return and Volatility columns, and a dict of summary values.
+    """
+    df = df.copy()
+    df['Daily_Return'] = df['Close'].pct_change()
+    df['Cumulative_Return'] = (1 + df['Daily_Return']).cumprod() - 1
+    df['Volatility'] = df['Daily_Return'].rolling(window=30).std() * np.sqrt(TRADING_DAYS)
+
+    metrics = {'Symbol': symbol}
+    metrics['Total_Return'] = df['Cumulative_Return'].iloc[-1] * 100
+    metrics['Annualized_Return'] = ((df['Close'].iloc[-1] / df['Close'].iloc[0]) ** (TRADING_DAYS / len(df)) - 1) * 100
+    metrics['Volatility_30d'] = df['Volatility'].iloc[-1] * 100
+    metrics['Max_Drawdown'] = ((df['Close'] / df['Close'].expanding().max()) - 1).min() * 100
+    metrics['Sharpe_Ratio'] = (metrics['Annualized_Return'] / metrics['Volatility_30d']
+                               if metrics['Volatility_30d'] > 0 else 0)
+    metrics['Current_Price'] = df['Close'].iloc[-1]
+    metrics['52W_High'] = df['High'].rolling(window=TRADING_DAYS).max().iloc[-1]
+    metrics['52W_Low'] = df['Low'].rolling(window=TRADING_DAYS).min().iloc[-1]
+    metrics['Avg_Volume'] = df['Volume'].mean()
+    return df, metrics
+
+
+def metrics_summary(*outputs):
+    """One row of summary metrics per symbol (the notebook's ``metrics_df``)."""
+    return pd.DataFrame([metrics for _, metrics in outputs])
+
+
+def resolve_scorer(spec):
+    """Import a scorer given as 'module:function'."""
+    module_name, _, attribute = spec.partition(':')
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def score_sentiment(news, scorer=DEFAULT_SCORER, cache=None, n_jobs=1):
+    """Polarity and subjectivity per headline, next to date and stock."""
+    scores, _ = score_headlines(news['headline'], resolve_scorer(scorer), cache=cache, n_jobs=n_jobs)
+    return pd.concat([news[['date', 'stock']].reset_index(drop=True), scores.reset_index(drop=True)], axis=1)
+
+
+def daily_sentiment(sentiment, *prices, symbols):
+    """Article count and mean polarity per (stock, trading day)."""
+    return align_news(sentiment, dict(zip(symbols, prices)), sentiment_col='polarity')
+
+
+def correlation(daily, *metric_outputs, symbols, lags):
+    """Lagged sentiment/return correlations per symbol."""
+    sentiment = daily.assign(stock=daily['stock'].astype(str)).pivot(
+        index='trading_day', columns='stock', values='mean_sentiment')
+    returns = pd.DataFrame({symbol: frame['Daily_Return'] for symbol, (frame, _) in zip(symbols, metric_outputs)})
+    return lagged_correlations(sentiment, returns, lags=lags)
+
+
+def build_pipeline(stock_paths, news_path=None, cache_dir=None, scorer=DEFAULT_SCORER,
+                   lags=DEFAULT_LAGS, sentiment_jobs=1, max_workers=None, use_processes=False):
+    """Assemble the standard pipeline.
+
+    Args:
+        stock_paths: Dict of symbol -> CSV path (see ``resolve_stock_paths``).
+        news_path: News CSV; without it only the price branches are built.
+        cache_dir: Stage cache (defaults to ``.cache/pipeline`` next to the
+            news CSV, or next to the first stock CSV).
+        scorer: Sentiment scorer as 'module:function'.
+        lags: Correlation lags.
+        sentiment_jobs: Worker processes for sentiment scoring.
+        max_workers: Pool size for running independent stages.
+        use_processes: Run stages in processes instead of threads.
+    """
+    if cache_dir is None:
+        anchor = news_path or next(iter(stock_paths.values()))
+        cache_dir = os.path.join(default_cache_dir(anchor), PIPELINE_DIR_NAME)
+    pipeline = Pipeline(cache_dir, max_workers=max_workers, use_processes=use_processes)
+    symbols = list(stock_paths)
+
+    for symbol, path in stock_paths.items():
+        pipeline.add(f'prices:{symbol}', load_prices, params={'path': path, 'symbol': symbol}, sources=[path])
+        pipeline.add(f'prices_clean:{symbol}', clean_prices, inputs=[f'prices:{symbol}'])
+        pipeline.add(f'indicators:{symbol}', add_indicators, inputs=[f'prices_clean:{symbol}'])
+        pipeline.add(f'metrics:{symbol}', financial_metrics, inputs=[f'indicators:{symbol}'],
+                     params={'symbol': symbol})
+    metric_keys = [f'metrics:{symbol}' for symbol in symbols]
+    pipeline.add('metrics_summary', metrics_summary, inputs=metric_keys)
+
+    if news_path is not None:
+        pipeline.add('news', load_news_stage, params={'path': news_path}, sources=[news_path])
+        pipeline.add('news_clean', clean_news, inputs=['news'])
+        pipeline.add('sentiment', score_sentiment, inputs=['news_clean'],
+                     params={'scorer': scorer, 'cache': os.path.join(cache_dir, 'sentiment.sqlite'),
+                             'n_jobs': sentiment_jobs})
+        pipeline.add('daily_sentiment', daily_sentiment,
+                     inputs=['sentiment'] + [f'prices_clean:{symbol}' for symbol in symbols],
+                     params={'symbols': symbols})
+        pipeline.add('correlation', correlation, inputs=['daily_sentiment'] + metric_keys,
+                     params={'symbols': symbols, 'lags': list(lags)})
+    return pipeline
+
+
+def load_output(key, cache_dir):
+    """Load a cached stage output (e.g. 'correlation', 'metrics:AAPL')."""
+    path = os.path.join(cache_dir, key.replace(':', '__').replace(os.sep, '_') + '.pkl')
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--news', help='News CSV (raw_analyst_ratings.csv)')
+    parser.add_argument('--data-dir', default='data', help='Directory with {symbol}.csv files')
+    parser.add_argument('--symbols', nargs='*', help='Ticker symbols to process')
+    parser.add_argument('--pattern', help="Glob of stock CSVs instead of --symbols (e.g. 'data/*.csv')")
+    parser.add_argument('--cache-dir', help='Stage cache directory')
+    parser.add_argument('--scorer', default=DEFAULT_SCORER, help="Sentiment scorer as 'module:function'")
+    parser.add_argument('--lags', type=int, nargs='*', default=list(DEFAULT_LAGS))
+    parser.add_argument('--targets', nargs='*', help='Only build these stages (and their inputs)')
+    parser.add_argument('--workers', type=int, help='Number of concurrent stages')
+    parser.add_argument('--processes', action='store_true', help='Run stages in processes')
+    parser.add_argument('--sentiment-jobs', type=int, default=1)
+    parser.add_argument('--force', action='store_true', help='Ignore cached outputs')
+    parser.add_argument('--dry-run', action='store_true', help='Only show which stages would run')
+    args = parser.parse_args(argv)
+
+    stock_paths = resolve_stock_paths(args.symbols, args.data_dir, args.pattern)
+    pipeline = build_pipeline(stock_paths, args.news, args.cache_dir, args.scorer, args.lags,
+                              args.sentiment_jobs, args.workers, args.processes)
+    if args.dry_run:
+        for key, status in pipeline.plan(args.targets, args.force).items():
+            print(f"{status:<7} {key}")
+        return 0
+
+    started = time.perf_counter()
+    report = pipeline.run(args.targets, args.force)
+    for key, item in report.items():
+        detail = f"{item['seconds']:.2f}s" if item['status'] == 'ran' else ''
+        print(f"{item['status']:<7} {key:<28} {detail}")
+    n_ran = sum(item['status'] == 'ran' for item in report.values())
+    print(f"{n_ran} of {len(report)} stages ran in {time.perf_counter() - started:.2f}s; "
+          f"outputs in {pipeline.cache_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""
+Analysis modules for the financial news and stock price data.
+
+The main entry points can be reached from the package itself, e.g.
+``src.count_keywords``. They are imported on first access (PEP 562), so
+``import src`` stays cheap and a worker only pays for the modules its
+stages use.
+"""
+import importlib
+
+
+_EXPORTS = {
+    'align_news': 'alignment',
+    'backtest_grid': 'backtest',
+    'compact_news': 'compact',
+    'compute_indicators': 'indicators',
+    'count_keywords': 'keywords',
+    'count_phrases': 'phrases',
+    'EventStudy': 'events',
+    'HeadlineIndex': 'headline_index',
+    'lagged_correlations': 'correlation',
+    'load_news': 'news_loader',
+    'load_stocks': 'stock_loader',
+    'NearDuplicateClusters': 'near_duplicates',
+    'parse_mixed_dates': 'dates',
+    'PricePanel': 'panel',
+    'PublisherCoverage': 'coverage',
+    'score_headlines': 'sentiment',
+    'stream_keywords': 'heavy_hitters',
+    'StreamingIndicators': 'streaming',
+    'TemporalCube': 'temporal',
+    'window_metrics': 'metrics',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
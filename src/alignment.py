@@ -0,0 +1,166 @@
+"""
+As-of alignment of news timestamps to the trading days they can affect.
+
+A headline published before the market close belongs to that day's session;
+one published at or after the close, or on a weekend/holiday, rolls forward
+to the stock's next trading day. Every stock's calendar is encoded as sorted
+``stock_code * span + day`` keys, so all headlines of all stocks are matched
+with a single ``np.searchsorted`` and aggregated per (stock, trading day)
+with ``np.bincount`` instead of per-row lookups or per-stock merges.
+"""
+import numpy as np
+import pandas as pd
+
+from .panel import PricePanel
+from .profiling import instrument
+
+
+DEFAULT_MARKET_CLOSE = '16:00'
+DEFAULT_TIMEZONE = 'America/New_York'
+NS_PER_DAY = 86_400 * 10**9
+MISSING_DAY = np.iinfo(np.int64).min
+
+
+def calendar_days(calendars):
+    """Sorted unique int64 day numbers (days since epoch) per symbol.
+
+    Args:
+        calendars: PricePanel, or dict of symbol -> DataFrame / Series /
+            DatetimeIndex whose index (or values) are the trading dates.
+    """
+    if isinstance(calendars, PricePanel):
+        mask = calendars.mask
+        items = {symbol: calendars.dates[mask[:, j]] for j, symbol in enumerate(calendars.symbols)}
+    else:
+        items = {symbol: value if isinstance(value, pd.DatetimeIndex) else value.index
+                 for symbol, value in calendars.items()}
+
+    days = {}
+    for symbol, dates in items.items():
+        dates = pd.DatetimeIndex(dates)
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        values = dates.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+        days[symbol] = np.unique(values)
+    return days
+
+
+def session_days(timestamps, market_close=DEFAULT_MARKET_CLOSE, tz=DEFAULT_TIMEZONE, naive_tz='UTC'):
+    """Day number of the session each timestamp can first affect.
+
+    Timestamps are converted to the exchange time zone ``tz``; those at or
+    after ``market_close`` move to the next calendar day. Weekends and
+    holidays are rolled forward later against each stock's calendar.
+
+    Args:
+        timestamps: Datetime-like Series or array (NaT allowed).
+        market_close: Cutoff time of day ('HH:MM'), or None to use the
+            local calendar date.
+        tz: Exchange time zone.
+        naive_tz: Time zone assumed for naive timestamps (``load_news``
+            returns naive UTC).
+
+    Returns:
+        int64 array of days since epoch; NaT maps to ``MISSING_DAY``.
+    """
+    dates = pd.DatetimeIndex(pd.to_datetime(timestamps))
+    if dates.tz is None:
+        dates = dates.tz_localize(naive_tz)
+    local = dates.tz_convert(tz).tz_localize(None).to_numpy(dtype='datetime64[ns]')
+
+    if market_close is None:
+        days = local.view(np.int64) // NS_PER_DAY
+    else:
+        close = pd.Timestamp(f'1970-01-01 {market_close}').value
+        days = (local.view(np.int64) - close) // NS_PER_DAY + 1
+    days[np.isnat(local)] = MISSING_DAY
+    return days
+
+
+def _match_slots(news, calendars, date_col, stock_col, market_close, tz, naive_tz):
+    """Match rows to positions in the concatenated (stock, day) calendar.
+
+    Returns:
+        Tuple ``(slots, slot_codes, slot_days, symbols)``: ``slots`` gives
+        each row's position in the concatenated calendar (-1 when the stock
+        is unknown, the date is missing or outside the stock's calendar),
+        and ``slot_codes`` / ``slot_days`` give each position's stock code
+        and day number.
+    """
+    days = calendar_days(calendars)
+    symbols = list(days)
+    lengths = np.array([len(days[s]) for s in symbols], dtype=np.int64)
+    slot_codes = np.repeat(np.arange(len(symbols)), lengths)
+    slot_days = np.concatenate([days[s] for s in symbols]) if symbols else np.empty(0, np.int64)
+    if len(slot_days) == 0:
+        return np.full(len(news), -1), slot_codes, slot_days, symbols
+
+    codes = pd.Categorical(news[stock_col], categories=symbols).codes.astype(np.int64)
+    news_days = session_days(news[date_col], market_close, tz, naive_tz)
+    ends = np.cumsum(lengths)
+    first_days = slot_days[ends - lengths]
+
+    # Keys ordered by (stock, day): one searchsorted finds, for every row,
+    # the first trading day of its own stock on or after its session day.
+    lo, span = slot_days.min(), slot_days.max() - slot_days.min() + 2
+    safe_codes = np.maximum(codes, 0)
+    row_days = np.clip(news_days, lo, lo + span - 1)
+    slots = np.searchsorted(slot_codes * span + (slot_days - lo), safe_codes * span + (row_days - lo))
+
+    matched = ((codes >= 0) & (news_days != MISSING_DAY) & (news_days >= first_days[safe_codes])
+               & (slots < ends[safe_codes]))
+    return np.where(matched, slots, -1), slot_codes, slot_days, symbols
+
+
+def assign_trading_days(news, calendars, date_col='date', stock_col='stock',
+                        market_close=DEFAULT_MARKET_CLOSE, tz=DEFAULT_TIMEZONE, naive_tz='UTC'):
+    """Trading day each headline is assigned to, aligned with ``news``.
+
+    Headlines of unknown stocks, without a date, or outside their stock's
+    calendar get NaT. See ``align_news`` for the arguments.
+    """
+    slots, _, slot_days, _ = _match_slots(news, calendars, date_col, stock_col, market_close, tz, naive_tz)
+    values = np.full(len(news), np.datetime64('NaT'), dtype='datetime64[ns]')
+    matched = slots >= 0
+    values[matched] = slot_days[slots[matched]].astype('datetime64[D]')
+    return pd.Series(values, index=news.index, name='trading_day')
+
+
+@instrument(rows=0)
+def align_news(news, calendars, date_col='date', stock_col='stock', sentiment_col=None,
+               market_close=DEFAULT_MARKET_CLOSE, tz=DEFAULT_TIMEZONE, naive_tz='UTC'):
+    """Aggregate headlines per (stock, trading day) in one grouped pass.
+
+    Args:
+        news: News frame with date and stock columns.
+        calendars: PricePanel or dict of symbol -> price frame / DatetimeIndex.
+        date_col: Timestamp column.
+        stock_col: Ticker column.
+        sentiment_col: Optional score column (e.g. 'polarity') to average.
+        market_close: Cutoff time ('HH:MM'); later headlines count toward the
+            next trading day. None uses the local calendar date.
+        tz: Exchange time zone.
+        naive_tz: Time zone of naive timestamps.
+
+    Returns:
+        DataFrame with 'stock', 'trading_day', 'article_count' and (with a
+        sentiment column) 'mean_sentiment', sorted by stock and day.
+    """
+    slots, slot_codes, slot_days, symbols = _match_slots(
+        news, calendars, date_col, stock_col, market_close, tz, naive_tz)
+    matched = slots >= 0
+    groups, inverse = np.unique(slots[matched], return_inverse=True)
+
+    result = pd.DataFrame({
+        'stock': pd.Categorical.from_codes(slot_codes[groups], categories=symbols),
+        'trading_day': slot_days[groups].astype('datetime64[D]').astype('datetime64[ns]'),
+        'article_count': np.bincount(inverse, minlength=len(groups)),
+    })
+    if sentiment_col is not None:
+        scores = news[sentiment_col].to_numpy(dtype=np.float64, na_value=np.nan)[matched]
+        scored = ~np.isnan(scores)
+        totals = np.bincount(inverse[scored], weights=scores[scored], minlength=len(groups))
+        n_scored = np.bincount(inverse[scored], minlength=len(groups))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result['mean_sentiment'] = totals / n_scored
+    return result
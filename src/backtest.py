@@ -0,0 +1,269 @@
+"""
+Vectorized parameter-grid backtests of indicator trading rules.
+
+``backtest_grid`` evaluates every combination of a rule's parameters on
+every symbol at once. Indicators are computed once per distinct window with
+``compute_indicators`` and broadcast against the grid into (combinations x
+dates x symbols) arrays, from which positions, strategy returns, equity
+curves, Sharpe ratios and drawdowns follow without Python loops over
+combinations or symbols.
+
+Rules produce a target state per bar: 1 (long), -1 (short) or 0 (no
+signal). 'sma_cross' is long while the fast SMA is above the slow one;
+'rsi' goes long when RSI falls below ``lower`` and short when it rises above
+``upper``; 'bollinger' goes long when the close breaks above the upper band
+and short below the lower band. The last state is held until the next
+signal. With ``long_only`` short states mean flat.
+
+Each symbol is backtested on its own trading days: its rows are
+right-aligned (``metrics.right_align``) before indicators are computed, so
+a day it did not trade neither breaks its indicator windows nor costs a
+trade, and the results match a backtest of the symbol's own DataFrame.
+
+A state decided on a close is traded on that close, so it earns the next
+day's return. The grid is split into chunks of combinations to bound the
+size of the broadcast arrays, and chunks can run in a process pool.
+"""
+import functools
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .indicators import IndicatorSpec, compute_indicators
+from .metrics import alignment_order, right_align
+from .panel import TRADING_DAYS, PricePanel
+from .profiling import instrument
+
+
+STRATEGIES = {
+    'sma_cross': ('fast', 'slow'),
+    'rsi': ('window', 'lower', 'upper'),
+    'bollinger': ('window', 'num_std'),
+}
+DEFAULT_GRIDS = {
+    'sma_cross': {'fast': (5, 10, 20, 50), 'slow': (50, 100, 200)},
+    'rsi': {'window': (7, 14, 21), 'lower': (20, 25, 30), 'upper': (70, 75, 80)},
+    'bollinger': {'window': (10, 20, 50), 'num_std': (1.5, 2.0, 2.5)},
+}
+BACKTEST_COLUMNS = ['Total_Return', 'Annualized_Return', 'Volatility', 'Sharpe_Ratio', 'Max_Drawdown',
+                    'Trades', 'Exposure']
+# Combinations x dates x symbols cells per chunk (~40 MB per float64 array).
+DEFAULT_MAX_CELLS = 5_000_000
+
+
+class BacktestResult:
+    """Metrics of every parameter combination.
+
+    Attributes:
+        metrics: DataFrame indexed by the rule's parameters and 'Symbol'
+            with ``BACKTEST_COLUMNS`` for each combination on each symbol.
+        portfolio: DataFrame indexed by the parameters with the same
+            columns for the equal-weighted portfolio of all symbols.
+    """
+
+    def __init__(self, metrics, portfolio):
+        self.metrics = metrics
+        self.portfolio = portfolio
+
+    def best(self, n=10, by='Sharpe_Ratio'):
+        """The ``n`` combinations with the best portfolio ``by`` metric."""
+        return self.portfolio.sort_values(by, ascending=False, kind='stable').head(n)
+
+
+def parameter_grid(strategy, grid=None):
+    """All valid parameter combinations of a rule as a DataFrame.
+
+    Combinations where the fast SMA is not shorter than the slow one, or the
+    RSI ``lower`` threshold is not below ``upper``, are dropped.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy!r}; expected one of {sorted(STRATEGIES)}")
+    names = STRATEGIES[strategy]
+    grid = DEFAULT_GRIDS[strategy] if grid is None else grid
+    missing = [name for name in names if name not in grid]
+    if missing:
+        raise ValueError(f"Grid for {strategy!r} is missing {missing}")
+    params = pd.DataFrame(list(itertools.product(*(np.atleast_1d(grid[name]) for name in names))), columns=names)
+    if strategy == 'sma_cross':
+        params = params[params['fast'] < params['slow']]
+    elif strategy == 'rsi':
+        params = params[params['lower'] < params['upper']]
+    # Neighbouring combinations share windows, so chunks reuse indicators.
+    return params.sort_values(list(names), kind='stable').reset_index(drop=True)
+
+
+@instrument(rows=0)
+def backtest_grid(prices, strategy='sma_cross', grid=None, cost=0.0, long_only=True, chunksize=None, n_jobs=1,
+                  periods_per_year=TRADING_DAYS):
+    """Backtest every parameter combination of a rule on every symbol.
+
+    Args:
+        prices: PricePanel, or DataFrame (dates x symbols) of closes with
+            NaN where a symbol has no data.
+        strategy: One of ``STRATEGIES``.
+        grid: Mapping parameter -> values; defaults to ``DEFAULT_GRIDS``.
+        cost: Cost per unit of position change, as a fraction of the price
+            (0.001 = 10 bps).
+        long_only: Treat short states as flat.
+        chunksize: Combinations evaluated per broadcast; by default as many
+            as fit in ``DEFAULT_MAX_CELLS``.
+        n_jobs: Number of worker processes; 1 runs in the current process.
+        periods_per_year: Periods used to annualize returns and volatility.
+
+    Returns:
+        BacktestResult. Returns and drawdowns are in percent and
+        Sharpe_Ratio is Annualized_Return / Volatility, as in
+        ``window_metrics``. Trades counts position changes and Exposure is
+        the percentage of days with a position.
+    """
+    params = parameter_grid(strategy, grid)
+    if not isinstance(prices, PricePanel):
+        prices = PricePanel(prices.index, prices.columns, ['Close'],
+                            prices.to_numpy(dtype=np.float64, na_value=np.nan)[..., np.newaxis])
+    valid = prices.mask
+    order = alignment_order(valid)
+    close = right_align(prices['Close'], valid, order)[0]
+    returns = prices.daily_returns()
+    traded = (~np.isnan(returns)).sum(axis=1)
+    returns = right_align(returns, valid, order)[0]
+    if chunksize is None:
+        chunksize = max(1, DEFAULT_MAX_CELLS // max(close.size, 1))
+    chunks = [params.iloc[start:start + chunksize] for start in range(0, len(params), chunksize)]
+
+    run_chunk = functools.partial(_backtest_chunk, close=close, returns=returns, order=order, traded=traded,
+                                  strategy=strategy, cost=cost, long_only=long_only,
+                                  periods_per_year=periods_per_year)
+    if n_jobs == 1 or len(chunks) <= 1:
+        cache = {}
+        results = [run_chunk(chunk, cache=cache) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            results = list(pool.map(run_chunk, chunks))
+
+    n_columns, n_symbols = len(BACKTEST_COLUMNS), len(prices.symbols)
+    per_symbol = np.concatenate([r[0] for r in results]) if results else np.empty((0, n_symbols, n_columns))
+    portfolio = np.concatenate([r[1] for r in results]) if results else np.empty((0, n_columns))
+    levels = [params[name].repeat(n_symbols).to_numpy() for name in params.columns]
+    index = pd.MultiIndex.from_arrays(levels + [np.tile(prices.symbols, len(params))],
+                                      names=list(params.columns) + ['Symbol'])
+    metrics = pd.DataFrame(per_symbol.reshape(-1, n_columns), columns=BACKTEST_COLUMNS, index=index)
+    portfolio = pd.DataFrame(portfolio, columns=BACKTEST_COLUMNS, index=pd.MultiIndex.from_frame(params))
+    return BacktestResult(metrics, portfolio)
+
+
+def hold_states(signals):
+    """Carry the last non-zero state forward along axis 1 (0 before the first)."""
+    n_dates = signals.shape[1]
+    shape = (1, n_dates) + (1,) * (signals.ndim - 2)
+    index = np.where(signals != 0, np.arange(n_dates).reshape(shape), -1)
+    np.maximum.accumulate(index, axis=1, out=index)
+    held = np.take_along_axis(signals, np.maximum(index, 0), axis=1)
+    held[index < 0] = 0
+    return held
+
+
+def strategy_states(close, strategy, params, cache=None):
+    """Target states (combinations, dates, symbols) of a rule.
+
+    Args:
+        close: (T, S) array of closes, each symbol's trading days
+            right-aligned (see ``metrics.right_align``).
+        strategy: One of ``STRATEGIES``.
+        params: DataFrame of combinations (see ``parameter_grid``).
+        cache: Optional dict reused across calls to share indicators.
+    """
+    cache = {} if cache is None else cache
+    indicator = functools.partial(_indicator, close, cache)
+    with np.errstate(invalid='ignore'):
+        if strategy == 'sma_cross':
+            fast = np.stack([indicator(IndicatorSpec('sma', window=int(w)))[0] for w in params['fast']])
+            slow = np.stack([indicator(IndicatorSpec('sma', window=int(w)))[0] for w in params['slow']])
+            # Comparisons with NaN are False: no state until both averages exist.
+            return (fast > slow).astype(np.int8) - (fast < slow).astype(np.int8)
+
+        if strategy == 'rsi':
+            rsi = np.stack([indicator(IndicatorSpec('rsi', window=int(w)))[0] for w in params['window']])
+            lower = params['lower'].to_numpy(dtype=np.float64)[:, np.newaxis, np.newaxis]
+            upper = params['upper'].to_numpy(dtype=np.float64)[:, np.newaxis, np.newaxis]
+            signals = (rsi < lower).astype(np.int8) - (rsi > upper).astype(np.int8)
+            return hold_states(signals)
+
+        if strategy == 'bollinger':
+            # Bands at one standard deviation give the middle and the width.
+            bands = [indicator(IndicatorSpec('bollinger', window=int(w), num_std=1.0)) for w in params['window']]
+            middle = np.stack([band[1] for band in bands])
+            width = np.stack([band[0] - band[1] for band in bands])
+            width *= params['num_std'].to_numpy(dtype=np.float64)[:, np.newaxis, np.newaxis]
+            signals = (close > middle + width).astype(np.int8) - (close < middle - width).astype(np.int8)
+            return hold_states(signals)
+
+    raise ValueError(f"Unknown strategy {strategy!r}; expected one of {sorted(STRATEGIES)}")
+
+
+def _indicator(close, cache, spec):
+    """Indicator outputs as a list of (T, S) arrays, computed once per spec."""
+    if spec not in cache:
+        _, block = compute_indicators({'Close': close}, [spec])
+        cache[spec] = [block[..., j] for j in range(block.shape[-1])]
+    return cache[spec]
+
+
+def _backtest_chunk(params, close, returns, order, traded, strategy, cost, long_only, periods_per_year,
+                    cache=None):
+    """Per-symbol (P, S, k) and portfolio (P, k) metrics for one chunk of combinations.
+
+    ``close`` and ``returns`` are right-aligned; ``order`` maps their rows
+    back to the calendar and ``traded`` counts the symbols with a return
+    on each calendar day.
+    """
+    states = strategy_states(close, strategy, params, cache)
+    if long_only:
+        np.maximum(states, 0, out=states)
+    positions = states.astype(np.float64)
+    previous = np.zeros_like(positions)
+    previous[:, 1:] = positions[:, :-1]
+    # Only days with a close can trade (the alignment padding cannot).
+    changes = np.where(np.isnan(close), 0.0, np.abs(positions - previous))
+    valid = ~np.isnan(returns)
+    strategy_returns = previous * np.where(valid, returns, 0.0) - cost * changes
+    holding = (previous != 0) & valid
+
+    per_symbol = _performance(strategy_returns, np.broadcast_to(valid, positions.shape), periods_per_year)
+    per_symbol['Trades'] = (changes > 0).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        per_symbol['Exposure'] = holding.sum(axis=1) / valid.sum(axis=0) * 100
+
+    # Equal-weighted portfolio of the symbols trading each calendar day.
+    calendar_returns = np.zeros_like(strategy_returns)
+    np.put_along_axis(calendar_returns, np.broadcast_to(order, strategy_returns.shape), strategy_returns, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        portfolio_returns = np.where(traded > 0, calendar_returns.sum(axis=2) / traded, 0.0)
+    portfolio = _performance(portfolio_returns, np.broadcast_to(traded > 0, portfolio_returns.shape),
+                             periods_per_year)
+    portfolio['Trades'] = per_symbol['Trades'].sum(axis=1)
+    portfolio['Exposure'] = holding.sum(axis=(1, 2)) / max(valid.sum(), 1) * 100
+    return (np.stack([per_symbol[column] for column in BACKTEST_COLUMNS], axis=-1),
+            np.stack([portfolio[column] for column in BACKTEST_COLUMNS], axis=-1))
+
+
+def _performance(returns, valid, periods_per_year):
+    """Return, volatility, Sharpe and drawdown over axis 1 of strategy returns."""
+    n = valid.sum(axis=1)
+    equity = np.cumprod(1.0 + returns, axis=1)
+    growth = equity[:, -1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = returns.sum(axis=1, where=valid) / n
+        deviations = np.where(valid, returns - np.expand_dims(mean, 1), 0.0)
+        volatility = np.sqrt((deviations ** 2).sum(axis=1) / (n - 1) * periods_per_year) * 100
+        annualized = (growth ** (periods_per_year / n) - 1) * 100
+        sharpe = np.where(volatility > 0, annualized / volatility, 0.0)
+    drawdown = (equity / np.maximum.accumulate(np.maximum(equity, 1.0), axis=1) - 1).min(axis=1)
+    return {
+        'Total_Return': (growth - 1) * 100,
+        'Annualized_Return': annualized,
+        'Volatility': volatility,
+        'Sharpe_Ratio': sharpe,
+        'Max_Drawdown': drawdown * 100,
+    }
@@ -0,0 +1,57 @@
+"""
+Helpers shared by the on-disk caches used across the analysis package.
+"""
+import json
+import os
+import shutil
+import tempfile
+
+
+CACHE_DIR_NAME = '.cache'
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_CACHE_DIR = os.path.join(PROJECT_ROOT, CACHE_DIR_NAME)
+
+
+def default_cache_dir(path):
+    """Return the cache directory used for a source file (next to the file)."""
+    return os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+
+
+def file_fingerprint(path):
+    """Return a dict identifying the current version of a source file."""
+    stat = os.stat(path)
+    return {
+        'source': os.path.abspath(path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+    }
+
+
+def read_manifest(directory):
+    """Read manifest.json from a cache directory, or None if it is missing."""
+    manifest_path = os.path.join(directory, 'manifest.json')
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def write_manifest(directory, manifest):
+    """Write manifest.json into a cache directory."""
+    with open(os.path.join(directory, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, default=str)
+
+
+def make_staging_dir(target):
+    """Create an empty staging directory next to ``target``."""
+    parent = os.path.dirname(os.path.abspath(target))
+    os.makedirs(parent, exist_ok=True)
+    return tempfile.mkdtemp(prefix='.staging-', dir=parent)
+
+
+def commit_staging_dir(staging, target):
+    """Atomically replace ``target`` with a fully written staging directory."""
+    if os.path.isdir(target):
+        shutil.rmtree(target)
+    os.replace(staging, target)
@@ -0,0 +1,134 @@
+"""
+Memory-compact representation of the preprocessed news frame.
+
+The EDA notebook keeps headline/url/publisher/stock as object columns and
+adds int64 year/month/day/hour columns, Python-string day names and Python
+``date`` objects per row. ``compact_news`` keeps only the source columns, with
+categorical publisher/stock and Arrow-backed headline/url strings, and
+returns a ``CompactNewsFrame``: a DataFrame whose date parts (year, month,
+day, hour, day_of_week, date_only) are computed on access as small integer,
+categorical or datetime64 columns, so the notebook's ``df['hour']`` and
+``df.groupby('date_only')`` cells run unchanged without storing them.
+"""
+import numpy as np
+import pandas as pd
+
+from .news_loader import CATEGORICAL_COLUMNS, DATE_COLUMN, _pyarrow_available
+
+
+TEXT_COLUMNS = ('headline', 'url')
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+DATE_PARTS = {
+    'year': lambda dates: dates.dt.year.astype(np.int16),
+    'month': lambda dates: dates.dt.month.astype(np.int8),
+    'day': lambda dates: dates.dt.day.astype(np.int8),
+    'hour': lambda dates: dates.dt.hour.astype(np.int8),
+    'day_of_week': lambda dates: pd.Series(
+        pd.Categorical.from_codes(_weekday_codes(dates), categories=list(DAY_NAMES)), index=dates.index),
+    'date_only': lambda dates: dates.dt.normalize(),
+}
+
+
+def _weekday_codes(dates):
+    codes = dates.dt.dayofweek.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.where(np.isnan(codes), -1, codes).astype(np.int8)
+
+
+class CompactNewsFrame(pd.DataFrame):
+    """DataFrame whose date parts are derived from the 'date' column on access.
+
+    ``frame['hour']``, ``frame[['year', 'month']]`` and
+    ``frame.groupby('date_only')`` work as if the notebook's derived columns
+    existed. Columns actually stored under those names take precedence.
+    ``groupby`` defaults to ``observed=True`` so categorical keys only
+    produce the groups that occur, as with the notebook's object columns.
+    """
+
+    _metadata = []
+
+    @property
+    def _constructor(self):
+        return CompactNewsFrame
+
+    def date_part(self, name):
+        """Compute one of ``DATE_PARTS`` from the date column."""
+        series = DATE_PARTS[name](super().__getitem__(DATE_COLUMN))
+        series.name = name
+        return series
+
+    def _is_lazy(self, key):
+        return isinstance(key, str) and key in DATE_PARTS and key not in self.columns \
+            and DATE_COLUMN in self.columns
+
+    def __getitem__(self, key):
+        if self._is_lazy(key):
+            return self.date_part(key)
+        if isinstance(key, list) and any(self._is_lazy(k) for k in key):
+            parts = {k: self.date_part(k) for k in key if self._is_lazy(k)}
+            return super().assign(**parts)[key]
+        return super().__getitem__(key)
+
+    def groupby(self, by=None, *args, observed=True, **kwargs):
+        if self._is_lazy(by):
+            by = self.date_part(by)
+        elif isinstance(by, list):
+            by = [self.date_part(k) if self._is_lazy(k) else k for k in by]
+        return super().groupby(by, *args, observed=observed, **kwargs)
+
+
+def compact_news(df, string_storage='auto', drop_derived=True):
+    """Return a ``CompactNewsFrame`` copy of a preprocessed news frame.
+
+    Args:
+        df: News frame (e.g. from ``load_news`` or the notebook preprocessing).
+        string_storage: 'pyarrow' for Arrow-backed headline/url strings,
+            'python' to keep them as objects, or 'auto' to use Arrow when
+            pyarrow is installed.
+        drop_derived: Drop stored date-part columns (year, ..., date_only);
+            the frame recomputes them on access.
+
+    Returns:
+        CompactNewsFrame with categorical publisher/stock, compact strings and
+        integer columns downcast to the smallest dtype that fits.
+    """
+    if string_storage == 'auto':
+        string_storage = 'pyarrow' if _pyarrow_available() else 'python'
+    if string_storage not in ('pyarrow', 'python'):
+        raise ValueError(f"Unknown string_storage: {string_storage!r}")
+
+    columns = {}
+    for name, series in df.items():
+        if drop_derived and name in DATE_PARTS and DATE_COLUMN in df.columns:
+            continue
+        if name in CATEGORICAL_COLUMNS:
+            series = series.astype('category')
+        elif name in TEXT_COLUMNS and string_storage == 'pyarrow':
+            series = series.astype(pd.StringDtype('pyarrow'))
+        elif pd.api.types.is_integer_dtype(series.dtype) and not pd.api.types.is_extension_array_dtype(series.dtype):
+            series = pd.to_numeric(series, downcast='integer')
+        columns[name] = series
+    return CompactNewsFrame(columns, index=df.index)
+
+
+def memory_report(before, after):
+    """Per-column deep memory usage of two frames, in bytes.
+
+    Columns missing from ``after`` (e.g. date parts computed on access)
+    count as 0 bytes there.
+
+    Returns:
+        DataFrame indexed by column (plus 'total') with 'before', 'after'
+        and 'ratio' (before / after).
+    """
+    usage_before = before.memory_usage(deep=True, index=False)
+    usage_after = after.memory_usage(deep=True, index=False)
+    columns = list(usage_before.index) + [c for c in usage_after.index if c not in usage_before.index]
+    report = pd.DataFrame({
+        'before': usage_before.reindex(columns, fill_value=0),
+        'after': usage_after.reindex(columns, fill_value=0),
+    })
+    report.loc['total'] = report.sum()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        report['ratio'] = (report['before'] / report['after']).round(1)
+    return report
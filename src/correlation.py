@@ -0,0 +1,278 @@
+"""
+Lagged and rolling sentiment/return correlations with significance tests.
+
+Inputs are wide frames (trading days x symbols) of daily sentiment and daily
+returns. For lag ``k`` sentiment on day t is paired with the return on day
+t + k (``returns.shift(-k)``), so positive lags mean sentiment leads returns.
+Missing values are handled pairwise, as in pandas.
+
+All symbols are processed at once: full-sample correlations come from masked
+sums, rolling Pearson correlations from cumulative sums in O(T) per series,
+rolling Spearman correlations from ranks within each window, and the
+block-permutation significance test evaluates a whole batch of permutations
+as one array operation, with batches spread over a process pool. Arrays that
+grow with the window or the batch are built in pieces of at most
+``DEFAULT_MAX_CELLS`` cells.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+DEFAULT_LAGS = range(-5, 6)
+METHODS = ('pearson', 'spearman')
+# Cells per (permutations or windows) x dates x symbols piece (~40 MB per float64 array).
+DEFAULT_MAX_CELLS = 5_000_000
+
+
+def shift_rows(values, periods):
+    """Shift a (T, S) array along axis 0 like ``DataFrame.shift``, NaN-filled."""
+    out = np.full(values.shape, np.nan)
+    if periods > 0:
+        out[periods:] = values[:-periods]
+    elif periods < 0:
+        out[:periods] = values[-periods:]
+    else:
+        out[:] = values
+    return out
+
+
+def pair_sums(x, y, axis=0):
+    """Sums over valid (x, y) pairs: n, Σx, Σy, Σx², Σy², Σxy."""
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, y, 0.0)
+    return (valid.sum(axis=axis), x.sum(axis=axis), y.sum(axis=axis),
+            (x * x).sum(axis=axis), (y * y).sum(axis=axis), (x * y).sum(axis=axis))
+
+
+def pearson_from_sums(n, sx, sy, sxx, syy, sxy):
+    """Pearson r from pair sums; NaN with fewer than 2 pairs or no variance."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = sxy - sx * sy / n
+        var_x = sxx - sx * sx / n
+        var_y = syy - sy * sy / n
+        r = cov / np.sqrt(var_x * var_y)
+    r = np.clip(r, -1.0, 1.0)
+    r[(n < 2) | ~(var_x > 0) | ~(var_y > 0)] = np.nan
+    return r
+
+
+def correlation_pvalue(r, n):
+    """Two-sided p-value of r under H0: no correlation (t-test, n - 2 dof)."""
+    from scipy import stats
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        dof = n - 2.0
+        t = r * np.sqrt(dof / np.maximum(1.0 - r * r, 0.0))
+        p = 2.0 * stats.t.sf(np.abs(t), dof)
+    return np.where(dof > 0, p, np.nan)
+
+
+def _prepare(sentiment, returns):
+    """Align the two wide frames and center each column (for precision)."""
+    sentiment, returns = sentiment.align(returns, join='inner')
+    x = _center(sentiment.to_numpy(dtype=np.float64, na_value=np.nan))
+    y = _center(returns.to_numpy(dtype=np.float64, na_value=np.nan))
+    return sentiment.index, sentiment.columns, x, y
+
+
+def _center(values):
+    """Subtract each column's mean of non-NaN values (all-NaN columns stay NaN)."""
+    valid = ~np.isnan(values)
+    counts = np.maximum(valid.sum(axis=0), 1)
+    return values - np.where(valid, values, 0.0).sum(axis=0) / counts
+
+
+def lagged_correlations(sentiment, returns, lags=DEFAULT_LAGS, methods=METHODS):
+    """Full-sample correlation per symbol and lag, with t-test p-values.
+
+    Args:
+        sentiment: DataFrame (dates x symbols) of daily sentiment.
+        returns: DataFrame (dates x symbols) of daily returns.
+        lags: Iterable of integer lags (return day minus sentiment day).
+        methods: Any of 'pearson' and 'spearman'.
+
+    Returns:
+        Tidy DataFrame with columns stock, lag, method, r, n, p_value.
+    """
+    _, symbols, x, y = _prepare(sentiment, returns)
+    frames = []
+    for lag in lags:
+        y_lag = shift_rows(y, -lag)
+        for method in methods:
+            if method == 'pearson':
+                sums = pair_sums(x, y_lag)
+            elif method == 'spearman':
+                from scipy import stats
+
+                valid = ~(np.isnan(x) | np.isnan(y_lag))
+                ranks_x = stats.rankdata(np.where(valid, x, np.nan), axis=0, nan_policy='omit')
+                ranks_y = stats.rankdata(np.where(valid, y_lag, np.nan), axis=0, nan_policy='omit')
+                sums = pair_sums(ranks_x, ranks_y)
+            else:
+                raise ValueError(f"Unknown method {method!r}; expected one of {METHODS}")
+            n = sums[0]
+            r = pearson_from_sums(*sums)
+            frames.append(pd.DataFrame({
+                'stock': symbols, 'lag': lag, 'method': method,
+                'r': r, 'n': n, 'p_value': correlation_pvalue(r, n),
+            }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def rolling_correlations(sentiment, returns, window, lags=DEFAULT_LAGS, min_periods=None, methods=('pearson',),
+                         max_cells=DEFAULT_MAX_CELLS):
+    """Rolling Pearson and/or Spearman correlation for every symbol and lag.
+
+    The value on day t uses the ``window`` days ending at t, like
+    ``sentiment[s].rolling(window).corr(returns[s].shift(-lag))``. Spearman
+    ranks the valid pairs within each window, like ``spearmanr`` on that
+    window; it costs O(window) per day instead of O(1), so it is off by
+    default.
+
+    Args:
+        methods: Any of 'pearson' and 'spearman'.
+        max_cells: Largest (days x symbols x window) block of windows ranked
+            at once for Spearman.
+
+    Returns:
+        Tidy DataFrame with columns date, stock, lag, method, r, n (rows
+        with fewer than ``min_periods`` pairs, default ``window``, are
+        dropped).
+    """
+    unknown = [method for method in methods if method not in METHODS]
+    if unknown:
+        raise ValueError(f"Unknown methods {unknown}; expected some of {METHODS}")
+    dates, symbols, x, y = _prepare(sentiment, returns)
+    min_periods = window if min_periods is None else min_periods
+    frames = []
+    for lag in lags:
+        y_lag = shift_rows(y, -lag)
+        for method in methods:
+            if method == 'pearson':
+                valid = ~(np.isnan(x) | np.isnan(y_lag))
+                xv = np.where(valid, x, 0.0)
+                yv = np.where(valid, y_lag, 0.0)
+                columns = (valid.astype(np.float64), xv, yv, xv * xv, yv * yv, xv * yv)
+                sums = [_window_sums(a, window) for a in columns]
+                r = pearson_from_sums(*sums)
+                n = sums[0]
+            else:
+                r, n = _rolling_spearman(x, y_lag, window, max_cells)
+            r[n < min_periods] = np.nan
+
+            rows, cols = np.nonzero(~np.isnan(r))
+            frames.append(pd.DataFrame({
+                'date': dates[rows], 'stock': symbols[cols], 'lag': lag, 'method': method,
+                'r': r[rows, cols], 'n': n[rows, cols].astype(np.int64),
+            }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _rolling_spearman(x, y, window, max_cells):
+    """Spearman r and pair counts of the trailing windows, ranked a block of days at a time."""
+    from scipy import stats
+
+    n_rows, n_symbols = x.shape
+    valid = ~(np.isnan(x) | np.isnan(y))
+    # Leading padding gives every day a window, including the partial first ones.
+    padding = np.full((window - 1, n_symbols), np.nan)
+    x_windows = sliding_window_view(np.vstack([padding, np.where(valid, x, np.nan)]), window, axis=0)
+    y_windows = sliding_window_view(np.vstack([padding, np.where(valid, y, np.nan)]), window, axis=0)
+    r = np.full((n_rows, n_symbols), np.nan)
+    n = np.zeros((n_rows, n_symbols))
+    step = max(1, max_cells // max(n_symbols * window, 1))
+    for start in range(0, n_rows, step):
+        block = slice(start, start + step)
+        ranks_x = stats.rankdata(x_windows[block], axis=-1, nan_policy='omit')
+        ranks_y = stats.rankdata(y_windows[block], axis=-1, nan_policy='omit')
+        sums = pair_sums(ranks_x, ranks_y, axis=-1)
+        r[block] = pearson_from_sums(*sums)
+        n[block] = sums[0]
+    return r, n
+
+
+def _window_sums(values, window):
+    """Trailing window sums along axis 0 from one cumulative sum (O(T))."""
+    csum = np.cumsum(values, axis=0)
+    out = csum.copy()
+    out[window:] -= csum[:-window]
+    return out
+
+
+def permutation_test(sentiment, returns, lags=DEFAULT_LAGS, n_permutations=1000, block_size=5,
+                     batch_size=100, n_jobs=1, seed=0, max_cells=DEFAULT_MAX_CELLS):
+    """Block-permutation p-values for the Pearson correlation per symbol and lag.
+
+    Returns are reshuffled in blocks of ``block_size`` consecutive days (which
+    keeps short-range autocorrelation) and the correlation is recomputed for
+    every permutation; the p-value is the share of permutations with
+    ``|r_perm| >= |r|``, i.e. ``(1 + hits) / (1 + n_permutations)``.
+
+    Args:
+        n_permutations: Number of permutations.
+        block_size: Days per block; 1 is an ordinary permutation test.
+        batch_size: Permutations drawn per task (and per worker call).
+        n_jobs: Number of worker processes.
+        seed: Seed; results do not depend on ``n_jobs`` or ``max_cells``.
+        max_cells: Largest (permutations x days x symbols) array built at
+            once; a batch is evaluated in slices of permutations and, when
+            one permutation is larger than this, of symbols.
+
+    Returns:
+        Tidy DataFrame with columns stock, lag, r, n, p_perm.
+    """
+    _, symbols, x, y = _prepare(sentiment, returns)
+    lags = list(lags)
+    y_lags = np.stack([shift_rows(y, -lag) for lag in lags]) if lags else np.empty((0,) + y.shape)
+    sums = pair_sums(x[np.newaxis], y_lags, axis=1)
+    r_obs = pearson_from_sums(*sums)
+
+    sizes = [min(batch_size, n_permutations - start) for start in range(0, n_permutations, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(x, y_lags, r_obs, block_size, size, task_seed, max_cells) for size, task_seed in zip(sizes, seeds)]
+    if n_jobs == 1:
+        hits = sum(_permutation_hits(*task) for task in tasks)
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            hits = sum(pool.map(_permutation_hits, *zip(*tasks)))
+
+    p_perm = (1.0 + hits) / (1.0 + n_permutations)
+    p_perm[np.isnan(r_obs)] = np.nan
+    return pd.DataFrame({
+        'stock': np.tile(symbols, len(lags)),
+        'lag': np.repeat(lags, len(symbols)),
+        'r': r_obs.ravel(),
+        'n': sums[0].ravel(),
+        'p_perm': p_perm.ravel(),
+    })
+
+
+def block_permutations(n, block_size, n_permutations, rng):
+    """(n_permutations, n) index arrays that reorder blocks of ``block_size``."""
+    n_blocks = -(-n // block_size)
+    order = np.argsort(rng.random((n_permutations, n_blocks)), axis=1)
+    positions = (order[:, :, np.newaxis] * block_size + np.arange(block_size)).reshape(n_permutations, -1)
+    # Every row drops the same padding positions (>= n) of the short last block.
+    return positions[positions < n].reshape(n_permutations, n)
+
+
+def _permutation_hits(x, y_lags, r_obs, block_size, n_permutations, seed, max_cells=DEFAULT_MAX_CELLS):
+    """Count permutations with |r| >= |r_obs| for each (lag, symbol)."""
+    rng = np.random.default_rng(seed)
+    hits = np.zeros(r_obs.shape)
+    index = block_permutations(len(x), block_size, n_permutations, rng)
+    n_rows, n_symbols = x.shape
+    symbol_step = max(1, min(n_symbols, max_cells // max(n_rows, 1)))
+    permutation_step = max(1, max_cells // max(n_rows * symbol_step, 1))
+    for i, y in enumerate(y_lags):
+        for first in range(0, n_symbols, symbol_step):
+            columns = slice(first, first + symbol_step)
+            for start in range(0, n_permutations, permutation_step):
+                permuted = y[index[start:start + permutation_step], columns]
+                r = pearson_from_sums(*pair_sums(x[np.newaxis, :, columns], permuted, axis=1))
+                hits[i, columns] += (np.abs(r) >= np.abs(r_obs[i, columns]) - 1e-12).sum(axis=0)
+    return hits
@@ -0,0 +1,141 @@
+"""
+Publisher x stock coverage from categorical codes.
+
+The EDA notebook builds ``publisher_stats`` with a multi-column groupby and a
+dense publishers x stocks pivot filled with zeros. ``PublisherCoverage``
+factorizes publisher and stock once, keeps the pair counts in a
+``scipy.sparse`` CSR matrix and derives every per-publisher statistic from
+the same integer codes with ``np.bincount``; only the slices that are shown
+(e.g. the top publishers for the heatmap) are ever made dense.
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from .profiling import instrument
+
+
+class PublisherCoverage:
+    """Article counts per (publisher, stock) plus per-publisher statistics.
+
+    Attributes:
+        publishers: Sorted Index of publishers (matrix rows).
+        stocks: Sorted Index of stocks (matrix columns).
+        matrix: int64 CSR matrix of article counts, publishers x stocks.
+        stats: publisher_stats frame (see ``publisher_stats``).
+        n_articles: Number of rows in the source frame.
+    """
+
+    def __init__(self, publishers, stocks, matrix, stats, row_counts, n_articles):
+        self.publishers = pd.Index(publishers, name='publisher')
+        self.stocks = pd.Index(stocks, name='stock')
+        self.matrix = sparse.csr_matrix(matrix)
+        self.stats = stats
+        self.row_counts = np.asarray(row_counts)
+        self.n_articles = n_articles
+
+    @classmethod
+    @instrument('publisher_coverage', rows=1)
+    def from_frame(cls, df, publisher_col='publisher', stock_col='stock', date_col='date',
+                   text_col='headline'):
+        """Build coverage and statistics from a news frame in one pass over codes."""
+        publisher_codes, publishers = pd.factorize(df[publisher_col], sort=True)
+        stock_codes, stocks = pd.factorize(df[stock_col], sort=True)
+        n_publishers = len(publishers)
+
+        has_publisher = publisher_codes >= 0
+        codes = publisher_codes[has_publisher]
+        row_counts = np.bincount(codes, minlength=n_publishers)
+        has_text = df[text_col].notna().to_numpy()[has_publisher]
+        article_count = np.bincount(codes, weights=has_text, minlength=n_publishers).astype(np.int64)
+
+        pair = has_publisher & (stock_codes >= 0)
+        matrix = sparse.csr_matrix(
+            (np.ones(pair.sum(), dtype=np.int64), (publisher_codes[pair], stock_codes[pair])),
+            shape=(n_publishers, len(stocks)))
+        matrix.sum_duplicates()
+
+        dates = pd.to_datetime(df[date_col])
+        naive = dates.dt.tz_convert('UTC').dt.tz_localize(None) if dates.dt.tz is not None else dates
+        date_values = naive.to_numpy(dtype='datetime64[ns]')[has_publisher]
+        has_date = ~np.isnat(date_values)
+        date_values = date_values.view(np.int64)
+        first = np.full(n_publishers, np.iinfo(np.int64).max)
+        last = np.full(n_publishers, np.iinfo(np.int64).min)
+        np.minimum.at(first, codes[has_date], date_values[has_date])
+        np.maximum.at(last, codes[has_date], date_values[has_date])
+
+        stats = pd.DataFrame({
+            'publisher': np.asarray(publishers, dtype=object),
+            'article_count': article_count,
+            'unique_stocks': matrix.getnnz(axis=1),
+            'first_article': _to_datetimes(first, dates.dtype),
+            'last_article': _to_datetimes(last, dates.dtype),
+            'contribution_pct': (article_count / max(len(df), 1) * 100).round(2),
+        })
+        stats = stats.sort_values('article_count', ascending=False, kind='stable')
+        return cls(publishers, stocks, matrix, stats, row_counts, len(df))
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+    def publisher_stats(self, n=None):
+        """Notebook ``publisher_stats`` (sorted by article_count), optionally the top n."""
+        return self.stats if n is None else self.stats.head(n)
+
+    def top_publishers(self, n=10):
+        """The n publishers with most rows (``value_counts().head(n)`` order).
+
+        Ties are kept in publisher name order (pandas leaves their order
+        unspecified).
+        """
+        order = np.argsort(-self.row_counts, kind='stable')[:n]
+        return list(self.publishers[order])
+
+    def pairs(self):
+        """Long (publisher, stock, count) frame of the non-zero cells."""
+        coo = self.matrix.tocoo()
+        order = np.lexsort((coo.col, coo.row))
+        return pd.DataFrame({
+            'publisher': self.publishers[coo.row[order]],
+            'stock': self.stocks[coo.col[order]],
+            'count': coo.data[order],
+        })
+
+    def coverage(self, publishers=None, n_publishers=10, n_stocks=None, drop_empty=True):
+        """Dense coverage frame for a few publishers (e.g. the heatmap).
+
+        Args:
+            publishers: Publishers to show; defaults to ``top_publishers(n_publishers)``.
+            n_publishers: Number of top publishers when ``publishers`` is None.
+            n_stocks: Keep only the n stocks with most articles among them.
+            drop_empty: Drop stocks none of the publishers cover. With False
+                (and no n_stocks) this equals the notebook's
+                ``publisher_stock_pivot.loc[top_publishers_list]``.
+
+        Returns:
+            float64 DataFrame (publishers x stocks).
+        """
+        if publishers is None:
+            publishers = self.top_publishers(n_publishers)
+        rows = self.matrix[self.publishers.get_indexer(publishers)]
+        columns = np.arange(len(self.stocks))
+        if drop_empty or n_stocks is not None:
+            totals = np.asarray(rows.sum(axis=0)).ravel()
+            columns = np.flatnonzero(totals > 0) if drop_empty else columns
+            if n_stocks is not None:
+                top = np.argsort(-totals[columns], kind='stable')[:n_stocks]
+                columns = np.sort(columns[top])
+        block = rows[:, columns].toarray().astype(np.float64)
+        return pd.DataFrame(block, index=pd.Index(publishers, name='publisher'), columns=self.stocks[columns])
+
+
+def _to_datetimes(values, dtype):
+    """int64 ns values to datetimes of ``dtype``; sentinels become NaT."""
+    out = values.copy()
+    out[(values == np.iinfo(np.int64).max) | (values == np.iinfo(np.int64).min)] = np.iinfo(np.int64).min
+    result = pd.to_datetime(out.view('datetime64[ns]'))
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        result = result.tz_localize('UTC').tz_convert(dtype.tz)
+    return result
@@ -0,0 +1,130 @@
+"""
+Fast parser for the mixed-offset date column of the news dataset.
+
+The news 'date' column mixes two fixed layouts::
+
+    2020-06-05 10:30:54-04:00   (local time with a UTC offset)
+    2020-06-05 00:00:00         (no offset, treated as UTC)
+
+``pd.to_datetime(..., format='mixed')`` falls back to per-element parsing for
+such data. ``parse_mixed_dates`` instead groups values by layout, decodes each
+group with integer arithmetic on the character codes and applies offsets in
+int64 nanoseconds. Values in any other layout go through pandas' mixed parser;
+values that still cannot be parsed are reported separately.
+"""
+import numpy as np
+import pandas as pd
+
+from .profiling import instrument
+
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_MINUTE = 60 * NS_PER_SECOND
+
+# Layout 'YYYY-MM-DD HH:MM:SS' and the same followed by '+HH:MM' / '-HH:MM'
+NAIVE_LENGTH = 19
+OFFSET_LENGTH = 25
+
+_DIGIT_POSITIONS = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18]
+_SEPARATORS = {4: '-', 7: '-', 13: ':', 16: ':'}
+_OFFSET_DIGIT_POSITIONS = [20, 21, 23, 24]
+_DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+
+
+@instrument(rows=0)
+def parse_mixed_dates(values):
+    """Parse date strings into naive UTC timestamps.
+
+    Args:
+        values: Series (or array-like) of date strings. Missing values stay NaT.
+
+    Returns:
+        Tuple ``(dates, unparsed)`` where ``dates`` is a datetime64[ns] Series
+        aligned with the input (NaT where parsing failed) and ``unparsed`` is a
+        Series holding the original strings that could not be parsed.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    raw = series.to_numpy(dtype=object, na_value=None)
+    result = np.full(len(raw), np.iinfo(np.int64).min, dtype=np.int64)
+
+    is_present = pd.notna(raw)
+    present = np.flatnonzero(is_present)
+    remaining = present
+    if len(present):
+        codes = _char_codes(raw[present].astype(str))
+        lengths = (codes != 0).sum(axis=1)
+        parsed = np.zeros(len(present), dtype=bool)
+        for layout_length in (NAIVE_LENGTH, OFFSET_LENGTH):
+            group = np.flatnonzero(lengths == layout_length)
+            if len(group) == 0 or codes.shape[1] < layout_length:
+                continue
+            ns, ok = _decode_fixed_layout(codes[group, :layout_length])
+            result[present[group[ok]]] = ns[ok]
+            parsed[group[ok]] = True
+        remaining = present[~parsed]
+
+    if len(remaining):
+        fallback = pd.to_datetime(pd.Series(raw[remaining]), format='mixed',
+                                  errors='coerce', utc=True)
+        result[remaining] = fallback.dt.tz_localize(None).to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+    dates = pd.Series(result.view('datetime64[ns]'), index=series.index, name=series.name)
+    failed = is_present & (result == np.iinfo(np.int64).min)
+    return dates, series[failed]
+
+
+def _char_codes(text):
+    """Return the Unicode code points of a 'U' array as an (n, width) array."""
+    width = text.dtype.itemsize // 4
+    return text.view(np.uint32).reshape(len(text), width)
+
+
+def _decode_fixed_layout(codes):
+    """Decode 'YYYY-MM-DD HH:MM:SS[+HH:MM]' rows into epoch nanoseconds."""
+    width = codes.shape[1]
+    digit_positions = list(_DIGIT_POSITIONS)
+    if width == OFFSET_LENGTH:
+        digit_positions += _OFFSET_DIGIT_POSITIONS
+
+    digits = codes[:, digit_positions].astype(np.int64) - ord('0')
+    ok = ((digits >= 0) & (digits <= 9)).all(axis=1)
+    for position, char in _SEPARATORS.items():
+        ok &= codes[:, position] == ord(char)
+    ok &= (codes[:, 10] == ord(' ')) | (codes[:, 10] == ord('T'))
+
+    def number(start, count):
+        value = np.zeros(len(digits), dtype=np.int64)
+        for i in range(start, start + count):
+            value = value * 10 + digits[:, i]
+        return value
+
+    year, month, day = number(0, 4), number(4, 2), number(6, 2)
+    hour, minute, second = number(8, 2), number(10, 2), number(12, 2)
+
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_index = np.clip(month, 0, 12)
+    days_in_month = _DAYS_IN_MONTH[month_index] + ((month_index == 2) & leap)
+    ok &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= days_in_month)
+    ok &= (hour < 24) & (minute < 60) & (second < 60)
+
+    ns = (_days_from_civil(year, month, day) * 86400 + hour * 3600 + minute * 60 + second) * NS_PER_SECOND
+
+    if width == OFFSET_LENGTH:
+        sign_code = codes[:, 19]
+        ok &= ((sign_code == ord('+')) | (sign_code == ord('-'))) & (codes[:, 22] == ord(':'))
+        offset_minutes = number(14, 2) * 60 + number(16, 2)
+        sign = np.where(sign_code == ord('-'), -1, 1)
+        # Local time = UTC + offset, so UTC = local - offset
+        ns -= sign * offset_minutes * NS_PER_MINUTE
+
+    return ns, ok
+
+
+def _days_from_civil(year, month, day):
+    """Days since 1970-01-01 for proleptic Gregorian dates (vectorized)."""
+    year = year - (month <= 2)
+    era = np.floor_divide(year, 400)
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
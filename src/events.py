@@ -0,0 +1,237 @@
+"""
+Event studies of abnormal returns around news events.
+
+An event is a (stock, timestamp, event type) triple, e.g. every headline
+mentioning 'fda approval' or 'downgrade' for a stock (``phrase_events``).
+``EventStudy`` assigns each event to the trading session it can first
+affect (as ``align_news`` does), computes market-adjusted abnormal returns
+for every symbol at once and gathers the return window of all events with
+one fancy index into a strided (sliding window) view of the abnormal
+return array, instead of slicing a DataFrame per event. Cumulative
+abnormal returns are averaged per event type with t-based confidence
+intervals.
+
+Offsets count rows of the price panel's calendar; day 0 is the event's
+trading day.
+"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .alignment import DEFAULT_MARKET_CLOSE, DEFAULT_TIMEZONE, assign_trading_days
+from .panel import PricePanel
+from .phrases import PhraseMatcher
+from .profiling import instrument
+
+
+EVENT_PHRASES = ('fda approval', 'upgrade', 'downgrade', 'price target', '52-week high')
+DEFAULT_WINDOW = (-5, 10)
+DEFAULT_CONFIDENCE = 0.95
+
+
+def phrase_events(news, phrases=EVENT_PHRASES, headline_col='headline', date_col='date', stock_col='stock'):
+    """Events for every headline containing one of ``phrases``.
+
+    A headline matching several phrases yields one event per phrase.
+
+    Returns:
+        DataFrame with 'stock', 'date' and 'event_type' columns, indexed
+        by the matching rows' index in ``news``.
+    """
+    matcher = PhraseMatcher(phrases)
+    rows, ids = matcher.find(news[headline_col])
+    events = pd.DataFrame({
+        'stock': news[stock_col].to_numpy()[rows],
+        'date': news[date_col].to_numpy()[rows],
+        'event_type': pd.Categorical.from_codes(ids, categories=matcher.phrases),
+    }, index=news.index[rows])
+    return events.sort_index(kind='stable')
+
+
+def market_returns(returns):
+    """Equal-weighted mean of the available returns per day (NaN when none)."""
+    available = ~np.isnan(returns)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(available, returns, 0.0).sum(axis=1) / available.sum(axis=1)
+
+
+class EventStudy:
+    """Abnormal returns of many events over a common window.
+
+    Attributes:
+        events: The events with their 'trading_day', 'complete' (no missing
+            abnormal return in the window) and 'car' (cumulative abnormal
+            return over the whole window) columns.
+        offsets: int array of window offsets, e.g. -5..10.
+        abnormal: float array (n_events, n_offsets) of abnormal returns.
+    """
+
+    def __init__(self, events, offsets, abnormal):
+        self.events = events
+        self.offsets = np.asarray(offsets)
+        self.abnormal = np.asarray(abnormal, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.events)
+
+    @classmethod
+    @instrument('event_study', rows=1)
+    def from_events(cls, events, prices, window=DEFAULT_WINDOW, market=None, stock_col='stock', date_col='date',
+                    type_col='event_type', deduplicate=True, market_close=DEFAULT_MARKET_CLOSE,
+                    tz=DEFAULT_TIMEZONE, naive_tz='UTC'):
+        """Compute abnormal returns around every event.
+
+        Args:
+            events: Frame with stock, timestamp and event type columns (see
+                ``phrase_events``).
+            prices: PricePanel or dict of symbol -> price frame with 'Close'.
+            window: Inclusive (first, last) offsets in trading days.
+            market: Benchmark returns subtracted from each stock's returns:
+                None for the equal-weighted mean of all panel symbols, a
+                panel symbol (e.g. 'SPY'), or a Series of returns by date.
+            deduplicate: Keep one event per stock, trading day and type.
+            market_close, tz, naive_tz: Session assignment, as in
+                ``align_news``.
+
+        Returns:
+            EventStudy.
+        """
+        panel = prices if isinstance(prices, PricePanel) else PricePanel.from_frames(prices)
+        first, last = window
+        if first > last:
+            raise ValueError(f"window must be (first, last) with first <= last, got {window!r}")
+        abnormal_returns = _abnormal_returns(panel, market)
+
+        events = events.copy()
+        events['trading_day'] = assign_trading_days(events, panel, date_col=date_col, stock_col=stock_col,
+                                                    market_close=market_close, tz=tz, naive_tz=naive_tz)
+        events = events[events['trading_day'].notna()]
+        if deduplicate:
+            events = events.drop_duplicates([stock_col, 'trading_day', type_col])
+        rows = panel.dates.get_indexer(events['trading_day'])
+        columns = panel.symbols.get_indexer(events[stock_col])
+
+        # Pad so every window fits, then gather all windows from one strided view.
+        before, after = max(-first, 0), max(last, 0)
+        padded = np.pad(abnormal_returns, ((before, after), (0, 0)), constant_values=np.nan)
+        windows = sliding_window_view(padded, last - first + 1, axis=0)
+        abnormal = windows[rows + first + before, columns]
+
+        events['complete'] = ~np.isnan(abnormal).any(axis=1)
+        events['car'] = np.where(events['complete'], abnormal.sum(axis=1), np.nan)
+        events = events.rename(columns={stock_col: 'stock', type_col: 'event_type'})
+        return cls(events, np.arange(first, last + 1), abnormal)
+
+    def cumulative(self):
+        """Cumulative abnormal returns (n_events, n_offsets) from the window start."""
+        return np.cumsum(self.abnormal, axis=1)
+
+    def average(self, by='event_type', confidence=DEFAULT_CONFIDENCE, complete_only=True):
+        """Mean abnormal and cumulative abnormal return per group and offset.
+
+        Args:
+            by: Event column to group by, or None for all events together.
+            confidence: Level of the CAR confidence interval.
+            complete_only: Use only events without missing returns in the
+                window; otherwise each offset uses the events available.
+
+        Returns:
+            Tidy DataFrame with the group, 'offset', 'n', 'mean_ar',
+            'mean_car', 'car_low', 'car_high' and 't_stat' (mean CAR over
+            its standard error).
+        """
+        keep = self.events['complete'].to_numpy() if complete_only else np.ones(len(self), dtype=bool)
+        frames = []
+        for label, positions in self._groups(by, keep):
+            ar = self.abnormal[positions]
+            car = np.cumsum(ar, axis=1)
+            stats = _mean_interval(car, confidence)
+            frame = pd.DataFrame({
+                'offset': self.offsets,
+                'n': stats['n'],
+                'mean_ar': _nanmean(ar),
+                'mean_car': stats['mean'],
+                'car_low': stats['low'],
+                'car_high': stats['high'],
+                't_stat': stats['t_stat'],
+            })
+            if by is not None:
+                frame.insert(0, by, label)
+            frames.append(frame)
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def summary(self, by='event_type', confidence=DEFAULT_CONFIDENCE, car_window=None):
+        """Mean CAR over ``car_window`` (default: the whole window) per group.
+
+        Returns:
+            DataFrame indexed by group with 'n', 'mean_car', 'car_low',
+            'car_high', 't_stat' and 'p_value' (two-sided t-test), using
+            complete events only.
+        """
+        from scipy import stats as scipy_stats
+
+        first, last = car_window if car_window is not None else (self.offsets[0], self.offsets[-1])
+        selected = (self.offsets >= first) & (self.offsets <= last)
+        if not selected.any():
+            raise ValueError(f"car_window {car_window!r} is outside the event window")
+        keep = self.events['complete'].to_numpy()
+        rows = {}
+        for label, positions in self._groups(by, keep):
+            car = self.abnormal[positions][:, selected].sum(axis=1)[:, np.newaxis]
+            values = {key: value[0] for key, value in _mean_interval(car, confidence).items()}
+            dof = values['n'] - 1
+            values['p_value'] = 2 * scipy_stats.t.sf(abs(values['t_stat']), dof) if dof > 0 else np.nan
+            rows[label] = values
+        frame = pd.DataFrame.from_dict(rows, orient='index')
+        frame = frame.rename(columns={'mean': 'mean_car', 'low': 'car_low', 'high': 'car_high'})
+        frame.index.name = by
+        return frame[['n', 'mean_car', 'car_low', 'car_high', 't_stat', 'p_value']]
+
+    def _groups(self, by, keep):
+        """Yield (label, event positions) per group among the kept events."""
+        if by is None:
+            yield 'all', np.flatnonzero(keep)
+            return
+        labels = self.events[by]
+        values = labels.cat.categories if isinstance(labels.dtype, pd.CategoricalDtype) else pd.unique(labels)
+        for label in values:
+            positions = np.flatnonzero(keep & (labels == label).to_numpy())
+            if len(positions):
+                yield label, positions
+
+
+def _abnormal_returns(panel, market):
+    """Daily returns minus the benchmark's, as a (T, S) array."""
+    returns = panel.daily_returns()
+    if market is None:
+        benchmark = market_returns(returns)
+    elif isinstance(market, str):
+        benchmark = returns[:, panel.symbols.get_loc(market)]
+    else:
+        benchmark = pd.Series(market).reindex(panel.dates).to_numpy(dtype=np.float64, na_value=np.nan)
+    return returns - benchmark[:, np.newaxis]
+
+
+def _nanmean(values):
+    """Column means ignoring NaN (NaN for empty columns, without warnings)."""
+    present = ~np.isnan(values)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(present, values, 0.0).sum(axis=0) / present.sum(axis=0)
+
+
+def _mean_interval(values, confidence):
+    """Per-column count, mean, t-interval and t statistic, ignoring NaN."""
+    from scipy import stats as scipy_stats
+
+    present = ~np.isnan(values)
+    n = present.sum(axis=0)
+    mean = _nanmean(values)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        deviations = np.where(present, values - mean, 0.0)
+        std = np.sqrt((deviations ** 2).sum(axis=0) / (n - 1))
+        stderr = std / np.sqrt(n)
+        half_width = scipy_stats.t.ppf(0.5 + confidence / 2, np.maximum(n - 1, 1)) * stderr
+        t_stat = mean / stderr
+    half_width = np.where(n > 1, half_width, np.nan)
+    return {'n': n, 'mean': mean, 'low': mean - half_width, 'high': mean + half_width,
+            't_stat': np.where(n > 1, t_stat, np.nan)}
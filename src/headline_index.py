@@ -0,0 +1,290 @@
+"""
+Inverted index over news headlines for ticker / phrase / date-range queries.
+
+Rows of the news frame are reordered by (stock, date), so every stock owns a
+contiguous block of row ids with sorted dates inside it: a stock filter plus
+a date range is a single row interval. Each token maps to a sorted posting
+list of row ids stored in CSR form (one offsets array, one int32 ids array),
+and a query intersects or unions posting lists restricted to that interval
+with binary searches instead of scanning the frame.
+
+Example:
+    index = HeadlineIndex.build(df)
+    index.search('price target', stock='NVDA', start='2020-03-01', end='2020-04-01')
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+
+INDEX_VERSION = 1
+TOKEN_PATTERN = re.compile(r'[^\W_]+')
+_TOKENS_AND_BREAKS = re.compile(r'[^\W_]+|\n')
+
+
+def tokenize(text):
+    """Lowercase word tokens (runs of letters and digits) of a string."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class HeadlineIndex:
+    """Token -> row postings plus per-stock, date-sorted row ranges.
+
+    Build with ``HeadlineIndex.build(df)``; reload a saved index with
+    ``HeadlineIndex.load(path)``.
+
+    Attributes:
+        vocabulary: Index of tokens; token i owns
+            ``postings[offsets[i]:offsets[i + 1]]``.
+        stocks: Index of stock symbols; stock k owns rows
+            ``stock_offsets[k]:stock_offsets[k + 1]``.
+        positions: Position in the source frame of each indexed row.
+        dates: int64 nanosecond timestamps (UTC) of each row; NaT is int64 min.
+    """
+
+    def __init__(self, vocabulary, offsets, postings, stocks, stock_offsets,
+                 positions, dates, text_data, text_offsets):
+        self.vocabulary = pd.Index(vocabulary)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.postings = np.asarray(postings, dtype=np.int32)
+        self.stocks = pd.Index(stocks)
+        self.stock_offsets = np.asarray(stock_offsets, dtype=np.int64)
+        self.positions = np.asarray(positions, dtype=np.int64)
+        self.dates = np.asarray(dates, dtype=np.int64)
+        self._text_data = np.asarray(text_data, dtype=np.uint8)
+        self._text_offsets = np.asarray(text_offsets, dtype=np.int64)
+        self._token_ids = {token: i for i, token in enumerate(self.vocabulary)}
+
+    def __len__(self):
+        return len(self.positions)
+
+    @classmethod
+    def build(cls, df, text_col='headline', date_col='date', stock_col='stock'):
+        """Index a news frame (as returned by ``load_news``)."""
+        dates = pd.to_datetime(df[date_col])
+        if isinstance(dates.dtype, pd.DatetimeTZDtype):
+            dates = dates.dt.tz_convert('UTC').dt.tz_localize(None)
+        date_values = dates.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        stock_codes, stocks = pd.factorize(df[stock_col], sort=True)
+        stocks = np.asarray(stocks, dtype=object)
+
+        # Rows without a stock (code -1) sort first and belong to no range.
+        order = np.lexsort((date_values, stock_codes))
+        stock_offsets = np.searchsorted(stock_codes[order], np.arange(len(stocks) + 1))
+
+        headlines = df[text_col].iloc[order]
+        texts = [text if isinstance(text, str) else '' for text in headlines]
+        vocabulary, offsets, postings = _build_postings(texts)
+        text_data, text_offsets = _encode_strings(texts)
+        return cls(vocabulary, offsets, postings, stocks, stock_offsets,
+                   order, date_values[order], text_data, text_offsets)
+
+    def headline(self, row):
+        """Headline text of one indexed row."""
+        start, end = self._text_offsets[row], self._text_offsets[row + 1]
+        return self._text_data[start:end].tobytes().decode('utf-8')
+
+    def posting(self, token, lo=0, hi=None):
+        """Sorted row ids containing ``token``, restricted to rows [lo, hi)."""
+        token_id = self._token_ids.get(token)
+        if token_id is None:
+            return np.empty(0, dtype=np.int32)
+        rows = self.postings[self.offsets[token_id]:self.offsets[token_id + 1]]
+        if lo == 0 and hi is None:
+            return rows
+        hi = len(self) if hi is None else hi
+        return rows[np.searchsorted(rows, lo):np.searchsorted(rows, hi)]
+
+    def row_range(self, stock=None, start=None, end=None):
+        """Row interval [lo, hi) of a stock, narrowed to dates in [start, end).
+
+        Without a stock the interval covers every row and the date range is
+        applied later as a mask.
+        """
+        if stock is None:
+            return 0, len(self)
+        if stock not in self.stocks:
+            return 0, 0
+        k = self.stocks.get_loc(stock)
+        lo, hi = self.stock_offsets[k], self.stock_offsets[k + 1]
+        start_ns, end_ns = _date_bounds(start, end)
+        block = self.dates[lo:hi]
+        return lo + np.searchsorted(block, start_ns), lo + np.searchsorted(block, end_ns)
+
+    def query(self, terms, mode='and', stock=None, start=None, end=None):
+        """Row ids matching the terms and filters.
+
+        Args:
+            terms: A term or list of terms. A term with several tokens is a
+                phrase and must appear as consecutive tokens.
+            mode: 'and' (all terms) or 'or' (any term).
+            stock: Optional stock symbol.
+            start: Optional inclusive start date.
+            end: Optional exclusive end date.
+
+        Returns:
+            Sorted int array of indexed row ids (see ``positions``).
+        """
+        if mode not in ('and', 'or'):
+            raise ValueError(f"mode must be 'and' or 'or', got {mode!r}")
+        if isinstance(terms, str):
+            terms = [terms]
+        lo, hi = self.row_range(stock, start, end)
+
+        matches = [self._term_rows(term, lo, hi) for term in terms]
+        if not matches:
+            rows = np.arange(lo, hi, dtype=np.int32)
+        elif mode == 'and':
+            rows = _intersect_all(matches)
+        else:
+            rows = np.unique(np.concatenate(matches))
+
+        if stock is None and (start is not None or end is not None):
+            start_ns, end_ns = _date_bounds(start, end)
+            row_dates = self.dates[rows]
+            rows = rows[(row_dates >= start_ns) & (row_dates < end_ns)]
+        return rows
+
+    def search(self, terms, mode='and', stock=None, start=None, end=None):
+        """Matching headlines as a frame sorted by date (see ``query``).
+
+        The frame is indexed by position in the source frame and has
+        'date', 'stock' and 'headline' columns.
+        """
+        rows = self.query(terms, mode, stock, start, end)
+        stock_ids = np.searchsorted(self.stock_offsets, rows, side='right') - 1
+        result = pd.DataFrame({
+            'date': self.dates[rows].view('datetime64[ns]'),
+            'stock': pd.Categorical.from_codes(stock_ids, self.stocks),
+            'headline': [self.headline(row) for row in rows],
+        }, index=pd.Index(self.positions[rows], name='position'))
+        return result.sort_values('date', kind='stable')
+
+    def _term_rows(self, term, lo, hi):
+        tokens = tokenize(term)
+        if not tokens:
+            raise ValueError(f"Term {term!r} has no word tokens")
+        rows = _intersect_all([self.posting(token, lo, hi) for token in tokens])
+        if len(tokens) == 1 or len(rows) == 0:
+            return rows
+        phrase = re.compile(r'(?<![^\W_])' + r'[\W_]+'.join(map(re.escape, tokens)) + r'(?![^\W_])')
+        keep = [bool(phrase.search(self.headline(row).lower())) for row in rows]
+        return rows[np.asarray(keep, dtype=bool)]
+
+    def save(self, path):
+        """Write the index to one compressed ``.npz`` file.
+
+        Posting lists are stored delta-encoded (small gaps compress well)
+        and the vocabulary and stocks as UTF-8 blobs with offsets.
+        """
+        vocab_data, vocab_offsets = _encode_strings(list(self.vocabulary))
+        stock_data, stock_name_offsets = _encode_strings([str(s) for s in self.stocks])
+        starts = self.offsets[:-1][np.diff(self.offsets) > 0]
+        deltas = np.diff(self.postings, prepend=np.int32(0))
+        deltas[starts] = self.postings[starts]
+        np.savez_compressed(
+            path, version=np.int64(INDEX_VERSION), offsets=self.offsets, deltas=deltas,
+            vocab_data=vocab_data, vocab_offsets=vocab_offsets,
+            stock_data=stock_data, stock_name_offsets=stock_name_offsets,
+            stock_offsets=self.stock_offsets, positions=self.positions, dates=self.dates,
+            text_data=self._text_data, text_offsets=self._text_offsets,
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Read an index written by ``save``."""
+        with np.load(path) as data:
+            if int(data['version']) != INDEX_VERSION:
+                raise ValueError(f"{path}: unsupported index version {int(data['version'])}")
+            offsets = data['offsets']
+            deltas = data['deltas'].astype(np.int64)
+            # Undo the delta encoding separately inside each posting list.
+            postings = np.cumsum(deltas)
+            starts = offsets[:-1][np.diff(offsets) > 0]
+            base = np.zeros(len(deltas), dtype=np.int64)
+            base[starts] = postings[starts] - deltas[starts]
+            postings -= np.maximum.accumulate(base)
+            return cls(
+                _decode_strings(data['vocab_data'], data['vocab_offsets']), offsets, postings,
+                _decode_strings(data['stock_data'], data['stock_name_offsets']),
+                data['stock_offsets'], data['positions'], data['dates'],
+                data['text_data'], data['text_offsets'],
+            )
+
+
+def _build_postings(texts, chunksize=100_000):
+    """CSR posting lists (vocabulary, offsets, row ids) for a list of texts."""
+    parts = []
+    for start in range(0, len(texts), chunksize):
+        chunk = texts[start:start + chunksize]
+        joined = '\n'.join(text.replace('\n', ' ') for text in chunk).lower() + '\n'
+        parts.append(_tokens_and_breaks(joined))
+    tokens = np.concatenate(parts) if parts else np.empty(0, dtype=object)
+    is_break = tokens == '\n'
+    rows = np.cumsum(is_break)[~is_break]
+    codes, vocabulary = pd.factorize(tokens[~is_break])
+
+    n_rows = max(len(texts), 1)
+    keys = np.unique(codes.astype(np.int64) * n_rows + rows)
+    token_ids, row_ids = np.divmod(keys, n_rows)
+    offsets = np.searchsorted(token_ids, np.arange(len(vocabulary) + 1))
+    return vocabulary, offsets, row_ids.astype(np.int32)
+
+
+def _tokens_and_breaks(text):
+    """Object array of the word tokens in ``text`` with '\\n' marking line ends."""
+    if not text.isascii():
+        return np.array(_TOKENS_AND_BREAKS.findall(text), dtype=object)
+    # ASCII fast path: map every non-alphanumeric byte except '\n' to a space
+    # with a lookup table, which is several times faster than the regex.
+    codes = _ascii_word_table()[np.frombuffer(text.encode('ascii'), dtype=np.uint8)]
+    pieces = np.array(codes.tobytes().decode('ascii').replace('\n', ' \n ').split(' '), dtype=object)
+    return pieces[pieces != '']
+
+
+def _ascii_word_table():
+    """Byte lookup table keeping ASCII letters, digits and newlines."""
+    table = np.full(256, ord(' '), dtype=np.uint8)
+    keep = np.frombuffer(b'0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ\n', dtype=np.uint8)
+    table[keep] = keep
+    return table
+
+
+def _encode_strings(values):
+    """UTF-8 blob plus int64 offsets for a list of strings."""
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in encoded])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+def _decode_strings(data, offsets):
+    blob = data.tobytes()
+    return [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+
+
+def _date_bounds(start, end):
+    """int64 ns bounds for [start, end); NaT rows fall outside any range."""
+    start_ns = np.iinfo(np.int64).min + 1 if start is None else _to_utc_ns(start)
+    end_ns = np.iinfo(np.int64).max if end is None else _to_utc_ns(end)
+    return start_ns, end_ns
+
+
+def _to_utc_ns(value):
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert('UTC').tz_localize(None)
+    return timestamp.as_unit('ns').value
+
+
+def _intersect_all(arrays):
+    """Intersection of sorted unique int arrays, smallest first."""
+    arrays = sorted(arrays, key=len)
+    result = arrays[0]
+    for other in arrays[1:]:
+        if len(result) == 0 or len(other) == 0:
+            return result[:0]
+        idx = np.minimum(np.searchsorted(other, result), len(other) - 1)
+        result = result[other[idx] == result]
+    return result
@@ -0,0 +1,230 @@
+"""
+Bounded-memory heavy-hitter counting for headline keywords.
+
+The EDA notebook collects every keyword of every headline in one list,
+counts it with a ``Counter`` and joins the list into a single string for
+``WordCloud.generate``; both grow with the size of the corpus.
+``SpaceSaving`` keeps at most ``capacity`` counters instead. Headlines are
+counted exactly one chunk at a time and each chunk is merged into the
+summary, which then drops its smallest counters. Summaries built by
+parallel workers merge the same way (Agarwal et al., "Mergeable
+Summaries", 2012).
+
+Every tracked count is an over-estimate by at most its recorded error, and
+any item that is not tracked occurred at most ``floor`` times, which never
+exceeds ``total / capacity``. With ``capacity=None`` nothing is dropped and
+the counts are exact, for checking results on small data.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .keywords import DEFAULT_CHUNKSIZE, count_chunk, default_stop_words, iter_chunks
+from .profiling import instrument
+
+
+DEFAULT_CAPACITY = 10_000
+
+
+class SpaceSaving:
+    """Top-k frequency summary with per-item error bounds.
+
+    Args:
+        capacity: Maximum number of tracked items; None counts exactly.
+
+    Example:
+        sketch = stream_keywords(df['headline'], capacity=5_000)
+        sketch.top(30)
+        cloud = word_cloud(sketch.frequencies(100))
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        if capacity is not None and capacity < 1:
+            raise ValueError(f"capacity must be positive or None, got {capacity!r}")
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.floor = 0
+        self.total = 0
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __contains__(self, item):
+        return item in self.counts
+
+    def __repr__(self):
+        capacity = 'exact' if self.capacity is None else f'capacity={self.capacity}'
+        return f'SpaceSaving({capacity}, tracked={len(self)}, total={self.total}, floor={self.floor})'
+
+    @property
+    def is_exact(self):
+        """True while no counter has been dropped (all counts are exact)."""
+        return self.floor == 0
+
+    def update(self, items):
+        """Add exact counts: a mapping item -> count or an iterable of items.
+
+        Returns:
+            self, to allow chaining.
+        """
+        if not hasattr(items, 'items'):
+            counts = {}
+            for item in items:
+                counts[item] = counts.get(item, 0) + 1
+            items = counts
+        counts, errors, floor = self.counts, self.errors, self.floor
+        for item, count in items.items():
+            if item in counts:
+                counts[item] += count
+            else:
+                counts[item] = floor + count
+                if floor:
+                    errors[item] = floor
+            self.total += count
+        self._truncate()
+        return self
+
+    def merge(self, other):
+        """Merge another summary into this one (in place).
+
+        An item tracked by only one summary is credited with the other's
+        ``floor``, the most it can have occurred there unseen.
+
+        Returns:
+            self, to allow chaining.
+        """
+        own_floor, other_floor = self.floor, other.floor
+        counts, errors = {}, {}
+        for item, count in self.counts.items():
+            if item in other.counts:
+                counts[item] = count + other.counts[item]
+                error = self.errors.get(item, 0) + other.errors.get(item, 0)
+            else:
+                counts[item] = count + other_floor
+                error = self.errors.get(item, 0) + other_floor
+            if error:
+                errors[item] = error
+        for item, count in other.counts.items():
+            if item not in counts:
+                counts[item] = count + own_floor
+                error = other.errors.get(item, 0) + own_floor
+                if error:
+                    errors[item] = error
+        self.counts, self.errors = counts, errors
+        self.floor = own_floor + other_floor
+        self.total += other.total
+        self._truncate()
+        return self
+
+    def _truncate(self):
+        """Drop the smallest counters beyond ``capacity``, keeping first-seen order."""
+        if self.capacity is None or len(self.counts) <= self.capacity:
+            return
+        counts = self.counts
+        ranked = sorted(counts, key=counts.__getitem__, reverse=True)
+        self.floor = max(self.floor, counts[ranked[self.capacity]])
+        keep = set(ranked[:self.capacity])
+        self.counts = {item: count for item, count in counts.items() if item in keep}
+        self.errors = {item: error for item, error in self.errors.items() if item in keep}
+
+    def estimate(self, item):
+        """Return ``(count, error)``; the true count lies in [count - error, count]."""
+        if item in self.counts:
+            return self.counts[item], self.errors.get(item, 0)
+        return self.floor, self.floor
+
+    def top(self, n=None):
+        """The ``n`` largest (item, count) pairs; ties keep first-seen order like ``Counter.most_common``."""
+        ranked = sorted(self.counts.items(), key=lambda pair: pair[1], reverse=True)
+        return ranked if n is None else ranked[:n]
+
+    def guaranteed_top(self, n):
+        """Items of ``top(n)`` that are certainly among the true ``n`` most frequent.
+
+        An item qualifies when its lower bound is at least the estimated
+        count of the first item ranked below ``n`` (or ``floor``).
+        """
+        ranked = self.top()
+        threshold = ranked[n][1] if len(ranked) > n else self.floor
+        return [(item, count) for item, count in ranked[:n] if count - self.errors.get(item, 0) >= threshold]
+
+    def frequencies(self, n=None):
+        """Dict of the ``n`` top items -> count, for ``WordCloud.generate_from_frequencies``."""
+        return dict(self.top(n))
+
+    def to_frame(self, n=None):
+        """DataFrame of the top items with 'count', 'error' and 'lower_bound' columns."""
+        ranked = self.top(n)
+        errors = [self.errors.get(item, 0) for item, _ in ranked]
+        counts = [count for _, count in ranked]
+        return pd.DataFrame({
+            'count': counts,
+            'error': errors,
+            'lower_bound': [count - error for count, error in zip(counts, errors)],
+        }, index=pd.Index([item for item, _ in ranked], name='item'))
+
+
+def sketch_chunk(headlines, stop_words, capacity=DEFAULT_CAPACITY):
+    """Keyword summary of one chunk of headlines; runs in worker processes."""
+    return SpaceSaving(capacity).update(count_chunk(headlines, stop_words))
+
+
+@instrument(rows=0)
+def stream_keywords(headlines, capacity=DEFAULT_CAPACITY, stop_words=None, chunksize=DEFAULT_CHUNKSIZE,
+                    n_jobs=1):
+    """Count keywords into a bounded ``SpaceSaving`` summary, chunk by chunk.
+
+    Keywords are the same tokens ``count_keywords`` counts. Only one chunk
+    per worker is held in memory, so ``headlines`` can be a generator over a
+    file of any size.
+
+    Args:
+        headlines: Series or iterable of headline strings (NaN is skipped).
+        capacity: Maximum number of tracked keywords; None counts exactly.
+        stop_words: Set of stop words; defaults to ``default_stop_words()``.
+        chunksize: Number of headlines tokenized per regex pass.
+        n_jobs: Number of worker processes; 1 runs in the current process.
+
+    Returns:
+        SpaceSaving summary. Partial summaries are merged in chunk order, so
+        the result does not depend on ``n_jobs``.
+    """
+    if stop_words is None:
+        stop_words = default_stop_words()
+    stop_words = frozenset(stop_words)
+    sketch = SpaceSaving(capacity)
+    chunks = iter_chunks(headlines, chunksize)
+
+    if n_jobs == 1:
+        for chunk in chunks:
+            sketch.update(count_chunk(chunk, stop_words))
+        return sketch
+
+    # Keep a bounded number of chunks in flight instead of submitting them all.
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        pending = []
+        for chunk in chunks:
+            pending.append(pool.submit(sketch_chunk, chunk, stop_words, capacity))
+            if len(pending) >= 2 * n_jobs:
+                sketch.merge(pending.pop(0).result())
+        for future in pending:
+            sketch.merge(future.result())
+    return sketch
+
+
+def word_cloud(frequencies, max_words=100, **kwargs):
+    """Build a WordCloud from a keyword -> count mapping.
+
+    Uses ``generate_from_frequencies`` instead of joining every keyword into
+    one string for ``generate``; unlike ``generate`` it does not re-tokenize
+    the text or add two-word collocations.
+
+    Args:
+        frequencies: Mapping such as ``SpaceSaving.frequencies()`` or a Counter.
+        max_words: Maximum number of words drawn.
+        **kwargs: Passed to ``wordcloud.WordCloud`` (width, colormap, ...).
+    """
+    from wordcloud import WordCloud
+
+    return WordCloud(max_words=max_words, **kwargs).generate_from_frequencies(dict(frequencies))
@@ -0,0 +1,339 @@
+"""
+Fused technical indicator engine.
+
+``compute_indicators`` takes OHLC price arrays and a declarative list of
+``IndicatorSpec`` objects and evaluates all of them in one pass over
+contiguous float64 arrays. Intermediate results are shared between specs
+(e.g. the 20-day rolling mean is computed once and used for both SMA_20 and
+BB_middle, EMA_12/EMA_26 are reused by MACD) and every output column is written
+into one preallocated block.
+
+Results follow the pandas fallbacks in task2_quantitative_analysis.ipynb
+(``rolling().mean()``, ``rolling().std()``, ``ewm(span, adjust=False)``, the
+simple-average RSI and ATR) up to floating-point rounding. All primitives work
+along axis 0, so 2-D (dates x symbols) arrays are supported as well.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .profiling import instrument
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """Declarative description of one indicator.
+
+    ``kind`` is one of 'sma', 'ema', 'rsi', 'macd', 'bollinger', 'atr' or
+    'stochastic'. Only the parameters relevant to that kind are used.
+    """
+
+    kind: str
+    window: int = 14
+    fast: int = 12
+    slow: int = 26
+    signal: int = 9
+    num_std: float = 2.0
+    smooth_k: int = 3
+    smooth_d: int = 3
+
+    def columns(self):
+        """Return the output column names, matching the notebook's naming."""
+        if self.kind == 'sma':
+            return [f'SMA_{self.window}']
+        if self.kind == 'ema':
+            return [f'EMA_{self.window}']
+        if self.kind == 'rsi':
+            return ['RSI']
+        if self.kind == 'macd':
+            return ['MACD', 'MACD_signal', 'MACD_histogram']
+        if self.kind == 'bollinger':
+            return ['BB_upper', 'BB_middle', 'BB_lower']
+        if self.kind == 'atr':
+            return ['ATR']
+        if self.kind == 'stochastic':
+            return ['Stoch_K', 'Stoch_D']
+        raise ValueError(f"Unknown indicator kind: {self.kind!r}")
+
+    def fields(self):
+        """Return the price fields this indicator needs."""
+        if self.kind in ('atr', 'stochastic'):
+            return ('High', 'Low', 'Close')
+        return ('Close',)
+
+
+DEFAULT_INDICATORS = (
+    IndicatorSpec('sma', window=20),
+    IndicatorSpec('sma', window=50),
+    IndicatorSpec('sma', window=200),
+    IndicatorSpec('ema', window=12),
+    IndicatorSpec('ema', window=26),
+    IndicatorSpec('rsi', window=14),
+    IndicatorSpec('macd', fast=12, slow=26, signal=9),
+    IndicatorSpec('bollinger', window=20, num_std=2.0),
+    IndicatorSpec('atr', window=14),
+    IndicatorSpec('stochastic', window=14, smooth_k=3, smooth_d=3),
+)
+
+
+@instrument(rows=lambda result: result[1][..., 0].size)
+def compute_indicators(prices, specs=DEFAULT_INDICATORS):
+    """Evaluate a list of indicator specs over OHLC price arrays.
+
+    Args:
+        prices: Mapping (dict or DataFrame) from field name ('Close', 'High',
+            'Low') to a 1-D array of length T, or a 2-D (T, n_symbols) array.
+        specs: Iterable of ``IndicatorSpec``.
+
+    Returns:
+        Tuple ``(columns, block)`` where ``block[..., j]`` holds ``columns[j]``.
+        The block has shape (T, n_columns) or (T, n_symbols, n_columns).
+    """
+    specs = list(specs)
+    columns = [name for spec in specs for name in spec.columns()]
+    duplicates = sorted({name for name in columns if columns.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Indicator specs produce duplicate columns: {duplicates}")
+
+    workspace = _Workspace(prices)
+    # Column-major storage keeps each column contiguous while it is written;
+    # the returned array is a (..., n_columns) view of the same memory.
+    storage = np.empty((len(columns),) + workspace.shape, dtype=np.float64)
+    position = 0
+    for spec in specs:
+        for output in _evaluate(spec, workspace):
+            storage[position] = output
+            position += 1
+    return columns, np.moveaxis(storage, 0, -1)
+
+
+def add_indicators(df, specs=DEFAULT_INDICATORS):
+    """Return ``df`` with indicator columns appended in a single concat."""
+    columns, block = compute_indicators(df, specs)
+    indicators = pd.DataFrame(block, index=df.index, columns=columns)
+    return pd.concat([df.drop(columns=[c for c in columns if c in df.columns]), indicators], axis=1)
+
+
+def rolling_mean(values, window):
+    """Trailing rolling mean along axis 0; NaN until ``window`` valid values.
+
+    Uses a cumulative-sum difference, so the cost is O(T) for any window.
+    Windows containing a NaN produce NaN, as pandas does with the default
+    ``min_periods``.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    if window > len(values):
+        return out
+    missing = np.isnan(values)
+    has_missing = missing.any()
+    # Centering on a per-column reference keeps the running sums small
+    reference = _column_reference(values)
+    centered = values - reference
+    if has_missing:
+        centered[missing] = 0.0
+    means = _window_diff(np.cumsum(centered, axis=0), window)
+    means /= window
+    means += reference
+    if has_missing:
+        nan_counts = _window_diff(np.cumsum(missing, axis=0, dtype=np.int64), window)
+        means[nan_counts > 0] = np.nan
+    out[window - 1:] = means
+    return out
+
+
+def rolling_std(values, window, mean=None):
+    """Trailing rolling sample standard deviation (ddof=1) along axis 0.
+
+    A precomputed rolling mean can be passed to share work with SMA and
+    Bollinger middle bands.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    if window > len(values) or window < 2:
+        return out
+    if mean is None:
+        mean = rolling_mean(values, window)
+    windows = sliding_window_view(values, window, axis=0)
+    deviations = windows - mean[window - 1:][..., np.newaxis]
+    variance = np.einsum('...i,...i->...', deviations, deviations) / (window - 1)
+    out[window - 1:] = np.sqrt(variance)
+    return out
+
+
+def rolling_max(values, window):
+    """Trailing rolling maximum along axis 0 (NaN if any value is missing)."""
+    return _rolling_reduce(values, window, np.max)
+
+
+def rolling_min(values, window):
+    """Trailing rolling minimum along axis 0 (NaN if any value is missing)."""
+    return _rolling_reduce(values, window, np.min)
+
+
+def ema(values, span):
+    """Exponential moving average equal to ``ewm(span=span, adjust=False).mean()``.
+
+    The recursion runs in C through ``scipy.signal.lfilter``. Leading NaNs are
+    skipped per column; columns with interior gaps fall back to pandas, whose
+    NaN weighting cannot be expressed as a linear filter.
+    """
+    from scipy.signal import lfilter
+
+    values = np.asarray(values, dtype=np.float64)
+    alpha = 2.0 / (span + 1.0)
+    matrix = values.reshape(len(values), -1)
+    out = np.full(matrix.shape, np.nan)
+    if len(matrix) == 0:
+        return out.reshape(values.shape)
+
+    missing = np.isnan(matrix)
+    has_value = ~missing.all(axis=0)
+    first = np.where(has_value, np.argmin(missing, axis=0), len(matrix))
+    after_start = np.arange(len(matrix))[:, np.newaxis] >= first
+    gap = (missing & after_start).any(axis=0)
+
+    linear = np.flatnonzero(has_value & ~gap)
+    if len(linear):
+        start = first[linear]
+        seed = matrix[start, linear]
+        # Hold each column at its first valid value until it starts
+        filled = np.where(missing[:, linear], seed, matrix[:, linear])
+        zi = ((1.0 - alpha) * seed)[np.newaxis, :]
+        smoothed, _ = lfilter([alpha], [1.0, alpha - 1.0], filled[1:], axis=0, zi=zi)
+        result = np.vstack([seed[np.newaxis, :], smoothed])
+        result[~after_start[:, linear]] = np.nan
+        out[:, linear] = result
+
+    fallback = np.flatnonzero(gap)
+    if len(fallback):
+        frame = pd.DataFrame(matrix[:, fallback])
+        out[:, fallback] = frame.ewm(span=span, adjust=False).mean().to_numpy()
+    return out.reshape(values.shape)
+
+
+def true_range(high, low, close):
+    """True range, with the first bar falling back to High - Low."""
+    previous_close = np.full(np.shape(close), np.nan)
+    previous_close[1:] = close[:-1]
+    ranges = np.fmax(high - low, np.abs(high - previous_close))
+    return np.fmax(ranges, np.abs(low - previous_close))
+
+
+class _Workspace:
+    """Holds the input arrays and memoizes shared intermediates."""
+
+    def __init__(self, prices):
+        self._prices = prices
+        self._arrays = {}
+        self._memo = {}
+        self.shape = np.shape(self.field('Close'))
+
+    def field(self, name):
+        if name not in self._arrays:
+            values = np.asarray(self._prices[name], dtype=np.float64)
+            self._arrays[name] = np.ascontiguousarray(values)
+        return self._arrays[name]
+
+    def cached(self, key, compute):
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    def sma(self, name, window, source=None):
+        source = self.field(name) if source is None else source
+        return self.cached(('sma', name, window), lambda: rolling_mean(source, window))
+
+    def ema(self, name, span, source=None):
+        source = self.field(name) if source is None else source
+        return self.cached(('ema', name, span), lambda: ema(source, span))
+
+    def delta(self):
+        def compute():
+            close = self.field('Close')
+            delta = np.full(close.shape, np.nan)
+            delta[1:] = close[1:] - close[:-1]
+            return delta
+        return self.cached(('delta',), compute)
+
+    def true_range(self):
+        return self.cached(('true_range',), lambda: true_range(
+            self.field('High'), self.field('Low'), self.field('Close')))
+
+
+def _evaluate(spec, ws):
+    """Return the output arrays for one spec, in ``spec.columns()`` order."""
+    kind = spec.kind
+    if kind == 'sma':
+        return [ws.sma('Close', spec.window)]
+
+    if kind == 'ema':
+        return [ws.ema('Close', spec.window)]
+
+    if kind == 'rsi':
+        delta = ws.delta()
+        # NaN deltas count as zero, like delta.where(delta > 0, 0); rows
+        # without a close (e.g. before a symbol's first day) stay missing.
+        missing = np.isnan(ws.field('Close'))
+        gain = ws.sma('gain', spec.window, np.where(missing, np.nan, np.where(delta > 0, delta, 0.0)))
+        loss = ws.sma('loss', spec.window, np.where(missing, np.nan, np.where(delta < 0, -delta, 0.0)))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = gain / loss
+            return [100.0 - 100.0 / (1.0 + rs)]
+
+    if kind == 'macd':
+        macd = ws.ema('Close', spec.fast) - ws.ema('Close', spec.slow)
+        signal = ws.ema(f'macd_{spec.fast}_{spec.slow}', spec.signal, macd)
+        return [macd, signal, macd - signal]
+
+    if kind == 'bollinger':
+        close = ws.field('Close')
+        middle = ws.sma('Close', spec.window)
+        std = ws.cached(('std', 'Close', spec.window),
+                        lambda: rolling_std(close, spec.window, mean=middle))
+        return [middle + std * spec.num_std, middle, middle - std * spec.num_std]
+
+    if kind == 'atr':
+        return [ws.sma('true_range', spec.window, ws.true_range())]
+
+    if kind == 'stochastic':
+        lowest = ws.cached(('min', 'Low', spec.window),
+                           lambda: rolling_min(ws.field('Low'), spec.window))
+        highest = ws.cached(('max', 'High', spec.window),
+                            lambda: rolling_max(ws.field('High'), spec.window))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fast_k = 100.0 * (ws.field('Close') - lowest) / (highest - lowest)
+        slow_k = rolling_mean(fast_k, spec.smooth_k)
+        slow_d = rolling_mean(slow_k, spec.smooth_d)
+        return [slow_k, slow_d]
+
+    raise ValueError(f"Unknown indicator kind: {kind!r}")
+
+
+def _column_reference(values):
+    """Per-column offset used to center values before cumulative sums."""
+    with np.errstate(invalid='ignore'):
+        valid = ~np.isnan(values)
+        counts = valid.sum(axis=0)
+        totals = np.where(valid, values, 0.0).sum(axis=0)
+        reference = np.where(counts > 0, totals / np.maximum(counts, 1), 0.0)
+    return reference
+
+
+def _window_diff(cumulative, window):
+    """Sums over trailing windows from a cumulative sum along axis 0."""
+    out = cumulative[window - 1:].astype(np.float64, copy=True)
+    out[1:] -= cumulative[:len(cumulative) - window]
+    return out
+
+
+def _rolling_reduce(values, window, reducer):
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    if window > len(values):
+        return out
+    windows = sliding_window_view(values, window, axis=0)
+    out[window - 1:] = reducer(windows, axis=-1)
+    return out
@@ -0,0 +1,205 @@
+"""
+Multi-window financial metrics for many symbols at once.
+
+The quantitative notebook's ``calculate_financial_metrics`` works on one
+symbol and the full history at a time. ``window_metrics`` takes closes as a
+(dates x symbols) array and returns every metric for every symbol and every
+lookback window in one table:
+
+* Each symbol's observations are right-aligned on a shared row axis, so a
+  window of ``n`` rows is the symbol's last ``n`` prices whatever its
+  history length or gaps.
+* Returns, volatility and average volume come from shared cumulative sums:
+  each window is a difference of two rows.
+* Max drawdown for every window comes from one backward pass. The worst
+  drawdown of a window starting at row ``s`` is the worse of the one
+  starting at ``s + 1`` and the fall from ``close[s]`` to the lowest later
+  close.
+* The same pass locates each window's drawdown peak and trough. That gives
+  the drawdown duration (peak to recovery, or to the last day) and the
+  recovery time (trough back to the peak price).
+
+Returns and drawdowns are in percent, like the notebook's metrics. Windows
+count price rows, so ``'all'`` reproduces the notebook's full-history
+Total_Return, Annualized_Return and Max_Drawdown.
+"""
+import numpy as np
+import pandas as pd
+
+from .panel import TRADING_DAYS, PricePanel
+from .profiling import instrument
+
+
+DEFAULT_WINDOWS = {'1M': 21, '3M': 63, '1Y': 252, '3Y': 756, 'all': None}
+METRIC_COLUMNS = [
+    'Observations', 'Total_Return', 'Annualized_Return', 'Volatility', 'Sharpe_Ratio',
+    'Max_Drawdown', 'Drawdown_Days', 'Recovery_Days', 'High', 'Low', 'Avg_Volume', 'Current_Price',
+]
+
+
+def right_align(values, valid=None, order=None):
+    """Move each column's valid entries to the bottom, keeping their order.
+
+    Args:
+        values: (T, S) array.
+        valid: Boolean (T, S) array; defaults to the non-NaN entries.
+        order: Precomputed ``alignment_order(valid)`` to reuse across fields.
+
+    Returns:
+        Tuple ``(aligned, counts)``: the (T, S) array with NaN padding on
+        top, and the number of valid entries per column.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if valid is None:
+        valid = ~np.isnan(values)
+    if order is None:
+        order = alignment_order(valid)
+    aligned = np.take_along_axis(np.where(valid, values, np.nan), order, axis=0)
+    return aligned, valid.sum(axis=0)
+
+
+def alignment_order(valid):
+    """Row permutation per column that puts invalid rows first (stable)."""
+    return np.argsort(valid, axis=0, kind='stable')
+
+
+@instrument(rows=0)
+def window_metrics(close, high=None, low=None, volume=None, windows=DEFAULT_WINDOWS,
+                   periods_per_year=TRADING_DAYS):
+    """Metrics for every symbol over several trailing windows.
+
+    Args:
+        close: DataFrame (dates x symbols) of closes, NaN where a symbol has
+            no data, or a PricePanel (its High, Low and Volume are used).
+            For a returns frame pass ``(1 + returns).cumprod()``.
+        high, low, volume: Optional frames of the same shape; High and Low
+            default to ``close``, Avg_Volume is NaN without ``volume``.
+        windows: Mapping window name -> number of price rows; None means
+            the symbol's full history.
+        periods_per_year: Periods used to annualize returns and volatility.
+
+    Returns:
+        DataFrame indexed by (Symbol, Window) with ``METRIC_COLUMNS``.
+        Windows longer than a symbol's history are NaN. Volatility is the
+        annualized sample standard deviation of daily returns and
+        Sharpe_Ratio is Annualized_Return / Volatility, as in the notebook
+        (no risk-free rate). Drawdown_Days and Recovery_Days count trading
+        days; Recovery_Days is NaN while the drawdown is not recovered.
+    """
+    if isinstance(close, PricePanel):
+        panel = close
+        high, low, volume = (panel.field_frame(panel[field]) if field in panel else None
+                             for field in ('High', 'Low', 'Volume'))
+        close = panel.field_frame(panel['Close'])
+    frame = close if isinstance(close, pd.DataFrame) else pd.DataFrame(close)
+    valid = frame.notna().to_numpy()
+    order = alignment_order(valid)
+    prices, counts = right_align(frame.to_numpy(dtype=np.float64, na_value=np.nan), valid, order)
+    highs = right_align(_values(high, frame), valid, order)[0] if high is not None else prices
+    lows = right_align(_values(low, frame), valid, order)[0] if low is not None else prices
+    volumes = right_align(_values(volume, frame), valid, order)[0] if volume is not None else None
+    n_rows, n_symbols = prices.shape
+    columns = np.arange(n_symbols)
+
+    # Shared cumulative sums (row k holds the sum of rows < k).
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = prices[1:] / prices[:-1] - 1.0
+    # Demeaning leaves every window's variance unchanged and keeps the
+    # running sums of squares small.
+    present = ~np.isnan(returns)
+    returns = np.where(present, returns - np.nansum(returns, axis=0) / np.maximum(present.sum(axis=0), 1), 0.0)
+    sum_returns = _prefix_sum(returns)
+    sum_squares = _prefix_sum(returns * returns)
+    sum_volume = _prefix_sum(np.nan_to_num(volumes)) if volumes is not None else None
+
+    # Backward pass: worst drawdown of the window starting at each row.
+    filled = np.where(np.isnan(prices), np.inf, prices)
+    rows = np.arange(n_rows)[:, np.newaxis]
+    suffix_min = np.minimum.accumulate(filled[::-1], axis=0)[::-1]
+    with np.errstate(invalid='ignore'):
+        drop = suffix_min / filled - 1.0
+    drop[np.isnan(prices)] = 0.0
+    worst = np.minimum.accumulate(drop[::-1], axis=0)[::-1]
+    peak_row = _next_index(drop == worst, n_rows)
+    trough_row = _next_index(filled == suffix_min, n_rows)
+
+    results = []
+    for name, window in windows.items():
+        length = counts if window is None else np.full(n_symbols, window)
+        usable = (length >= 2) & (length <= counts)
+        start = np.where(usable, n_rows - length, n_rows - 1)
+        first, last = prices[start, columns], prices[-1]
+        growth = last / first
+
+        n_returns = length - 1
+        s1 = sum_returns[-1] - sum_returns[start, columns]
+        s2 = sum_squares[-1] - sum_squares[start, columns]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = np.maximum(s2 - s1 * s1 / n_returns, 0.0) / (n_returns - 1)
+            volatility = np.sqrt(variance * periods_per_year) * 100
+            annualized = (growth ** (periods_per_year / length) - 1) * 100
+            sharpe = np.where(volatility > 0, annualized / volatility, 0.0)
+
+        peak = peak_row[start, columns]
+        trough = trough_row[peak, columns]
+        recovery = _first_recovery(prices, peak, trough)
+        recovered = recovery < n_rows
+        drawdown = worst[start, columns]
+        flat = drawdown == 0
+
+        in_window = rows >= start
+        values = {
+            'Observations': length,
+            'Total_Return': (growth - 1) * 100,
+            'Annualized_Return': annualized,
+            'Volatility': volatility,
+            'Sharpe_Ratio': sharpe,
+            'Max_Drawdown': drawdown * 100,
+            'Drawdown_Days': np.where(flat, 0, np.where(recovered, recovery, n_rows - 1) - peak),
+            'Recovery_Days': np.where(flat, 0, np.where(recovered, recovery - trough, np.nan)),
+            'High': np.nanmax(np.where(in_window, highs, -np.inf), axis=0),
+            'Low': np.nanmin(np.where(in_window, lows, np.inf), axis=0),
+            'Avg_Volume': ((sum_volume[-1] - sum_volume[start, columns]) / length
+                           if sum_volume is not None else np.full(n_symbols, np.nan)),
+            'Current_Price': last,
+        }
+        table = pd.DataFrame(values, columns=METRIC_COLUMNS, dtype=np.float64)
+        table.loc[~usable, METRIC_COLUMNS[1:]] = np.nan
+        table['Observations'] = np.where(usable, length, counts)
+        table.insert(0, 'Window', name)
+        table.insert(0, 'Symbol', frame.columns)
+        results.append(table)
+
+    table = pd.concat(results, ignore_index=True).set_index(['Symbol', 'Window'])
+    return table.reindex(pd.MultiIndex.from_product([frame.columns, list(windows)], names=['Symbol', 'Window']))
+
+
+def _values(field, frame):
+    """Align an optional field frame with the closes and return its array."""
+    if isinstance(field, pd.DataFrame):
+        field = field.reindex(index=frame.index, columns=frame.columns)
+        return field.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.asarray(field, dtype=np.float64)
+
+
+def _prefix_sum(values):
+    """Cumulative sums along axis 0 with a leading row of zeros."""
+    out = np.zeros((len(values) + 1,) + values.shape[1:])
+    np.cumsum(values, axis=0, out=out[1:])
+    return out
+
+
+def _next_index(flags, n_rows):
+    """For each (row, column), the first row at or after it where ``flags`` is True."""
+    index = np.where(flags, np.arange(n_rows)[:, np.newaxis], n_rows)
+    return np.minimum.accumulate(index[::-1], axis=0)[::-1]
+
+
+def _first_recovery(prices, peak, trough):
+    """First row after ``trough`` whose close is back at the peak close (len(prices) if none)."""
+    n_rows, n_symbols = prices.shape
+    columns = np.arange(n_symbols)
+    level = prices[np.minimum(peak, n_rows - 1), columns]
+    with np.errstate(invalid='ignore'):
+        back = (prices >= level) & (np.arange(n_rows)[:, np.newaxis] > trough)
+    return np.where(back.any(axis=0), np.argmax(back, axis=0), n_rows)
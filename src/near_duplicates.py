@@ -0,0 +1,244 @@
+"""
+Near-duplicate headline clustering with MinHash and LSH banding.
+
+The EDA notebook only counts exact ``df.duplicated()`` rows, but syndicated
+headlines ("Stocks That Hit 52-Week Highs On Friday" / "... On Thursday",
+one story from several publishers) differ by a word or two.
+``NearDuplicateClusters`` groups them without comparing every pair:
+
+1. Exact repeats are factorized away; each distinct text is lowercased,
+   split into words and turned into a set of hashed word shingles.
+2. A MinHash signature (``num_perm`` multiply-shift hashes) is computed per
+   text, in parallel chunks, and cut into ``bands`` bands. Texts sharing a
+   band bucket become candidate pairs; each bucket member is paired with
+   its few nearest predecessors in the bucket only, so the work stays
+   linear in the number of texts even for very large buckets.
+3. Candidates whose exact shingle Jaccard similarity reaches ``threshold``
+   are linked, and connected components become clusters.
+
+Clusters are transitive: A ~ B and B ~ C put A and C together even when A
+and C are less similar than ``threshold``.
+"""
+import functools
+import itertools
+import re
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .profiling import instrument
+
+
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+DEFAULT_SHINGLE_SIZE = 1
+DEFAULT_NEIGHBORS = 4
+DEFAULT_CHUNKSIZE = 50_000
+# Candidate pairs whose shingles are compared at once (bounds peak memory).
+VERIFY_BATCH = 500_000
+
+_WORD = re.compile(r'\w+')
+_MIX = np.uint64(0x100000001B3)
+
+
+def shingle_hashes(text, shingle_size=DEFAULT_SHINGLE_SIZE):
+    """Set of CRC32 hashes of the lowercased word shingles of one text."""
+    words = _WORD.findall(text.lower())
+    if len(words) > shingle_size > 1:
+        words = [' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+    elif len(words) <= shingle_size and words:
+        words = [' '.join(words)]
+    return {zlib.crc32(word.encode('utf-8')) for word in words}
+
+
+def hash_parameters(num_perm=DEFAULT_NUM_PERM, seed=1):
+    """Odd multipliers and offsets of the ``num_perm`` multiply-shift hashes."""
+    rng = np.random.default_rng(seed)
+    multipliers = rng.integers(0, 2**63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    offsets = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+    return multipliers, offsets
+
+
+def band_keys(texts, multipliers, offsets, bands, shingle_size=DEFAULT_SHINGLE_SIZE):
+    """Shingles and LSH band keys of a chunk of texts; runs in worker processes.
+
+    Returns:
+        Tuple ``(lengths, hashes, keys)``: shingle count per text, the
+        concatenated shingle hashes, and a (n_texts x bands) uint64 array of
+        band keys (rows of texts without words are unused).
+    """
+    shingles = [shingle_hashes(text, shingle_size) for text in texts]
+    lengths = np.fromiter(map(len, shingles), dtype=np.int64, count=len(shingles))
+    hashes = np.fromiter(itertools.chain.from_iterable(shingles), dtype=np.uint64, count=int(lengths.sum()))
+    keys = np.zeros((len(texts), bands), dtype=np.uint64)
+    nonempty = lengths > 0
+    if not nonempty.any():
+        return lengths, hashes, keys
+
+    starts = (np.cumsum(lengths) - lengths)[nonempty]
+    rows_per_band = len(multipliers) // bands
+    shift = np.uint64(32)
+    for j, (multiplier, offset) in enumerate(zip(multipliers, offsets)):
+        # Multiply-shift hashing: uint64 arithmetic wraps around by design.
+        minima = np.minimum.reduceat((hashes * multiplier + offset) >> shift, starts)
+        band = j // rows_per_band
+        if band < bands:
+            keys[nonempty, band] = keys[nonempty, band] * _MIX ^ minima
+    return lengths, hashes, keys
+
+
+class NearDuplicateClusters:
+    """Cluster id per headline plus a representative headline per cluster.
+
+    Attributes:
+        labels: int64 Series aligned with the headlines; -1 marks missing
+            headlines. Cluster ids follow first appearance.
+        representatives: Series cluster id -> representative headline (the
+            cluster's most frequent text, earliest on ties).
+        sizes: Series cluster id -> number of headlines.
+    """
+
+    def __init__(self, labels, representatives, sizes):
+        self.labels = labels
+        self.representatives = representatives
+        self.sizes = sizes
+
+    def __len__(self):
+        return len(self.representatives)
+
+    @classmethod
+    @instrument('near_duplicates', rows=1)
+    def from_headlines(cls, headlines, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM,
+                       bands=DEFAULT_BANDS, shingle_size=DEFAULT_SHINGLE_SIZE, neighbors=DEFAULT_NEIGHBORS,
+                       chunksize=DEFAULT_CHUNKSIZE, n_jobs=1, seed=1):
+        """Cluster headlines whose word-shingle Jaccard similarity reaches ``threshold``.
+
+        Args:
+            headlines: Series or list of headlines; missing values get label -1.
+            threshold: Minimum Jaccard similarity of linked headlines.
+            num_perm: Number of MinHash functions.
+            bands: Number of LSH bands (``num_perm`` must be a multiple).
+                Pairs with similarity s become candidates with probability
+                1 - (1 - s**r)**bands, r = num_perm / bands.
+            shingle_size: Words per shingle.
+            neighbors: Bucket members each text is compared with, per band;
+                more finds more links in crowded buckets at linear extra cost.
+            chunksize: Distinct texts hashed per task.
+            n_jobs: Number of worker processes for hashing.
+            seed: Seed of the MinHash functions.
+
+        Returns:
+            NearDuplicateClusters.
+        """
+        from scipy import sparse
+        from scipy.sparse.csgraph import connected_components
+
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        headlines = headlines if isinstance(headlines, pd.Series) else pd.Series(headlines, dtype=object)
+        codes, uniques = pd.factorize(headlines.where(headlines.map(type) == str))
+        texts = list(uniques)
+        lengths, hashes, keys = _hash_texts(texts, num_perm, bands, shingle_size, chunksize, n_jobs, seed)
+
+        pairs = _candidate_pairs(keys, lengths > 0, neighbors)
+        pairs = pairs[_jaccard(pairs, lengths, hashes) >= threshold]
+        graph = sparse.coo_matrix((np.ones(len(pairs), dtype=np.int8), (pairs[:, 0], pairs[:, 1])),
+                                  shape=(len(texts), len(texts)))
+        _, components = connected_components(graph, directed=False)
+        # Distinct texts are in first-appearance order, so this orders clusters too.
+        text_labels = pd.factorize(components)[0]
+
+        valid = codes >= 0
+        labels = np.full(len(codes), -1, dtype=np.int64)
+        labels[valid] = text_labels[codes[valid]]
+        text_rows = np.bincount(codes[valid], minlength=len(texts))
+        n_clusters = int(text_labels.max()) + 1 if len(texts) else 0
+
+        # Representative: most rows, then earliest text, within each cluster.
+        order = np.lexsort((np.arange(len(texts)), -text_rows, text_labels))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = text_labels[order][1:] != text_labels[order][:-1]
+        index = pd.RangeIndex(n_clusters, name='cluster')
+        representatives = pd.Series(np.asarray(texts, dtype=object)[order[first]], index=index,
+                                    name='representative')
+        sizes = pd.Series(np.bincount(labels[valid], minlength=n_clusters), index=index, name='size')
+        return cls(pd.Series(labels, index=headlines.index, name='cluster'), representatives, sizes)
+
+    def representative_headlines(self):
+        """Representative headline of each row's cluster (NaN for missing rows)."""
+        values = np.full(len(self.labels), np.nan, dtype=object)
+        valid = self.labels.to_numpy() >= 0
+        values[valid] = self.representatives.to_numpy()[self.labels.to_numpy()[valid]]
+        return pd.Series(values, index=self.labels.index, name='representative')
+
+    def first_in_cluster(self):
+        """Boolean Series marking the first headline of each cluster (for de-duplication)."""
+        labels = self.labels.to_numpy()
+        first = ~pd.Series(labels).duplicated().to_numpy() & (labels >= 0)
+        return pd.Series(first, index=self.labels.index, name='first_in_cluster')
+
+    def summary(self, n=10):
+        """The ``n`` largest clusters with their size and representative."""
+        frame = pd.concat([self.sizes, self.representatives], axis=1)
+        return frame.sort_values('size', ascending=False, kind='stable').head(n)
+
+
+def _hash_texts(texts, num_perm, bands, shingle_size, chunksize, n_jobs, seed):
+    """Shingle lengths, concatenated hashes and band keys of all texts, chunk by chunk."""
+    multipliers, offsets = hash_parameters(num_perm, seed)
+    chunks = [texts[start:start + chunksize] for start in range(0, len(texts), chunksize)]
+    hash_chunk = functools.partial(band_keys, multipliers=multipliers, offsets=offsets, bands=bands,
+                                   shingle_size=shingle_size)
+    if n_jobs == 1 or len(chunks) <= 1:
+        results = [hash_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            results = list(pool.map(hash_chunk, chunks))
+    if not results:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint64), np.empty((0, bands), dtype=np.uint64)
+    lengths, hashes, keys = zip(*results)
+    return np.concatenate(lengths), np.concatenate(hashes), np.concatenate(keys)
+
+
+def _candidate_pairs(keys, nonempty, neighbors):
+    """Unique (i, j) pairs, i < j, of texts sharing a band bucket.
+
+    Each member of a bucket is paired with the ``neighbors`` members before
+    it (in text order) rather than with every other member.
+    """
+    ids = np.flatnonzero(nonempty)
+    pairs = [np.empty((0, 2), dtype=np.int64)]
+    for band in range(keys.shape[1]):
+        band_values = keys[ids, band]
+        order = np.argsort(band_values, kind='stable')
+        sorted_values = band_values[order]
+        for distance in range(1, neighbors + 1):
+            same = sorted_values[distance:] == sorted_values[:-distance]
+            pairs.append(np.column_stack([ids[order[:-distance][same]], ids[order[distance:][same]]]))
+    pairs = np.concatenate(pairs)
+    n = np.int64(len(keys))
+    unique = np.unique(pairs[:, 0] * n + pairs[:, 1])
+    return np.column_stack([unique // n, unique % n])
+
+
+def _jaccard(pairs, lengths, hashes):
+    """Exact Jaccard similarity of the shingle sets of each candidate pair."""
+    similarity = np.empty(len(pairs))
+    starts = np.cumsum(lengths) - lengths
+    for batch in range(0, len(pairs), VERIFY_BATCH):
+        left, right = pairs[batch:batch + VERIFY_BATCH, 0], pairs[batch:batch + VERIFY_BATCH, 1]
+        size_left, size_right = lengths[left], lengths[right]
+        sizes = np.concatenate([size_left, size_right])
+        owners = np.repeat(np.concatenate([np.arange(len(left))] * 2), sizes)
+        first = np.repeat(np.concatenate([starts[left], starts[right]]), sizes)
+        offsets = np.arange(len(first)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        tagged = (owners.astype(np.uint64) << np.uint64(32)) | hashes[first + offsets]
+        tagged.sort()
+        shared = tagged[1:] == tagged[:-1]
+        intersection = np.bincount((tagged[1:][shared] >> np.uint64(32)).astype(np.int64), minlength=len(left))
+        union = size_left + size_right - intersection
+        similarity[batch:batch + len(left)] = intersection / union
+    return similarity
@@ -0,0 +1,414 @@
+"""
+Chunked loader and columnar cache for the financial news dataset
+(raw_analyst_ratings.csv).
+
+The first call to ``load_news`` reads the CSV in chunks, normalizes each chunk
+(drops 'Unnamed: 0', parses dates, casts publisher/stock to categoricals) and
+writes one flat binary file per column. Later calls memory-map those files
+instead of re-reading and re-parsing the CSV. The cache is invalidated
+automatically when the size or modification time of the CSV changes.
+
+The dataset's text columns are read with declared dtypes (``NEWS_DTYPES``)
+and each column's storage kind follows its declared dtype, so a chunk that
+happens to be all-missing cannot change it. Numeric columns keep their
+source dtype: integers stay int64 unless a later chunk has missing values
+or fractions, in which case the whole column is promoted as
+``pd.concat`` would, and cached and uncached loads agree.
+"""
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from .cache import (
+    commit_staging_dir,
+    default_cache_dir,
+    file_fingerprint,
+    make_staging_dir,
+    read_manifest,
+    write_manifest,
+)
+from .dates import parse_mixed_dates
+from .profiling import instrument
+
+
+CACHE_VERSION = 2
+DEFAULT_CHUNKSIZE = 250_000
+DATE_COLUMN = 'date'
+CATEGORICAL_COLUMNS = ('publisher', 'stock')
+DROP_COLUMNS = ('Unnamed: 0',)
+NEWS_DTYPES = {'headline': str, 'url': str, 'publisher': str, 'date': str, 'stock': str}
+
+
+def parse_news_dates(values):
+    """Parse the mixed-format news date column into naive UTC timestamps."""
+    dates, _ = parse_mixed_dates(values)
+    return dates
+
+
+def normalize_news_chunk(df):
+    """Apply the standard news preprocessing to one DataFrame chunk.
+
+    Rows whose date cannot be parsed are dropped, matching the EDA notebook.
+    """
+    df = df.drop(columns=[col for col in DROP_COLUMNS if col in df.columns])
+    if DATE_COLUMN in df.columns:
+        df[DATE_COLUMN] = parse_news_dates(df[DATE_COLUMN])
+        df = df.dropna(subset=[DATE_COLUMN])
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def declared_dtypes(dtype=None):
+    """``NEWS_DTYPES`` updated with caller-declared column dtypes."""
+    declared = dict(NEWS_DTYPES)
+    declared.update(dtype or {})
+    return declared
+
+
+def iter_news_chunks(path, chunksize=DEFAULT_CHUNKSIZE, dtype=None):
+    """Yield normalized DataFrame chunks from the news CSV.
+
+    Only one chunk is held in memory at a time, so this works for files that
+    are larger than RAM. Categories are local to each chunk. ``dtype`` adds
+    to or overrides ``NEWS_DTYPES``.
+    """
+    with pd.read_csv(path, chunksize=chunksize, dtype=declared_dtypes(dtype)) as reader:
+        for chunk in reader:
+            yield normalize_news_chunk(chunk)
+
+
+@instrument(rows='result')
+def load_news(path, cache_dir=None, use_cache=True, refresh=False,
+              chunksize=DEFAULT_CHUNKSIZE, string_storage='auto', dtype=None):
+    """Load the normalized news dataset, building the columnar cache if needed.
+
+    Args:
+        path: Path to raw_analyst_ratings.csv (or a file with the same layout).
+        cache_dir: Directory holding the cache. Defaults to ``.cache`` next to
+            the CSV file.
+        use_cache: If False, read the CSV directly without touching the cache.
+        refresh: Rebuild the cache even if it is still valid.
+        chunksize: Number of CSV rows processed per chunk when ingesting.
+        string_storage: 'pyarrow' to return text columns as zero-copy Arrow
+            strings, 'python' for object columns, or 'auto' to use Arrow when
+            pyarrow is installed.
+        dtype: Mapping column -> dtype for columns beyond ``NEWS_DTYPES``
+            (e.g. extra numeric columns), passed to ``pd.read_csv``.
+
+    Returns:
+        DataFrame with a datetime64[ns] 'date' column and categorical
+        'publisher' and 'stock' columns.
+    """
+    if not use_cache:
+        chunks = list(iter_news_chunks(path, chunksize=chunksize, dtype=dtype))
+        df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+        for col in CATEGORICAL_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        return df
+
+    cache_path = news_cache_path(path, cache_dir)
+    if refresh or not is_cache_valid(path, cache_path):
+        build_news_cache(path, cache_path, chunksize=chunksize, dtype=dtype)
+    return read_news_cache(cache_path, string_storage=string_storage)
+
+
+def news_cache_path(path, cache_dir=None):
+    """Return the cache directory used for a given news CSV."""
+    if cache_dir is None:
+        cache_dir = default_cache_dir(path)
+    return os.path.join(cache_dir, os.path.basename(path) + '.columns')
+
+
+def is_cache_valid(path, cache_path):
+    """Check whether the cache at ``cache_path`` matches the current CSV."""
+    manifest = read_manifest(cache_path)
+    if manifest is None or manifest.get('version') != CACHE_VERSION:
+        return False
+    fingerprint = file_fingerprint(path)
+    return all(manifest.get(key) == value for key, value in fingerprint.items())
+
+
+def build_news_cache(path, cache_path, chunksize=DEFAULT_CHUNKSIZE, dtype=None):
+    """Ingest the CSV in chunks and write the columnar cache."""
+    declared = declared_dtypes(dtype)
+    fingerprint = file_fingerprint(path)
+    staging = make_staging_dir(cache_path)
+    writers = None
+    n_rows = 0
+    dropped_rows = 0
+
+    try:
+        with pd.read_csv(path, chunksize=chunksize, dtype=declared) as reader:
+            for raw_chunk in reader:
+                chunk = normalize_news_chunk(raw_chunk)
+                dropped_rows += len(raw_chunk) - len(chunk)
+                if writers is None:
+                    writers = [_make_writer(staging, col, declared.get(col), chunk[col]) for col in chunk.columns]
+                for writer in writers:
+                    writer.write(chunk[writer.name])
+                n_rows += len(chunk)
+
+        columns = []
+        for writer in writers or []:
+            columns.append(writer.close())
+
+        manifest = dict(fingerprint)
+        manifest.update({
+            'version': CACHE_VERSION,
+            'n_rows': n_rows,
+            'dropped_rows': dropped_rows,
+            'columns': columns,
+        })
+        write_manifest(staging, manifest)
+    except BaseException:
+        for writer in writers or []:
+            writer.abort()
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    commit_staging_dir(staging, cache_path)
+    return manifest
+
+
+def read_news_cache(cache_path, string_storage='auto'):
+    """Load a DataFrame from a columnar cache written by ``build_news_cache``."""
+    manifest = read_manifest(cache_path)
+    if manifest is None:
+        raise FileNotFoundError(f"No news cache found at {cache_path}")
+    if string_storage == 'auto':
+        string_storage = 'pyarrow' if _pyarrow_available() else 'python'
+    if string_storage not in ('pyarrow', 'python'):
+        raise ValueError(f"Unknown string_storage: {string_storage!r}")
+
+    n_rows = manifest['n_rows']
+    data = {}
+    for column in manifest['columns']:
+        name, kind = column['name'], column['kind']
+        if kind == 'datetime':
+            values = _map_array(cache_path, name + '.bin', np.int64, n_rows)
+            data[name] = pd.Series(values.view('datetime64[ns]'), copy=False)
+        elif kind == 'category':
+            codes = _map_array(cache_path, name + '.codes.bin', np.int32, n_rows)
+            data[name] = pd.Categorical.from_codes(codes, categories=column['categories'])
+        elif kind == 'string':
+            data[name] = _read_string_column(cache_path, name, n_rows, string_storage)
+        else:
+            data[name] = _map_array(cache_path, name + '.bin', np.dtype(column['dtype']), n_rows)
+    return pd.DataFrame(data)
+
+
+def _pyarrow_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _map_array(cache_path, filename, dtype, length):
+    """Memory-map a flat binary column file (empty files cannot be mapped)."""
+    if length == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(os.path.join(cache_path, filename), dtype=dtype, mode='r', shape=(length,))
+
+
+def _read_string_column(cache_path, name, n_rows, string_storage):
+    offsets = _map_array(cache_path, name + '.offsets.bin', np.int64, n_rows + 1)
+    valid = _map_array(cache_path, name + '.valid.bin', np.bool_, n_rows)
+    n_bytes = int(offsets[-1]) if n_rows else 0
+    blob = _map_array(cache_path, name + '.data.bin', np.uint8, n_bytes)
+
+    if string_storage == 'pyarrow':
+        import pyarrow as pa
+
+        validity = np.packbits(valid, bitorder='little')
+        array = pa.LargeStringArray.from_buffers(
+            n_rows,
+            pa.py_buffer(offsets),
+            pa.py_buffer(blob),
+            pa.py_buffer(validity),
+        )
+        return pd.arrays.ArrowStringArray(array)
+
+    raw = blob.tobytes()
+    bounds = offsets.tolist()
+    values = np.empty(n_rows, dtype=object)
+    values[:] = [raw[bounds[i]:bounds[i + 1]].decode('utf-8') for i in range(n_rows)]
+    values[~np.asarray(valid)] = np.nan
+    return values
+
+
+def _make_writer(directory, name, declared, series):
+    """Writer for a column, by its declared dtype (the first chunk's if undeclared)."""
+    if name == DATE_COLUMN:
+        return _DatetimeWriter(directory, name)
+    if name in CATEGORICAL_COLUMNS:
+        return _CategoryWriter(directory, name)
+    dtype = series.dtype if declared is None else pd.api.types.pandas_dtype(declared)
+    if isinstance(dtype, pd.CategoricalDtype):
+        return _CategoryWriter(directory, name)
+    if pd.api.types.is_numeric_dtype(dtype):
+        return _NumericWriter(directory, name)
+    return _StringWriter(directory, name)
+
+
+class _ColumnWriter:
+    """Append-only writer for one column of the cache."""
+
+    kind = None
+
+    def __init__(self, directory, name):
+        self.directory = directory
+        self.name = name
+        self._files = []
+
+    def _open(self, suffix):
+        f = open(os.path.join(self.directory, self.name + suffix), 'wb')
+        self._files.append(f)
+        return f
+
+    def write(self, series):
+        raise NotImplementedError
+
+    def metadata(self):
+        return {}
+
+    def close(self):
+        for f in self._files:
+            f.close()
+        meta = {'name': self.name, 'kind': self.kind}
+        meta.update(self.metadata())
+        return meta
+
+    def abort(self):
+        for f in self._files:
+            f.close()
+
+
+class _DatetimeWriter(_ColumnWriter):
+    kind = 'datetime'
+
+    def __init__(self, directory, name):
+        super().__init__(directory, name)
+        self._out = self._open('.bin')
+
+    def write(self, series):
+        values = series.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        self._out.write(np.ascontiguousarray(values).tobytes())
+
+
+class _NumericWriter(_ColumnWriter):
+    """Keeps the column's source dtype, promoting what was written when a chunk needs a wider one."""
+
+    kind = 'numeric'
+
+    def __init__(self, directory, name):
+        super().__init__(directory, name)
+        self._out = self._open('.bin')
+        self._dtype = None
+
+    def write(self, series):
+        if not pd.api.types.is_numeric_dtype(series.dtype):
+            raise ValueError(f"Column {self.name!r} has non-numeric values after numeric chunks; "
+                             f"declare its dtype, e.g. load_news(..., dtype={{{self.name!r}: str}})")
+        values = series.to_numpy()
+        dtype = values.dtype if self._dtype is None else np.result_type(self._dtype, values.dtype)
+        if self._dtype is not None and dtype != self._dtype:
+            self._promote(dtype)
+        self._dtype = dtype
+        self._out.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+
+    def _promote(self, dtype):
+        """Rewrite the chunks written so far with the wider ``dtype``."""
+        self._out.close()
+        path = os.path.join(self.directory, self.name + '.bin')
+        np.fromfile(path, dtype=self._dtype).astype(dtype).tofile(path)
+        self._files.remove(self._out)
+        self._out = open(path, 'ab')
+        self._files.append(self._out)
+
+    def metadata(self):
+        return {'dtype': np.dtype(self._dtype or np.float64).name}
+
+
+class _CategoryWriter(_ColumnWriter):
+    """Maps per-chunk categories onto one global category list."""
+
+    kind = 'category'
+
+    def __init__(self, directory, name):
+        super().__init__(directory, name)
+        self._out = self._open('.codes.bin')
+        self._categories = []
+        self._lookup = {}
+
+    def write(self, series):
+        local_codes, uniques = pd.factorize(series.astype(object), use_na_sentinel=True)
+        mapping = np.empty(len(uniques) + 1, dtype=np.int32)
+        mapping[-1] = -1
+        for i, value in enumerate(uniques):
+            code = self._lookup.get(value)
+            if code is None:
+                code = len(self._categories)
+                self._lookup[value] = code
+                self._categories.append(value)
+            mapping[i] = code
+        self._out.write(mapping[local_codes].tobytes())
+
+    def close(self):
+        for f in self._files:
+            f.close()
+        self._sort_categories()
+        return super().close()
+
+    def _sort_categories(self):
+        """Rewrite codes so categories are sorted, as ``astype('category')`` does."""
+        try:
+            ordered = sorted(self._categories)
+        except TypeError:
+            return
+        if ordered == self._categories:
+            return
+        position = {value: i for i, value in enumerate(ordered)}
+        remap = np.array([position[value] for value in self._categories] + [-1], dtype=np.int32)
+        path = os.path.join(self.directory, self.name + '.codes.bin')
+        if os.path.getsize(path):
+            codes = np.memmap(path, dtype=np.int32, mode='r+')
+            codes[:] = remap[codes]
+            codes.flush()
+            del codes
+        self._categories = ordered
+
+    def metadata(self):
+        return {'categories': self._categories}
+
+
+class _StringWriter(_ColumnWriter):
+    """Stores UTF-8 text as one data blob plus Arrow-compatible int64 offsets."""
+
+    kind = 'string'
+
+    def __init__(self, directory, name):
+        super().__init__(directory, name)
+        self._data = self._open('.data.bin')
+        self._offsets = self._open('.offsets.bin')
+        self._valid = self._open('.valid.bin')
+        self._position = 0
+        self._offsets.write(np.zeros(1, dtype=np.int64).tobytes())
+
+    def write(self, series):
+        valid = series.notna().to_numpy()
+        encoded = [str(value).encode('utf-8') if ok else b''
+                   for value, ok in zip(series.tolist(), valid)]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        ends = self._position + np.cumsum(lengths)
+        if len(ends):
+            self._position = int(ends[-1])
+        self._data.write(b''.join(encoded))
+        self._offsets.write(ends.tobytes())
+        self._valid.write(valid.astype(np.bool_).tobytes())
@@ -0,0 +1,207 @@
+"""
+Multi-symbol price panel (dates x symbols x fields).
+
+``PricePanel`` stores OHLCV data for many symbols in one float64 NumPy array
+on a shared trading calendar. Days on which a symbol has no data are NaN, so
+indicators, returns and volatility can be computed for every symbol in one
+vectorized call instead of looping over a dict of per-symbol DataFrames.
+Rolling calculations run over each symbol's own trading days: a day missing
+for one symbol is skipped, as in that symbol's DataFrame, rather than
+breaking every window that covers it.
+"""
+import numpy as np
+import pandas as pd
+
+from .indicators import DEFAULT_INDICATORS, compute_indicators, rolling_std
+
+
+PRICE_FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+TRADING_DAYS = 252
+
+
+class PricePanel:
+    """Price data for many symbols on an aligned trading calendar.
+
+    Attributes:
+        dates: DatetimeIndex of length T (union of all symbols' dates).
+        symbols: Index of length S.
+        fields: Index of length F.
+        values: float64 array of shape (T, S, F); NaN where data is missing.
+    """
+
+    def __init__(self, dates, symbols, fields, values):
+        self.dates = pd.DatetimeIndex(dates)
+        self.symbols = pd.Index(symbols)
+        self.fields = pd.Index(fields)
+        self.values = np.asarray(values, dtype=np.float64)
+        expected = (len(self.dates), len(self.symbols), len(self.fields))
+        if self.values.shape != expected:
+            raise ValueError(f"values has shape {self.values.shape}, expected {expected}")
+
+    @classmethod
+    def from_frames(cls, frames, fields=PRICE_FIELDS):
+        """Build a panel from a dict of per-symbol DataFrames indexed by date.
+
+        This is the ``stock_data`` layout used in the quantitative notebook.
+        """
+        symbols = list(frames)
+        fields = [f for f in fields if any(f in frames[s].columns for s in symbols)]
+        calendar = pd.DatetimeIndex([])
+        for symbol in symbols:
+            calendar = calendar.union(pd.DatetimeIndex(frames[symbol].index))
+
+        values = np.full((len(calendar), len(symbols), len(fields)), np.nan)
+        for j, symbol in enumerate(symbols):
+            df = frames[symbol]
+            rows = calendar.get_indexer(pd.DatetimeIndex(df.index))
+            block = df.reindex(columns=fields).to_numpy(dtype=np.float64, na_value=np.nan)
+            values[rows, j, :] = block
+        return cls(calendar, symbols, fields, values)
+
+    @classmethod
+    def from_long(cls, df, date_col='Date', symbol_col='Symbol', fields=PRICE_FIELDS):
+        """Build a panel from a long table with one row per (date, symbol)."""
+        fields = [f for f in fields if f in df.columns]
+        date_codes, dates = pd.factorize(pd.to_datetime(df[date_col]), sort=True)
+        symbol_codes, symbols = pd.factorize(df[symbol_col], sort=True)
+        values = np.full((len(dates), len(symbols), len(fields)), np.nan)
+        values[date_codes, symbol_codes, :] = df[fields].to_numpy(dtype=np.float64, na_value=np.nan)
+        return cls(dates, symbols, fields, values)
+
+    def __getitem__(self, field):
+        """Return one field as a (T, S) array view."""
+        return self.values[:, :, self.fields.get_loc(field)]
+
+    def __contains__(self, field):
+        return field in self.fields
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    @property
+    def mask(self):
+        """Boolean (T, S) array, True where a symbol has a close price."""
+        return ~np.isnan(self['Close'])
+
+    def to_frame(self, symbol):
+        """Return one symbol as a DataFrame, dropping days without data."""
+        j = self.symbols.get_loc(symbol)
+        df = pd.DataFrame(self.values[:, j, :], index=self.dates, columns=self.fields)
+        df.index.name = 'Date'
+        return df[self.mask[:, j]]
+
+    def to_frames(self):
+        """Return the panel as a dict of per-symbol DataFrames."""
+        return {symbol: self.to_frame(symbol) for symbol in self.symbols}
+
+    def with_fields(self, names, block):
+        """Return a new panel with extra (T, S, k) fields appended."""
+        block = np.asarray(block, dtype=np.float64).reshape(len(self.dates), len(self.symbols), -1)
+        keep = ~self.fields.isin(names)
+        values = np.concatenate([self.values[:, :, keep], block], axis=2)
+        return PricePanel(self.dates, self.symbols, list(self.fields[keep]) + list(names), values)
+
+    def indicators(self, specs=DEFAULT_INDICATORS):
+        """Compute indicators for all symbols at once.
+
+        Each symbol's trading days are right-aligned before the call and the
+        results moved back, so every symbol gets the same values as
+        ``compute_indicators`` on its own DataFrame.
+
+        Returns:
+            Tuple ``(columns, block)`` with block shape (T, S, n_columns),
+            NaN on days a symbol has no close.
+        """
+        valid = self.mask
+        order = _own_rows_order(valid)
+        aligned = {field: _right_align(self[field], valid, order) for field in self.fields}
+        columns, block = compute_indicators(aligned, specs)
+        return columns, _restore_rows(block, valid, order)
+
+    def with_indicators(self, specs=DEFAULT_INDICATORS):
+        """Return a new panel with the indicator columns appended as fields."""
+        columns, block = self.indicators(specs)
+        return self.with_fields(columns, block)
+
+    def daily_returns(self):
+        """Close-to-close returns per symbol, as ``Close.pct_change()``.
+
+        Each return is taken relative to the symbol's previous available
+        close, so a day missing for one symbol does not break the others.
+        """
+        close = self['Close']
+        previous = _previous_valid(close)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return close / previous - 1.0
+
+    def cumulative_returns(self, returns=None):
+        """Cumulative returns ``(1 + r).cumprod() - 1``, skipping missing days."""
+        if returns is None:
+            returns = self.daily_returns()
+        missing = np.isnan(returns)
+        growth = np.cumprod(np.where(missing, 1.0, 1.0 + returns), axis=0)
+        out = growth - 1.0
+        out[missing] = np.nan
+        return out
+
+    def volatility(self, window=30, returns=None, annualize=True):
+        """Rolling standard deviation of daily returns (annualized by default).
+
+        Windows run over each symbol's own trading days, so a missing day
+        is skipped rather than turning the windows around it into NaN.
+        """
+        if returns is None:
+            returns = self.daily_returns()
+        valid = self.mask
+        order = _own_rows_order(valid)
+        vol = _restore_rows(rolling_std(_right_align(returns, valid, order), window), valid, order)
+        return vol * np.sqrt(TRADING_DAYS) if annualize else vol
+
+    def normalized_prices(self, base=100.0):
+        """Close prices rebased to ``base`` at each symbol's first close."""
+        close = self['Close']
+        valid = ~np.isnan(close)
+        first_row = np.argmax(valid, axis=0)
+        first = close[first_row, np.arange(close.shape[1])]
+        return close / first * base
+
+    def field_frame(self, values):
+        """Wrap a (T, S) array as a DataFrame (dates x symbols)."""
+        return pd.DataFrame(values, index=self.dates, columns=self.symbols)
+
+
+def _previous_valid(values):
+    """For each (t, s), the last non-NaN value strictly before t (NaN if none)."""
+    n = len(values)
+    valid = ~np.isnan(values)
+    index = np.where(valid, np.arange(n)[:, np.newaxis], -1)
+    last = np.maximum.accumulate(index, axis=0)
+    previous = np.full(values.shape, -1)
+    previous[1:] = last[:-1]
+    columns = np.broadcast_to(np.arange(values.shape[1]), values.shape)
+    out = values[np.maximum(previous, 0), columns]
+    out[previous < 0] = np.nan
+    return out
+
+
+def _own_rows_order(valid):
+    """Row permutation per symbol that moves its trading days to the bottom (stable)."""
+    return np.argsort(valid, axis=0, kind='stable')
+
+
+def _right_align(values, valid, order):
+    """(T, S) values with each symbol's trading days right-aligned, NaN above."""
+    return np.take_along_axis(np.where(valid, values, np.nan), order, axis=0)
+
+
+def _restore_rows(aligned, valid, order):
+    """Move right-aligned (T, S, ...) results back to the shared calendar."""
+    index = order.reshape(order.shape + (1,) * (aligned.ndim - 2))
+    out = np.full(aligned.shape, np.nan)
+    np.put_along_axis(out, np.broadcast_to(index, aligned.shape), aligned, axis=0)
+    out[~valid] = np.nan
+    return out
@@ -0,0 +1,167 @@
+"""
+Single-pass multi-phrase matching over news headlines.
+
+The EDA notebook counts significant phrases with one
+``str.lower().str.contains(phrase)`` scan of the headline column per phrase.
+``PhraseMatcher`` compiles the whole phrase list into one trie-shaped regex
+and scans the lowercased headlines once, finding every (possibly
+overlapping) occurrence of every phrase in the same pass, in the manner of
+an Aho-Corasick automaton.
+
+Phrases are matched as literal substrings, which is what ``str.contains``
+does for phrases without regex metacharacters (e.g. the notebook's list).
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from .keywords import iter_chunks
+from .profiling import instrument
+
+
+DEFAULT_CHUNKSIZE = 50_000
+SEPARATOR = '\n'
+
+SIGNIFICANT_PHRASES = (
+    'fda approval', 'price target', 'earnings', 'revenue', 'profit',
+    'merger', 'acquisition', 'ipo', 'dividend', 'split', 'upgrade',
+    'downgrade', 'analyst', 'rating', 'forecast', 'guidance',
+    '52-week high', '52-week low', 'bullish', 'bearish',
+)
+
+
+class PhraseMatcher:
+    """Find which headlines contain which phrases in one pass.
+
+    Each alternative of the compiled regex consumes the first character of a
+    phrase and checks the rest with a lookahead, so the scan can restart at
+    the next character and overlapping occurrences are all reported. At a
+    given position the trie regex returns the longest phrase; every shorter
+    phrase starting there is a prefix of it and is added from a lookup table.
+
+    Args:
+        phrases: Iterable of phrases; duplicates are dropped, order is kept.
+    """
+
+    def __init__(self, phrases=SIGNIFICANT_PHRASES):
+        self.phrases = list(dict.fromkeys(phrases))
+        for phrase in self.phrases:
+            if not isinstance(phrase, str) or not phrase:
+                raise ValueError(f"Phrases must be non-empty strings, got {phrase!r}")
+            if SEPARATOR in phrase:
+                raise ValueError(f"Phrases cannot contain line breaks: {phrase!r}")
+
+        ids = {phrase: i for i, phrase in enumerate(self.phrases)}
+        prefixes = [[ids[phrase[:k]] for k in range(1, len(phrase) + 1) if phrase[:k] in ids]
+                    for phrase in self.phrases]
+        self._ids = ids
+        self._prefix_ptr = np.cumsum([0] + [len(p) for p in prefixes])
+        self._prefix_ids = np.array([i for p in prefixes for i in p], dtype=np.int64)
+        self._regex = re.compile(_build_pattern(self.phrases))
+
+    def __len__(self):
+        return len(self.phrases)
+
+    def find(self, headlines, chunksize=DEFAULT_CHUNKSIZE):
+        """Return ``(rows, phrase_ids)`` for every headline/phrase hit.
+
+        Each (row, phrase) pair appears once, however often the phrase
+        occurs in the headline. Rows are positions in ``headlines``; missing
+        or non-string headlines never match (``na=False``).
+        """
+        all_rows, all_ids = [], []
+        start = 0
+        for chunk in iter_chunks(headlines, chunksize):
+            rows, ids = self._find_chunk(chunk)
+            all_rows.append(rows + start)
+            all_ids.append(ids)
+            start += len(chunk)
+        if not all_rows:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(all_rows), np.concatenate(all_ids)
+
+    def counts(self, headlines, chunksize=DEFAULT_CHUNKSIZE):
+        """Number of headlines containing each phrase, as a Series.
+
+        Equal to ``headlines.str.lower().str.contains(phrase, na=False).sum()``
+        for each phrase. Counts are accumulated chunk by chunk, so memory does
+        not grow with the number of headlines when they come from an iterator.
+        """
+        counts = np.zeros(len(self.phrases), dtype=np.int64)
+        for chunk in iter_chunks(headlines, chunksize):
+            _, ids = self._find_chunk(chunk)
+            counts += np.bincount(ids, minlength=len(self.phrases))
+        return pd.Series(counts, index=pd.Index(self.phrases, name='Phrase'), name='Count')
+
+    def hit_matrix(self, headlines, chunksize=DEFAULT_CHUNKSIZE):
+        """Sparse boolean (n_headlines x n_phrases) CSR matrix of hits."""
+        from scipy import sparse
+
+        rows, ids = self.find(headlines, chunksize)
+        data = np.ones(len(rows), dtype=bool)
+        shape = (len(headlines), len(self.phrases))
+        return sparse.csr_matrix((data, (rows, ids)), shape=shape)
+
+    def _find_chunk(self, values):
+        texts = [value if isinstance(value, str) else '' for value in values]
+        text = SEPARATOR.join(texts)
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        else:
+            # A few characters (e.g. 'İ') lowercase to more than one character.
+            lowered_texts = [t.lower() for t in texts]
+            lengths = np.fromiter(map(len, lowered_texts), dtype=np.int64, count=len(texts))
+        starts = np.cumsum(lengths + 1) - (lengths + 1)
+
+        positions, longest = [], []
+        ids = self._ids
+        for match in self._regex.finditer(lowered):
+            positions.append(match.start())
+            longest.append(ids[match.group(0) + match.group(match.lastindex)])
+        if not positions:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        rows = np.searchsorted(starts, positions, side='right') - 1
+        longest = np.asarray(longest, dtype=np.int64)
+        n_prefixes = self._prefix_ptr[longest + 1] - self._prefix_ptr[longest]
+        offsets = np.repeat(self._prefix_ptr[longest] - np.cumsum(n_prefixes) + n_prefixes, n_prefixes)
+        phrase_ids = self._prefix_ids[offsets + np.arange(len(offsets))]
+        rows = np.repeat(rows, n_prefixes)
+
+        keys = np.unique(rows * len(self.phrases) + phrase_ids)
+        return keys // len(self.phrases), keys % len(self.phrases)
+
+
+@instrument(rows=0)
+def count_phrases(headlines, phrases=SIGNIFICANT_PHRASES, chunksize=DEFAULT_CHUNKSIZE):
+    """Count headlines containing each phrase (see ``PhraseMatcher.counts``)."""
+    return PhraseMatcher(phrases).counts(headlines, chunksize)
+
+
+def _build_pattern(phrases):
+    """Regex with one ``first-char(?=(rest))`` alternative per first character."""
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[None] = True
+
+    alternatives = []
+    for char in sorted(k for k in trie if k is not None):
+        alternatives.append(f'{re.escape(char)}(?=({_trie_pattern(trie[char])}))')
+    return '|'.join(alternatives)
+
+
+def _trie_pattern(node):
+    """Regex for the suffixes below a trie node, preferring the longest."""
+    branches = [re.escape(char) + _trie_pattern(child)
+                for char, child in sorted((k, v) for k, v in node.items() if k is not None)]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if None in node:
+        return f'(?:{body})?'
+    return body
@@ -0,0 +1,284 @@
+"""
+Per-stage instrumentation for the analysis pipeline.
+
+Wrap a step in ``stage('name')`` or decorate a function with
+``@instrument('name')`` to record, for every call, wall time, CPU time, rows
+processed and peak memory allocated while it ran (``tracemalloc``). One
+stage can additionally be captured with ``cProfile``. Records are logged as
+JSON lines and ``summary()`` aggregates them into a table per stage.
+
+Instrumentation is off by default; while disabled ``stage`` returns a shared
+no-op context manager and decorated functions cost one flag check per call.
+
+Example:
+    with profiling(profile='count_keywords') as session:
+        df = load_news(path)
+        counts = count_keywords(df['headline'])
+    print(session.summary())
+    print(profile_report('count_keywords'))
+"""
+import cProfile
+import functools
+import io
+import json
+import logging
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_COLUMNS = ['stage', 'calls', 'wall_s', 'cpu_s', 'rows', 'rows_per_s', 'peak_mb']
+
+
+class _State:
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self.profile = frozenset()
+        self.log_file = None
+        self.records = []
+        self.stack = []
+        self.profiles = {}
+        self.profiling_active = False
+        self.started_tracemalloc = False
+
+
+_state = _State()
+
+
+def enable(memory=True, profile=None, log_file=None):
+    """Start recording stages.
+
+    Args:
+        memory: Track peak allocated memory per stage with ``tracemalloc``
+            (slows allocation-heavy code down noticeably).
+        profile: Stage name or iterable of names to capture with cProfile.
+        log_file: Optional path; every record is appended as a JSON line.
+    """
+    _state.enabled = True
+    _state.memory = memory
+    _state.profile = frozenset([profile] if isinstance(profile, str) else profile or ())
+    _state.log_file = log_file
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _state.started_tracemalloc = True
+
+
+def disable():
+    """Stop recording (collected records are kept until ``reset``)."""
+    _state.enabled = False
+    if _state.started_tracemalloc:
+        tracemalloc.stop()
+        _state.started_tracemalloc = False
+
+
+def reset():
+    """Forget all records and cProfile captures."""
+    _state.records = []
+    _state.profiles = {}
+
+
+def is_enabled():
+    return _state.enabled
+
+
+def records():
+    """List of per-call record dicts, in completion order."""
+    return list(_state.records)
+
+
+class _NullStage:
+    """Shared no-op stand-in for ``_Stage`` while instrumentation is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """Context manager measuring one execution of a stage."""
+
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+        self.profiler = None
+        self.peak = 0
+
+    def __enter__(self):
+        self.parent = _state.stack[-1].name if _state.stack else None
+        self.depth = len(_state.stack)
+        if _state.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            # Hand the peak so far to the enclosing stages before resetting it.
+            for outer in _state.stack:
+                outer.peak = max(outer.peak, peak)
+            tracemalloc.reset_peak()
+            self.start_memory = self.peak = current
+        else:
+            self.start_memory = None
+        _state.stack.append(self)
+        if self.name in _state.profile and not _state.profiling_active:
+            self.profiler = cProfile.Profile()
+            _state.profiling_active = True
+            self.profiler.enable()
+        self.start_cpu = time.process_time()
+        self.start_wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.start_wall
+        cpu = time.process_time() - self.start_cpu
+        if self.profiler is not None:
+            self.profiler.disable()
+            _state.profiling_active = False
+            if self.name in _state.profiles:
+                _state.profiles[self.name].add(self.profiler)
+            else:
+                _state.profiles[self.name] = pstats.Stats(self.profiler)
+        _state.stack.pop()
+
+        peak_mb = None
+        if self.start_memory is not None and tracemalloc.is_tracing():
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            if _state.stack:
+                _state.stack[-1].peak = max(_state.stack[-1].peak, self.peak)
+            peak_mb = (self.peak - self.start_memory) / 2**20
+
+        record = {
+            'stage': self.name,
+            'wall_s': wall,
+            'cpu_s': cpu,
+            'rows': self.rows,
+            'rows_per_s': self.rows / wall if self.rows is not None and wall > 0 else None,
+            'peak_mb': peak_mb,
+            'depth': self.depth,
+            'parent': self.parent,
+            'error': exc_type.__name__ if exc_type is not None else None,
+        }
+        _state.records.append(record)
+        _log(record)
+        return False
+
+
+def _log(record):
+    line = json.dumps(record)
+    logger.info(line)
+    if _state.log_file is not None:
+        with open(_state.log_file, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+
+def stage(name, rows=None):
+    """Context manager recording one stage; set ``.rows`` inside if not known up front.
+
+    Example:
+        with stage('daily_counts') as s:
+            daily = df.groupby('date_only').size()
+            s.rows = len(df)
+    """
+    if not _state.enabled:
+        return _NULL_STAGE
+    return _Stage(name, rows)
+
+
+def instrument(name=None, rows=None):
+    """Decorator recording every call of a function as a stage.
+
+    Args:
+        name: Stage name (defaults to the function name).
+        rows: How to count processed rows: an int position of an argument
+            whose ``len`` is used, 'result' for ``len`` of the return value,
+            a callable applied to the return value, or None.
+    """
+    def decorate(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return func(*args, **kwargs)
+            with _Stage(stage_name) as current:
+                if isinstance(rows, int) and len(args) > rows:
+                    current.rows = _safe_len(args[rows])
+                result = func(*args, **kwargs)
+                if rows == 'result':
+                    current.rows = _safe_len(result)
+                elif callable(rows):
+                    current.rows = rows(result)
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+def _safe_len(value):
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+def summary():
+    """Per-stage totals: calls, wall/CPU seconds, rows, rows/s and max peak MB."""
+    if not _state.records:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    df = pd.DataFrame(_state.records)
+    grouped = df.groupby('stage', sort=False).agg(
+        calls=('stage', 'size'), wall_s=('wall_s', 'sum'), cpu_s=('cpu_s', 'sum'),
+        rows=('rows', lambda r: r.sum(min_count=1)), peak_mb=('peak_mb', 'max'),
+    ).reset_index()
+    grouped['rows_per_s'] = grouped['rows'] / grouped['wall_s']
+    return grouped[SUMMARY_COLUMNS]
+
+
+def profile_report(name, sort='cumulative', limit=20):
+    """Text report of the cProfile capture of stage ``name``."""
+    stats = _state.profiles.get(name)
+    if stats is None:
+        raise KeyError(f"No cProfile capture for stage {name!r}; pass profile={name!r} to enable()")
+    stream = io.StringIO()
+    stats.stream = stream
+    stats.sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
+
+
+class _Session:
+    """Handle returned by ``profiling``; exposes the run's records."""
+
+    def records(self):
+        return records()
+
+    def summary(self):
+        return summary()
+
+    def profile_report(self, name, sort='cumulative', limit=20):
+        return profile_report(name, sort, limit)
+
+
+@contextmanager
+def profiling(memory=True, profile=None, log_file=None):
+    """Enable instrumentation for a block and log the summary table at the end."""
+    reset()
+    enable(memory=memory, profile=profile, log_file=log_file)
+    try:
+        yield _Session()
+    finally:
+        disable()
+        if _state.records:
+            logger.info('Stage summary:\n%s', summary().to_string(index=False))
@@ -0,0 +1,136 @@
+"""
+Parallel loader for per-symbol stock price CSVs ({symbol}.csv).
+
+Each file is parsed, validated (required columns, datetime index, numeric
+price columns) and cached as a pickle keyed on the file's size and mtime, so
+unchanged files are never re-parsed. Files are loaded concurrently with a
+thread or process pool.
+"""
+import glob
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+from .cache import default_cache_dir, file_fingerprint
+from .profiling import instrument
+
+
+CACHE_VERSION = 1
+REQUIRED_COLUMNS = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+NUMERIC_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def validate_stock_frame(df, symbol=''):
+    """Check a parsed stock frame; raise ValueError describing any problem."""
+    label = f"{symbol}: " if symbol else ''
+    if not pd.api.types.is_datetime64_any_dtype(df.index):
+        raise ValueError(f"{label}index is not a datetime index")
+    for col in NUMERIC_COLUMNS:
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            raise ValueError(f"{label}column {col!r} is not numeric")
+    if df.index.isna().any():
+        raise ValueError(f"{label}{int(df.index.isna().sum())} rows have an invalid Date")
+    if len(df) == 0:
+        raise ValueError(f"{label}no rows")
+
+
+def parse_stock_csv(path, symbol=''):
+    """Read and normalize one stock CSV as done in the quantitative notebook."""
+    df = pd.read_csv(path)
+    missing_cols = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing_cols:
+        raise ValueError(f"{symbol or path}: missing required columns {missing_cols}")
+    df['Date'] = pd.to_datetime(df['Date'])
+    df.set_index('Date', inplace=True)
+    for col in NUMERIC_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    validate_stock_frame(df, symbol)
+    return df
+
+
+def stock_cache_path(path, cache_dir=None):
+    """Return the cache file used for one stock CSV."""
+    if cache_dir is None:
+        cache_dir = default_cache_dir(path)
+    return os.path.join(cache_dir, os.path.basename(path) + '.pkl')
+
+
+def load_stock_file(path, symbol='', cache_dir=None, use_cache=True):
+    """Load one stock CSV, reusing the cached parse if the file is unchanged."""
+    if not use_cache:
+        return parse_stock_csv(path, symbol)
+
+    fingerprint = file_fingerprint(path)
+    cache_path = stock_cache_path(path, cache_dir)
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+        if cached['version'] == CACHE_VERSION and cached['fingerprint'] == fingerprint:
+            return cached['data']
+    except (OSError, EOFError, KeyError, pickle.UnpicklingError):
+        pass
+
+    df = parse_stock_csv(path, symbol)
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'version': CACHE_VERSION, 'fingerprint': fingerprint, 'data': df}, f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+    return df
+
+
+def resolve_stock_paths(symbols=None, data_dir='../data', pattern=None):
+    """Map symbols to CSV paths from a symbol list or a glob pattern.
+
+    Args:
+        symbols: Iterable of ticker symbols, loaded from ``{data_dir}/{symbol}.csv``.
+        data_dir: Directory containing the CSV files.
+        pattern: Glob pattern (e.g. '../data/*.csv'); the file stem is the symbol.
+    """
+    if pattern is not None:
+        paths = sorted(glob.glob(pattern))
+        return {os.path.splitext(os.path.basename(p))[0]: p for p in paths}
+    if symbols is None:
+        raise ValueError("Pass either symbols or pattern")
+    return {symbol: os.path.join(data_dir, f'{symbol}.csv') for symbol in symbols}
+
+
+@instrument(rows=lambda result: sum(len(df) for df in result[0].values()))
+def load_stocks(symbols=None, data_dir='../data', pattern=None, cache_dir=None,
+                use_cache=True, max_workers=None, use_processes=False):
+    """Load many stock CSVs concurrently.
+
+    Args:
+        symbols: List of ticker symbols (see ``resolve_stock_paths``).
+        data_dir: Directory containing ``{symbol}.csv`` files.
+        pattern: Glob pattern used instead of ``symbols``.
+        cache_dir: Cache directory; defaults to ``.cache`` next to each file.
+        use_cache: Reuse cached parses of unchanged files.
+        max_workers: Pool size (defaults to the executor's default).
+        use_processes: Use a process pool instead of threads.
+
+    Returns:
+        Tuple ``(stock_data, errors)``: a dict of symbol -> DataFrame in input
+        order and a dict of symbol -> error message for files that failed.
+    """
+    paths = resolve_stock_paths(symbols, data_dir, pattern)
+    pool_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    results, errors = {}, {}
+
+    with pool_class(max_workers=max_workers) as pool:
+        futures = {
+            symbol: pool.submit(load_stock_file, path, symbol, cache_dir, use_cache)
+            for symbol, path in paths.items()
+        }
+        for symbol, future in futures.items():
+            try:
+                results[symbol] = future.result()
+            except FileNotFoundError:
+                errors[symbol] = f"File not found: {paths[symbol]}"
+            except Exception as e:
+                errors[symbol] = str(e)
+
+    return results, errors
@@ -0,0 +1,393 @@
+"""
+Incremental (streaming) technical indicators.
+
+``StreamingIndicators`` keeps just enough state to update every indicator in
+O(1) per new daily bar: ring buffers with running sums and sums of squares
+for rolling means and Bollinger standard deviations, recursive EMA state for
+EMA/MACD, monotonic deques for the Stochastic high/low, and the previous
+close for RSI/ATR deltas. It is seeded from the price history once and its
+state can be saved to and restored from disk between runs.
+
+Values agree with ``src.indicators.compute_indicators`` on the same history
+(up to floating-point rounding). A bar with a missing close leaves the EMA
+state unchanged, which differs from pandas' NaN weighting for interior gaps.
+"""
+import json
+import math
+from collections import deque
+from dataclasses import asdict
+
+import numpy as np
+
+from .indicators import DEFAULT_INDICATORS, IndicatorSpec, ema
+
+
+NAN = float('nan')
+
+
+class StreamingIndicators:
+    """Stateful indicator set updated one bar at a time.
+
+    Example:
+        stream = StreamingIndicators().seed(stock_data['AAPL'])
+        values = stream.update(close=189.5, high=190.2, low=187.9)
+        stream.save('state/AAPL.json')
+    """
+
+    def __init__(self, specs=DEFAULT_INDICATORS):
+        self.specs = [spec if isinstance(spec, IndicatorSpec) else IndicatorSpec(**spec)
+                      for spec in specs]
+        self.columns = [name for spec in self.specs for name in spec.columns()]
+        self.n_bars = 0
+        self.prev_close = None
+        self._components = {}
+        self._lookback = 1
+        for spec in self.specs:
+            self._register(spec)
+
+    def _register(self, spec):
+        add = self._components.setdefault
+        kind = spec.kind
+        if kind in ('sma', 'bollinger'):
+            add(f'close_window_{spec.window}', _RollingWindow(spec.window))
+            self._lookback = max(self._lookback, spec.window)
+        elif kind == 'ema':
+            add(f'ema_{spec.window}', _EMA(spec.window))
+        elif kind == 'rsi':
+            add(f'gain_{spec.window}', _RollingWindow(spec.window))
+            add(f'loss_{spec.window}', _RollingWindow(spec.window))
+            self._lookback = max(self._lookback, spec.window + 1)
+        elif kind == 'macd':
+            add(f'ema_{spec.fast}', _EMA(spec.fast))
+            add(f'ema_{spec.slow}', _EMA(spec.slow))
+            add(f'macd_signal_{spec.fast}_{spec.slow}_{spec.signal}', _EMA(spec.signal))
+        elif kind == 'atr':
+            add(f'tr_{spec.window}', _RollingWindow(spec.window))
+            self._lookback = max(self._lookback, spec.window + 1)
+        elif kind == 'stochastic':
+            key = f'{spec.window}_{spec.smooth_k}_{spec.smooth_d}'
+            add(f'stoch_high_{spec.window}', _RollingExtreme(spec.window, max))
+            add(f'stoch_low_{spec.window}', _RollingExtreme(spec.window, min))
+            add(f'stoch_k_{key}', _RollingWindow(spec.smooth_k))
+            add(f'stoch_d_{key}', _RollingWindow(spec.smooth_d))
+            self._lookback = max(self._lookback, spec.window + spec.smooth_k + spec.smooth_d)
+        else:
+            raise ValueError(f"Unknown indicator kind: {kind!r}")
+
+    def seed(self, prices):
+        """Initialize the state from a price history.
+
+        EMA states are taken from the vectorized engine over the full
+        history; rolling windows are filled by replaying only the last few
+        bars, so seeding costs one vectorized pass plus O(max window).
+        """
+        close = np.asarray(prices['Close'], dtype=np.float64)
+        high = _optional_field(prices, 'High', len(close))
+        low = _optional_field(prices, 'Low', len(close))
+        if len(close) == 0:
+            return self
+
+        for spec in self.specs:
+            if spec.kind == 'ema':
+                self._components[f'ema_{spec.window}'].value = float(ema(close, spec.window)[-1])
+            elif spec.kind == 'macd':
+                fast, slow = ema(close, spec.fast), ema(close, spec.slow)
+                self._components[f'ema_{spec.fast}'].value = float(fast[-1])
+                self._components[f'ema_{spec.slow}'].value = float(slow[-1])
+                signal = self._components[f'macd_signal_{spec.fast}_{spec.slow}_{spec.signal}']
+                signal.value = float(ema(fast - slow, spec.signal)[-1])
+
+        start = max(0, len(close) - self._lookback)
+        self.prev_close = float(close[start - 1]) if start > 0 else None
+        self.n_bars += start
+        for i in range(start, len(close)):
+            self._push_windows(float(close[i]), float(high[i]), float(low[i]))
+            self.n_bars += 1
+        return self
+
+    def update(self, close, high=NAN, low=NAN):
+        """Append one bar and return the latest indicator values as a dict."""
+        close, high, low = float(close), float(high), float(low)
+        self._push_windows(close, high, low)
+        self._update_emas(close)
+        self.n_bars += 1
+        return self.values()
+
+    def values(self):
+        """Return the indicator values for the most recent bar."""
+        out = {}
+        for spec in self.specs:
+            out.update(zip(spec.columns(), self._outputs(spec)))
+        return out
+
+    def _push_windows(self, close, high, low):
+        c = self._components
+        prev_close = NAN if self.prev_close is None else self.prev_close
+        delta = close - prev_close
+        # A missing delta counts as no gain and no loss, as in the batch RSI
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        true_range = _nanmax(high - low, abs(high - prev_close), abs(low - prev_close))
+
+        for spec in self.specs:
+            kind = spec.kind
+            if kind in ('sma', 'bollinger'):
+                window = c[f'close_window_{spec.window}']
+                if window.last_bar != self.n_bars:
+                    window.push(close, self.n_bars)
+            elif kind == 'rsi':
+                for name, value in ((f'gain_{spec.window}', gain), (f'loss_{spec.window}', loss)):
+                    if c[name].last_bar != self.n_bars:
+                        c[name].push(value, self.n_bars)
+            elif kind == 'atr':
+                window = c[f'tr_{spec.window}']
+                if window.last_bar != self.n_bars:
+                    window.push(true_range, self.n_bars)
+            elif kind == 'stochastic':
+                key = f'{spec.window}_{spec.smooth_k}_{spec.smooth_d}'
+                highest = c[f'stoch_high_{spec.window}']
+                lowest = c[f'stoch_low_{spec.window}']
+                if highest.last_bar != self.n_bars:
+                    highest.push(high, self.n_bars)
+                    lowest.push(low, self.n_bars)
+                fast_k = _divide(100.0 * (close - lowest.value()), highest.value() - lowest.value())
+                slow_k = c[f'stoch_k_{key}']
+                if slow_k.last_bar != self.n_bars:
+                    slow_k.push(fast_k, self.n_bars)
+                    c[f'stoch_d_{key}'].push(slow_k.mean(), self.n_bars)
+        self.prev_close = close
+
+    def _update_emas(self, close):
+        c = self._components
+        updated = set()
+        for spec in self.specs:
+            if spec.kind == 'ema' and spec.window not in updated:
+                c[f'ema_{spec.window}'].update(close)
+                updated.add(spec.window)
+        for spec in self.specs:
+            if spec.kind != 'macd':
+                continue
+            for span in (spec.fast, spec.slow):
+                if span not in updated:
+                    c[f'ema_{span}'].update(close)
+                    updated.add(span)
+            macd = c[f'ema_{spec.fast}'].value - c[f'ema_{spec.slow}'].value
+            c[f'macd_signal_{spec.fast}_{spec.slow}_{spec.signal}'].update(macd)
+
+    def _outputs(self, spec):
+        c = self._components
+        kind = spec.kind
+        if kind == 'sma':
+            return [c[f'close_window_{spec.window}'].mean()]
+        if kind == 'ema':
+            return [c[f'ema_{spec.window}'].value]
+        if kind == 'rsi':
+            rs = _divide(c[f'gain_{spec.window}'].mean(), c[f'loss_{spec.window}'].mean())
+            return [100.0 - _divide(100.0, 1.0 + rs)]
+        if kind == 'macd':
+            macd = c[f'ema_{spec.fast}'].value - c[f'ema_{spec.slow}'].value
+            signal = c[f'macd_signal_{spec.fast}_{spec.slow}_{spec.signal}'].value
+            return [macd, signal, macd - signal]
+        if kind == 'bollinger':
+            window = c[f'close_window_{spec.window}']
+            middle, std = window.mean(), window.std()
+            return [middle + std * spec.num_std, middle, middle - std * spec.num_std]
+        if kind == 'atr':
+            return [c[f'tr_{spec.window}'].mean()]
+        if kind == 'stochastic':
+            key = f'{spec.window}_{spec.smooth_k}_{spec.smooth_d}'
+            return [c[f'stoch_k_{key}'].mean(), c[f'stoch_d_{key}'].mean()]
+        raise ValueError(f"Unknown indicator kind: {kind!r}")
+
+    def state(self):
+        """Return the full state as a JSON-serializable dict."""
+        return {
+            'specs': [asdict(spec) for spec in self.specs],
+            'n_bars': self.n_bars,
+            'prev_close': self.prev_close,
+            'components': {name: component.state() for name, component in self._components.items()},
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild a StreamingIndicators object from ``state()`` output."""
+        stream = cls(state['specs'])
+        stream.n_bars = state['n_bars']
+        stream.prev_close = state['prev_close']
+        for name, component_state in state['components'].items():
+            stream._components[name].load_state(component_state)
+        return stream
+
+    def save(self, path):
+        """Write the state to a JSON file."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.state(), f)
+
+    @classmethod
+    def load(cls, path):
+        """Restore a StreamingIndicators object saved with ``save``."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_state(json.load(f))
+
+
+class _RollingWindow:
+    """Ring buffer with running sums for O(1) rolling mean and std.
+
+    Sums are kept relative to a reference value and recomputed exactly from
+    the buffer once per full rotation, so rounding error cannot accumulate.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.buffer = [NAN] * size
+        self.position = 0
+        self.count = 0
+        self.nan_count = 0
+        self.reference = 0.0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.last_bar = -1
+
+    def push(self, value, bar=None):
+        if self.count == self.size:
+            old = self.buffer[self.position]
+            if math.isnan(old):
+                self.nan_count -= 1
+            else:
+                self.total -= old - self.reference
+                self.total_sq -= (old - self.reference) ** 2
+        else:
+            self.count += 1
+        self.buffer[self.position] = value
+        if math.isnan(value):
+            self.nan_count += 1
+        else:
+            self.total += value - self.reference
+            self.total_sq += (value - self.reference) ** 2
+        self.position = (self.position + 1) % self.size
+        if bar is not None:
+            self.last_bar = bar
+        if self.position == 0:
+            self._resync()
+
+    def _resync(self):
+        valid = [v for v in self.buffer[:self.count] if not math.isnan(v)]
+        self.reference = math.fsum(valid) / len(valid) if valid else 0.0
+        self.total = math.fsum(v - self.reference for v in valid)
+        self.total_sq = math.fsum((v - self.reference) ** 2 for v in valid)
+
+    def mean(self):
+        if self.count < self.size or self.nan_count:
+            return NAN
+        return self.reference + self.total / self.size
+
+    def std(self):
+        if self.count < self.size or self.nan_count or self.size < 2:
+            return NAN
+        variance = (self.total_sq - self.total * self.total / self.size) / (self.size - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def state(self):
+        return {key: getattr(self, key) for key in
+                ('size', 'buffer', 'position', 'count', 'nan_count',
+                 'reference', 'total', 'total_sq', 'last_bar')}
+
+    def load_state(self, state):
+        for key, value in state.items():
+            setattr(self, key, value)
+
+
+class _RollingExtreme:
+    """Monotonic deque giving the rolling max (or min) in amortized O(1)."""
+
+    def __init__(self, size, func):
+        self.size = size
+        self.is_max = func is max
+        self.candidates = deque()
+        self.last_nan = -1
+        self.count = 0
+        self.last_bar = -1
+
+    def push(self, value, bar):
+        index = self.count
+        self.count += 1
+        self.last_bar = bar
+        if math.isnan(value):
+            self.last_nan = index
+        else:
+            while self.candidates and self._dominates(value, self.candidates[-1][1]):
+                self.candidates.pop()
+            self.candidates.append((index, value))
+        while self.candidates and self.candidates[0][0] <= index - self.size:
+            self.candidates.popleft()
+
+    def _dominates(self, new, old):
+        return new >= old if self.is_max else new <= old
+
+    def value(self):
+        if self.count < self.size or self.last_nan > self.count - 1 - self.size:
+            return NAN
+        return self.candidates[0][1]
+
+    def state(self):
+        return {
+            'size': self.size,
+            'is_max': self.is_max,
+            'candidates': [list(item) for item in self.candidates],
+            'last_nan': self.last_nan,
+            'count': self.count,
+            'last_bar': self.last_bar,
+        }
+
+    def load_state(self, state):
+        self.size = state['size']
+        self.is_max = state['is_max']
+        self.candidates = deque(tuple(item) for item in state['candidates'])
+        self.last_nan = state['last_nan']
+        self.count = state['count']
+        self.last_bar = state['last_bar']
+
+
+class _EMA:
+    """Recursive EMA state equivalent to ``ewm(span, adjust=False)``."""
+
+    def __init__(self, span):
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = NAN
+
+    def update(self, x):
+        if math.isnan(x):
+            return self.value
+        if math.isnan(self.value):
+            self.value = x
+        else:
+            self.value = self.alpha * x + (1.0 - self.alpha) * self.value
+        return self.value
+
+    def state(self):
+        return {'alpha': self.alpha, 'value': self.value}
+
+    def load_state(self, state):
+        self.alpha = state['alpha']
+        self.value = state['value']
+
+
+def _optional_field(prices, name, length):
+    try:
+        return np.asarray(prices[name], dtype=np.float64)
+    except (KeyError, IndexError):
+        return np.full(length, np.nan)
+
+
+def _nanmax(*values):
+    valid = [v for v in values if not math.isnan(v)]
+    return max(valid) if valid else NAN
+
+
+def _divide(numerator, denominator):
+    """Float division with NumPy semantics for zero denominators."""
+    if denominator == 0:
+        if numerator == 0 or math.isnan(numerator):
+            return NAN
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+    return numerator / denominator
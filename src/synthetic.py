@@ -0,0 +1,137 @@
+"""
+Scalable synthetic data shaped like the project's datasets.
+
+These generators extend the ``conftest.py`` fixtures (sample_stock_data,
+sample_news_data, sample_returns) to any size, so the pipeline can be
+benchmarked at realistic scale: millions of headlines, thousands of tickers,
+a chosen share of repeated headlines and a chosen mix of date layouts.
+All generators are deterministic for a given seed.
+"""
+import numpy as np
+import pandas as pd
+
+
+HEADLINE_TEMPLATES = (
+    'Stocks That Hit 52-Week Highs On {day}',
+    '{symbol} Reports Strong Earnings',
+    'Price Target Raised On {symbol} By {publisher}',
+    '{symbol} Shares Trading Lower After Earnings Miss',
+    'FDA Approval For {symbol} New Drug',
+    '{publisher} Upgrades {symbol} To Buy',
+    '{symbol} Lowers Guidance, Stock Falls',
+    'Market Analysis Shows Bullish Trend For {symbol}',
+    "{symbol}'s Q{quarter} Sales Beat Estimates",
+    'Benzinga\'s Top Upgrades, Downgrades For {day}',
+)
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday')
+
+
+def make_symbols(n_symbols):
+    """Distinct uppercase ticker-like symbols ('A', ..., 'Z', 'AA', ...)."""
+    symbols = []
+    letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    i = 0
+    while len(symbols) < n_symbols:
+        name, k = '', i
+        while True:
+            name = letters[k % 26] + name
+            k = k // 26 - 1
+            if k < 0:
+                break
+        symbols.append(name)
+        i += 1
+    return symbols
+
+
+def make_news_dates(n_rows, offset_ratio=0.5, seed=42):
+    """Generate date strings in the layouts found in raw_analyst_ratings.csv.
+
+    A share ``offset_ratio`` of rows carries a '-04:00' offset; the rest are
+    naive 'YYYY-MM-DD HH:MM:SS' strings.
+    """
+    rng = np.random.default_rng(seed)
+    seconds = rng.integers(0, 12 * 365 * 86400, n_rows)
+    timestamps = pd.Timestamp('2009-01-01') + pd.to_timedelta(seconds, unit='s')
+    local = timestamps.strftime('%Y-%m-%d %H:%M:%S').to_numpy(dtype=object)
+    with_offset = rng.random(n_rows) < offset_ratio
+    return pd.Series(np.where(with_offset, local + '-04:00', local), dtype=object)
+
+
+def make_headlines(n_rows, symbols, publishers, duplicate_ratio=0.3, seed=42):
+    """Generate headlines where about ``duplicate_ratio`` of rows repeat earlier ones."""
+    rng = np.random.default_rng(seed)
+    n_unique = max(1, int(round(n_rows * (1.0 - duplicate_ratio))))
+    templates = np.array(HEADLINE_TEMPLATES, dtype=object)[rng.integers(0, len(HEADLINE_TEMPLATES), n_unique)]
+    symbol_picks = np.asarray(symbols, dtype=object)[rng.integers(0, len(symbols), n_unique)]
+    publisher_picks = np.asarray(publishers, dtype=object)[rng.integers(0, len(publishers), n_unique)]
+    days = np.array(DAY_NAMES, dtype=object)[rng.integers(0, len(DAY_NAMES), n_unique)]
+    quarters = rng.integers(1, 5, n_unique)
+    serials = rng.integers(0, 10**6, n_unique)
+    unique = [
+        f"{template.format(symbol=symbol, publisher=publisher, day=day, quarter=quarter)} ({serial})"
+        for template, symbol, publisher, day, quarter, serial
+        in zip(templates, symbol_picks, publisher_picks, days, quarters, serials)
+    ]
+    picks = np.concatenate([np.arange(n_unique), rng.integers(0, n_unique, n_rows - n_unique)])
+    rng.shuffle(picks)
+    return np.asarray(unique, dtype=object)[picks]
+
+
+def make_news(n_rows, n_symbols=100, n_publishers=50, duplicate_ratio=0.3, offset_ratio=0.5, seed=42):
+    """Raw news frame with the columns of raw_analyst_ratings.csv.
+
+    Args:
+        n_rows: Number of articles.
+        n_symbols: Number of distinct tickers.
+        n_publishers: Number of distinct publishers (Zipf-like popularity).
+        duplicate_ratio: Share of rows whose headline repeats another row.
+        offset_ratio: Share of date strings with a UTC offset.
+        seed: Random seed.
+
+    Returns:
+        DataFrame with 'Unnamed: 0', 'headline', 'url', 'publisher', 'date'
+        (strings, as in the CSV) and 'stock'.
+    """
+    rng = np.random.default_rng(seed)
+    symbols = make_symbols(n_symbols)
+    publishers = [f'Publisher {i}' for i in range(n_publishers)]
+    weights = 1.0 / np.arange(1, n_publishers + 1)
+    return pd.DataFrame({
+        'Unnamed: 0': np.arange(n_rows),
+        'headline': make_headlines(n_rows, symbols, publishers, duplicate_ratio, seed),
+        'url': [f'https://example.com/news/{i}' for i in range(n_rows)],
+        'publisher': np.asarray(publishers, dtype=object)[rng.choice(n_publishers, n_rows, p=weights / weights.sum())],
+        'date': make_news_dates(n_rows, offset_ratio, seed),
+        'stock': np.asarray(symbols, dtype=object)[rng.integers(0, n_symbols, n_rows)],
+    })
+
+
+def make_stock_frames(n_symbols, n_days=252, start='2020-01-01', seed=42):
+    """Dict of symbol -> OHLCV frame indexed by business day.
+
+    Prices follow a geometric random walk with High >= Open/Close >= Low, as
+    in the ``sample_stock_data`` fixture.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, periods=n_days, name='Date')
+    returns = rng.normal(0.0003, 0.02, (n_days, n_symbols))
+    close = 100 * np.exp(np.cumsum(returns, axis=0))
+    open_ = close * np.exp(rng.normal(0, 0.005, close.shape))
+    high = np.maximum(open_, close) * (1 + rng.random(close.shape) * 0.02)
+    low = np.minimum(open_, close) * (1 - rng.random(close.shape) * 0.02)
+    volume = rng.integers(1_000_000, 10_000_000, close.shape)
+    return {
+        symbol: pd.DataFrame({
+            'Open': open_[:, j], 'High': high[:, j], 'Low': low[:, j],
+            'Close': close[:, j], 'Volume': volume[:, j],
+        }, index=dates)
+        for j, symbol in enumerate(make_symbols(n_symbols))
+    }
+
+
+def make_returns(n_days=252, n_symbols=1, volatility=0.02, seed=42):
+    """Daily returns frame (dates x symbols), like ``sample_returns`` at scale."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2020-01-01', periods=n_days, freq='D', name='Date')
+    values = rng.normal(0.0, volatility, (n_days, n_symbols))
+    return pd.DataFrame(values, index=dates, columns=make_symbols(n_symbols))
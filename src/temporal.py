@@ -0,0 +1,309 @@
+"""
+Precomputed (day, hour) rollup cube for publication-frequency analytics.
+
+The EDA notebook derives year, month, day_of_week, hour and date_only columns
+and calls ``value_counts`` / ``groupby`` on each of them. ``TemporalCube``
+instead bins the int64 timestamps once into a dense days x 24 count array;
+every temporal series (yearly, monthly, weekday, hourly, daily) is a cheap
+reduction of that array. An optional grouping column (stock or publisher)
+adds a sparse groups x (day, hour) matrix so the same series are available
+per group. Cubes can be extended in place as new days of news arrive and are
+persisted next to the news column cache.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from .cache import default_cache_dir, file_fingerprint
+from .news_loader import load_news
+from .profiling import instrument
+
+
+CUBE_VERSION = 1
+HOURS_PER_DAY = 24
+NS_PER_HOUR = 3600 * 10**9
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+
+def hour_numbers(timestamps, tz=None, naive_tz='UTC'):
+    """Hours since the epoch (wall clock) for each valid timestamp.
+
+    Args:
+        timestamps: Datetime-like Series or array (NaT allowed).
+        tz: Time zone whose wall clock defines day and hour; None keeps naive
+            timestamps as they are (``load_news`` returns naive UTC) and
+            converts aware ones to UTC.
+        naive_tz: Time zone assumed for naive timestamps when ``tz`` is set.
+
+    Returns:
+        Tuple ``(hours, valid)``: int64 hour numbers of the valid rows and the
+        boolean mask of valid rows.
+    """
+    dates = pd.DatetimeIndex(pd.to_datetime(timestamps))
+    if tz is not None:
+        if dates.tz is None:
+            dates = dates.tz_localize(naive_tz)
+        dates = dates.tz_convert(tz).tz_localize(None)
+    elif dates.tz is not None:
+        dates = dates.tz_convert('UTC').tz_localize(None)
+    values = dates.to_numpy(dtype='datetime64[ns]')
+    valid = ~np.isnat(values)
+    return values[valid].view(np.int64) // NS_PER_HOUR, valid
+
+
+class TemporalCube:
+    """Article counts per (day, hour), optionally also per group.
+
+    Attributes:
+        start_day: Day number (days since epoch) of the first row of ``counts``.
+        counts: int64 array (n_days, 24).
+        by: Name of the grouping column, or None.
+        groups: Sorted Index of group labels (None without grouping).
+        group_counts: int64 CSR matrix (n_groups, n_days * 24).
+        tz: Time zone used for day/hour boundaries (None: naive UTC).
+    """
+
+    def __init__(self, start_day, counts, by=None, groups=None, group_counts=None, tz=None):
+        self.start_day = int(start_day)
+        self.counts = np.asarray(counts, dtype=np.int64).reshape(-1, HOURS_PER_DAY)
+        self.by = by
+        self.groups = None if groups is None else pd.Index(groups, name=by)
+        self.group_counts = None if group_counts is None else sparse.csr_matrix(group_counts, dtype=np.int64)
+        self.tz = tz
+
+    @classmethod
+    @instrument('temporal_cube', rows=1)
+    def from_frame(cls, df, date_col='date', by=None, tz=None):
+        """Build a cube from a news frame.
+
+        Args:
+            df: News frame.
+            date_col: Timestamp column.
+            by: Optional grouping column (e.g. 'stock' or 'publisher').
+            tz: Time zone for day/hour boundaries (see ``hour_numbers``).
+        """
+        cube = cls(0, np.zeros((0, HOURS_PER_DAY), dtype=np.int64), by=by,
+                   groups=[] if by is not None else None,
+                   group_counts=sparse.csr_matrix((0, 0), dtype=np.int64) if by is not None else None,
+                   tz=tz)
+        return cube.update(df, date_col=date_col)
+
+    @property
+    def n_days(self):
+        return len(self.counts)
+
+    @property
+    def days(self):
+        """DatetimeIndex of the cube's days (including days without articles)."""
+        numbers = np.arange(self.start_day, self.start_day + self.n_days)
+        return pd.DatetimeIndex(numbers.astype('datetime64[D]').astype('datetime64[ns]'), name='date')
+
+    def update(self, df, date_col='date'):
+        """Add articles (e.g. newly arrived days of news) in place.
+
+        The day range and the group labels grow as needed.
+
+        Returns:
+            The cube itself.
+        """
+        hours, valid = hour_numbers(df[date_col], tz=self.tz)
+        if len(hours) == 0:
+            return self
+        lo = int(hours.min()) // HOURS_PER_DAY
+        hi = int(hours.max()) // HOURS_PER_DAY + 1
+        if self.n_days:
+            lo, hi = min(lo, self.start_day), max(hi, self.start_day + self.n_days)
+        self._extend(lo, hi)
+        slots = hours - self.start_day * HOURS_PER_DAY
+        n_slots = self.n_days * HOURS_PER_DAY
+        self.counts += np.bincount(slots, minlength=n_slots).reshape(-1, HOURS_PER_DAY)
+
+        if self.by is not None:
+            codes, labels = pd.factorize(df[self.by].to_numpy()[valid], sort=True)
+            self._add_groups(labels)
+            has_group = codes >= 0
+            rows = self.groups.get_indexer(labels)[codes[has_group]]
+            added = sparse.csr_matrix(
+                (np.ones(len(rows), dtype=np.int64), (rows, slots[has_group])),
+                shape=(len(self.groups), n_slots))
+            added.sum_duplicates()
+            self.group_counts = self.group_counts + added
+        return self
+
+    def _extend(self, lo, hi):
+        """Pad the day axis so it covers days [lo, hi)."""
+        before = self.start_day - lo if self.n_days else 0
+        after = hi - lo - before - self.n_days
+        if before == 0 and after == 0 and self.n_days:
+            return
+        self.counts = np.pad(self.counts, ((before, after), (0, 0)))
+        if self.group_counts is not None:
+            coo = self.group_counts.tocoo()
+            self.group_counts = sparse.csr_matrix(
+                (coo.data, (coo.row, coo.col + before * HOURS_PER_DAY)),
+                shape=(coo.shape[0], (hi - lo) * HOURS_PER_DAY))
+        self.start_day = lo
+
+    def _add_groups(self, labels):
+        """Merge new labels into the sorted group Index, remapping rows."""
+        merged = self.groups.union(pd.Index(labels, name=self.by))
+        if merged.equals(self.groups):
+            return
+        coo = self.group_counts.tocoo()
+        rows = merged.get_indexer(self.groups)[coo.row]
+        self.group_counts = sparse.csr_matrix(
+            (coo.data, (rows, coo.col)), shape=(len(merged), self.n_days * HOURS_PER_DAY))
+        self.groups = pd.Index(merged, name=self.by)
+
+    def hourly(self, group=None):
+        """Dense (n_days, 24) counts, for all articles or one or more groups."""
+        if group is None:
+            return self.counts
+        if self.by is None:
+            raise ValueError("This cube has no grouping column")
+        labels = [group] if np.isscalar(group) else list(group)
+        rows = self.groups.get_indexer(labels)
+        if (rows < 0).any():
+            missing = [label for label, row in zip(labels, rows) if row < 0]
+            raise KeyError(f"Unknown {self.by}: {missing}")
+        totals = np.asarray(self.group_counts[rows].sum(axis=0)).ravel()
+        return totals.reshape(-1, HOURS_PER_DAY)
+
+    def daily(self, group=None, include_empty=False):
+        """Articles per calendar day (the notebook's ``daily_counts``)."""
+        series = pd.Series(self.hourly(group).sum(axis=1), index=self.days, name='article_count')
+        return series if include_empty else series[series > 0]
+
+    def monthly(self, group=None):
+        """Articles per month, indexed by a monthly PeriodIndex."""
+        months = self._day_fields('M')
+        return self._reduce(self.hourly(group).sum(axis=1), months,
+                            lambda m: pd.PeriodIndex(m.astype('datetime64[M]'), freq='M'), 'year_month')
+
+    def by_year(self, group=None):
+        """Articles per year (``df['year'].value_counts().sort_index()``)."""
+        years = self._day_fields('Y')
+        return self._reduce(self.hourly(group).sum(axis=1), years, lambda y: y + 1970, 'year')
+
+    def by_month(self, group=None):
+        """Articles per month of the year, 1-12."""
+        month_of_year = self._day_fields('M') % 12
+        return self._reduce(self.hourly(group).sum(axis=1), month_of_year, lambda m: m + 1, 'month')
+
+    def by_weekday(self, group=None):
+        """Articles per weekday, Monday first (weekdays without articles omitted)."""
+        weekday = (np.arange(self.start_day, self.start_day + self.n_days) + 3) % 7
+        return self._reduce(self.hourly(group).sum(axis=1), weekday,
+                            lambda d: pd.Index(np.array(DAY_NAMES)[d]), 'day_of_week')
+
+    def by_hour(self, group=None):
+        """Articles per hour of the day, 0-23."""
+        counts = self.hourly(group).sum(axis=0)
+        return self._reduce(counts, np.arange(HOURS_PER_DAY), lambda h: h, 'hour')
+
+    def _day_fields(self, unit):
+        """Months ('M') or years ('Y') since 1970 for every day of the cube."""
+        days = np.arange(self.start_day, self.start_day + self.n_days).astype('datetime64[D]')
+        return days.astype(f'datetime64[{unit}]').astype(np.int64)
+
+    @staticmethod
+    def _reduce(values, keys, make_index, name):
+        """Sum ``values`` per integer key; keys without articles are omitted."""
+        if len(keys) == 0:
+            return pd.Series([], index=pd.Index([], name=name), name='count', dtype=np.int64)
+        offset = keys.min()
+        totals = np.bincount(keys - offset, weights=values).astype(np.int64)
+        present = np.flatnonzero(totals)
+        index = make_index(present + offset)
+        return pd.Series(totals[present], index=pd.Index(index, name=name), name='count')
+
+    def save(self, path, fingerprint=None):
+        """Write the cube to one compressed ``.npz`` file.
+
+        Args:
+            path: Output path.
+            fingerprint: Optional dict of the source file (see
+                ``file_fingerprint``) stored for cache validation.
+        """
+        arrays = {
+            'version': np.int64(CUBE_VERSION),
+            'start_day': np.int64(self.start_day),
+            'counts': self.counts,
+            'tz': np.str_(self.tz or ''),
+            'by': np.str_(self.by or ''),
+        }
+        if self.by is not None:
+            arrays.update({
+                'groups': np.array([str(g) for g in self.groups], dtype=str),
+                'data': self.group_counts.data, 'indices': self.group_counts.indices,
+                'indptr': self.group_counts.indptr,
+                'n_slots': np.int64(self.group_counts.shape[1]),
+            })
+        if fingerprint is not None:
+            arrays.update({
+                'source_size': np.int64(fingerprint['size']),
+                'source_mtime_ns': np.int64(fingerprint['mtime_ns']),
+            })
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Read a cube written by ``save``."""
+        with np.load(path) as data:
+            if int(data['version']) != CUBE_VERSION:
+                raise ValueError(f"{path}: unsupported cube version {int(data['version'])}")
+            by = str(data['by']) or None
+            groups = group_counts = None
+            if by is not None:
+                groups = data['groups'].astype(object)
+                group_counts = sparse.csr_matrix(
+                    (data['data'], data['indices'], data['indptr']),
+                    shape=(len(groups), int(data['n_slots'])))
+            return cls(int(data['start_day']), data['counts'], by=by, groups=groups,
+                       group_counts=group_counts, tz=str(data['tz']) or None)
+
+
+def cube_cache_path(path, by=None, tz=None, cache_dir=None):
+    """Return the cube file kept next to the news column cache of ``path``."""
+    if cache_dir is None:
+        cache_dir = default_cache_dir(path)
+    parts = [os.path.basename(path), 'cube']
+    if by is not None:
+        parts.insert(1, by)
+    if tz is not None:
+        parts.insert(-1, tz.replace('/', '-'))
+    return os.path.join(cache_dir, '.'.join(parts) + '.npz')
+
+
+def load_cube(path, by=None, tz=None, cache_dir=None, refresh=False):
+    """Load the temporal cube for a news CSV, building and caching it if needed.
+
+    The cube is rebuilt (from ``load_news``) when the CSV's size or
+    modification time no longer match the values stored with it.
+    """
+    cube_path = cube_cache_path(path, by=by, tz=tz, cache_dir=cache_dir)
+    fingerprint = file_fingerprint(path)
+    if not refresh and _cube_matches(cube_path, fingerprint):
+        return TemporalCube.load(cube_path)
+
+    columns = ['date'] if by is None else ['date', by]
+    df = load_news(path, cache_dir=cache_dir)[columns]
+    cube = TemporalCube.from_frame(df, by=by, tz=tz)
+    os.makedirs(os.path.dirname(cube_path), exist_ok=True)
+    staging = cube_path[:-len('.npz')] + '.staging.npz'
+    cube.save(staging, fingerprint=fingerprint)
+    os.replace(staging, cube_path)
+    return cube
+
+
+def _cube_matches(cube_path, fingerprint):
+    try:
+        with np.load(cube_path) as data:
+            return (int(data['version']) == CUBE_VERSION
+                    and 'source_size' in data.files
+                    and int(data['source_size']) == fingerprint['size']
+                    and int(data['source_mtime_ns']) == fingerprint['mtime_ns'])
+    except (FileNotFoundError, OSError, ValueError):
+        return False
@@ -0,0 +1,74 @@
+"""
+Tests for aligning news timestamps to trading days.
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.alignment import align_news, assign_trading_days, session_days
+from src.panel import PricePanel
+
+
+@pytest.fixture
+def calendars():
+    """Two stocks trading on weekdays; MSFT also skips Mon 2020-01-20."""
+    days = pd.bdate_range('2020-01-06', '2020-01-31')
+    return {
+        'AAPL': pd.DataFrame({'Close': np.arange(len(days), dtype=float)}, index=days),
+        'MSFT': pd.DataFrame({'Close': 1.0}, index=days.drop(pd.Timestamp('2020-01-20'))),
+    }
+
+
+@pytest.fixture
+def news():
+    """Headlines around the close, over a weekend and before a holiday."""
+    return pd.DataFrame({
+        'date': pd.to_datetime([
+            '2020-01-07 14:00:00',  # 09:00 ET Tue -> Tue
+            '2020-01-07 21:30:00',  # 16:30 ET Tue -> Wed
+            '2020-01-11 15:00:00',  # Saturday -> Mon 13th
+            '2020-01-17 22:00:00',  # Fri after close -> Mon 20th / Tue 21st
+            '2020-01-17 22:00:00',
+            '2020-02-15 12:00:00',  # after the last trading day
+            '2020-01-08 15:00:00',  # unknown stock
+            None,
+        ]),
+        'stock': ['AAPL', 'AAPL', 'AAPL', 'AAPL', 'MSFT', 'AAPL', 'GOOG', 'AAPL'],
+        'polarity': [0.5, -0.5, 0.2, 0.4, np.nan, 0.1, 0.3, 0.0],
+    })
+
+
+class TestAlignment:
+    """Test the market-close cutoff, roll-forward and aggregation."""
+
+    def test_session_days_cutoff(self):
+        """Test timestamps at or after the close move to the next day."""
+        stamps = pd.Series(pd.to_datetime(['2020-01-07 20:59:59', '2020-01-07 21:00:00']))
+        days = session_days(stamps).astype('datetime64[D]')
+        assert days.astype(str).tolist() == ['2020-01-07', '2020-01-08']
+        assert session_days(stamps, market_close=None).astype('datetime64[D]').astype(str).tolist() == \
+            ['2020-01-07', '2020-01-07']
+
+    def test_assign_trading_days(self, news, calendars):
+        """Test per-stock as-of roll-forward over weekends and holidays."""
+        trading_days = assign_trading_days(news, calendars)
+        expected = pd.to_datetime(['2020-01-07', '2020-01-08', '2020-01-13', '2020-01-20',
+                                   '2020-01-21', None, None, None])
+        pd.testing.assert_series_equal(trading_days, pd.Series(expected, name='trading_day'))
+
+    def test_aggregate_per_stock_and_day(self, news, calendars):
+        """Test counts and mean sentiment per (stock, trading day)."""
+        result = align_news(news, PricePanel.from_frames(calendars), sentiment_col='polarity')
+
+        assert result['stock'].astype(str).tolist() == ['AAPL'] * 4 + ['MSFT']
+        assert result['article_count'].tolist() == [1, 1, 1, 1, 1]
+        assert result['mean_sentiment'].iloc[:4].tolist() == [0.5, -0.5, 0.2, 0.4]
+        assert np.isnan(result['mean_sentiment'].iloc[4])
+
+        doubled = align_news(pd.concat([news, news]), calendars, sentiment_col='polarity')
+        assert doubled['article_count'].tolist() == [2] * 5
+        np.testing.assert_array_equal(doubled['mean_sentiment'], result['mean_sentiment'])
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
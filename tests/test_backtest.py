@@ -0,0 +1,149 @@
+"""
+Tests for the vectorized parameter-grid backtester.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest import BACKTEST_COLUMNS, backtest_grid, hold_states, parameter_grid
+from src.panel import PricePanel
+from src.synthetic import make_stock_frames
+
+
+def reference_returns(close, strategy, params, cost, long_only):
+    """Strategy returns and positions of one combination on one symbol, with pandas."""
+    close = close.dropna()
+    if strategy == 'sma_cross':
+        spread = close.rolling(params['fast']).mean() - close.rolling(params['slow']).mean()
+        state = np.sign(spread.fillna(0))
+    else:
+        if strategy == 'rsi':
+            delta = close.diff()
+            gain = delta.where(delta > 0, 0).rolling(params['window']).mean()
+            loss = (-delta.where(delta < 0, 0)).rolling(params['window']).mean()
+            rsi = 100 - 100 / (1 + gain / loss)
+            long, short = rsi < params['lower'], rsi > params['upper']
+        else:
+            middle = close.rolling(params['window']).mean()
+            width = params['num_std'] * close.rolling(params['window']).std()
+            long, short = close > middle + width, close < middle - width
+        signal = pd.Series(np.where(long, 1.0, np.where(short, -1.0, np.nan)), index=close.index)
+        state = signal.ffill().fillna(0)
+    if long_only:
+        state = state.clip(lower=0)
+
+    previous = state.shift(1).fillna(0)
+    strategy_returns = previous * close.pct_change().fillna(0) - cost * (state - previous).abs()
+    return strategy_returns, state, previous
+
+
+def reference_backtest(close, strategy, params, cost, long_only):
+    """One combination on one symbol, bar by bar with pandas."""
+    strategy_returns, state, previous = reference_returns(close, strategy, params, cost, long_only)
+    valid = close.dropna().pct_change().notna()
+    equity = (1 + strategy_returns).cumprod()
+    annualized = (equity.iloc[-1] ** (252 / valid.sum()) - 1) * 100
+    volatility = strategy_returns[valid].std() * np.sqrt(252) * 100
+    return {
+        'Total_Return': (equity.iloc[-1] - 1) * 100,
+        'Annualized_Return': annualized,
+        'Volatility': volatility,
+        'Sharpe_Ratio': annualized / volatility if volatility > 0 else 0.0,
+        'Max_Drawdown': (equity / np.maximum(equity.cummax(), 1) - 1).min() * 100,
+        'Trades': (state != previous).sum(),
+        'Exposure': (previous[valid] != 0).mean() * 100,
+    }
+
+
+@pytest.fixture
+def frames():
+    """Price frames including a late-listed symbol and interior gaps."""
+    frames = make_stock_frames(3, n_days=260, seed=11)
+    frames['B'] = frames['B'].iloc[40:]
+    frames['C'] = frames['C'].drop(frames['C'].index[[120, 180, 181]])
+    return frames
+
+
+GRIDS = {
+    'sma_cross': {'fast': (5, 20), 'slow': (20, 50)},
+    'rsi': {'window': (7, 14), 'lower': (30,), 'upper': (60, 70)},
+    'bollinger': {'window': (10, 20), 'num_std': (1.0, 2.0)},
+}
+
+
+class TestBacktestGrid:
+    """Test grid metrics against per-symbol pandas backtests."""
+
+    def test_matches_reference(self, frames):
+        """Test every rule, combination and symbol against pandas."""
+        panel = PricePanel.from_frames(frames)
+        for strategy, grid in GRIDS.items():
+            for long_only in (True, False):
+                result = backtest_grid(panel, strategy, grid, cost=0.001, long_only=long_only)
+                assert list(result.metrics.columns) == BACKTEST_COLUMNS
+                assert len(result.metrics) == len(parameter_grid(strategy, grid)) * len(frames)
+                for key, row in result.metrics.iterrows():
+                    params = dict(zip(result.metrics.index.names[:-1], key[:-1]))
+                    expected = reference_backtest(frames[key[-1]]['Close'], strategy, params, 0.001, long_only)
+                    for column, value in expected.items():
+                        assert row[column] == pytest.approx(value, rel=1e-9, abs=1e-9), (strategy, key, column)
+
+    def test_portfolio_is_equal_weighted(self, frames):
+        """Test the portfolio compounds the mean return of the symbols trading each day."""
+        panel = PricePanel.from_frames(frames)
+        result = backtest_grid(panel, 'sma_cross', {'fast': (5, 10), 'slow': 20}, cost=0.001)
+        assert result.portfolio.index.names == ['fast', 'slow']
+        for (fast, slow), row in result.portfolio.iterrows():
+            params = {'fast': fast, 'slow': slow}
+            returns = pd.DataFrame({symbol: reference_returns(df['Close'], 'sma_cross', params, 0.001, True)[0]
+                                    for symbol, df in frames.items()})
+            trading = pd.DataFrame({symbol: df['Close'].pct_change() for symbol, df in frames.items()}).notna()
+            daily = returns.where(trading).mean(axis=1).fillna(0)
+            assert row['Total_Return'] == pytest.approx(((1 + daily).prod() - 1) * 100, rel=1e-9)
+            assert row['Trades'] == result.metrics.xs((fast, slow))['Trades'].sum()
+        best = result.best(1, by='Total_Return')
+        assert best['Total_Return'].iloc[0] == result.portfolio['Total_Return'].max()
+
+    def test_chunks_processes_and_frames_agree(self, frames):
+        """Test chunking, the process pool and a close frame give identical results."""
+        panel = PricePanel.from_frames(frames)
+        grid = {'fast': (5, 10, 20), 'slow': (30, 50)}
+        expected = backtest_grid(panel, 'sma_cross', grid)
+        for result in (backtest_grid(panel, 'sma_cross', grid, chunksize=1),
+                       backtest_grid(panel, 'sma_cross', grid, chunksize=2, n_jobs=2),
+                       backtest_grid(panel.field_frame(panel['Close']), 'sma_cross', grid)):
+            pd.testing.assert_frame_equal(result.metrics, expected.metrics)
+            pd.testing.assert_frame_equal(result.portfolio, expected.portfolio)
+
+    def test_costs_reduce_returns(self, frames):
+        """Test trading costs lower returns in proportion to trades."""
+        panel = PricePanel.from_frames(frames)
+        free = backtest_grid(panel, 'bollinger', GRIDS['bollinger']).metrics
+        costly = backtest_grid(panel, 'bollinger', GRIDS['bollinger'], cost=0.01).metrics
+        traded = free['Trades'] > 0
+        assert (costly.loc[traded, 'Total_Return'] < free.loc[traded, 'Total_Return']).all()
+        assert (costly.loc[~traded, 'Total_Return'] == free.loc[~traded, 'Total_Return']).all()
+
+
+class TestGridHelpers:
+    """Test parameter grids and held states."""
+
+    def test_parameter_grid(self):
+        """Test invalid combinations are dropped and bad grids rejected."""
+        params = parameter_grid('sma_cross', {'fast': (50, 5, 20), 'slow': (20, 50)})
+        assert params.values.tolist() == [[5, 20], [5, 50], [20, 50]]
+        assert len(parameter_grid('rsi', {'window': 14, 'lower': (30, 80), 'upper': (70,)})) == 1
+        with pytest.raises(ValueError):
+            parameter_grid('momentum')
+        with pytest.raises(ValueError):
+            parameter_grid('bollinger', {'window': (20,)})
+
+    def test_hold_states(self):
+        """Test the last signal is held until the next one."""
+        signals = np.array([[0, 1, 0, 0, -1, 0, 1], [0, 0, 0, -1, 0, 0, 0]], dtype=np.int8)[..., np.newaxis]
+        held = hold_states(signals)[..., 0]
+        assert held.tolist() == [[0, 1, 1, 1, -1, -1, 1], [0, 0, 0, -1, -1, -1, -1]]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
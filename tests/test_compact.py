@@ -0,0 +1,80 @@
+"""
+Tests for the memory-compact news frame.
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.compact import CompactNewsFrame, compact_news, memory_report
+
+
+@pytest.fixture
+def news():
+    """Notebook-style news frame with the derived date columns."""
+    rng = np.random.default_rng(5)
+    n = 3000
+    df = pd.DataFrame({
+        'headline': rng.choice(['Price target raised', 'Stocks that hit 52-week highs', 'Earnings beat'], n),
+        'url': [f'https://example.com/{i}' for i in range(n)],
+        'publisher': rng.choice(['Benzinga', 'Lisa Levin', 'Zacks'], n).astype(object),
+        'date': pd.Timestamp('2019-01-01') + pd.to_timedelta(rng.integers(0, 400 * 86400, n), unit='s'),
+        'stock': rng.choice(['AAPL', 'MSFT', 'NVDA', 'TSLA'], n).astype(object),
+    })
+    df['year'] = df['date'].dt.year
+    df['month'] = df['date'].dt.month
+    df['day'] = df['date'].dt.day
+    df['day_of_week'] = df['date'].dt.day_name()
+    df['hour'] = df['date'].dt.hour
+    df['date_only'] = df['date'].dt.date
+    return df
+
+
+class TestCompactNews:
+    """Test the compact frame reproduces the notebook's computations."""
+
+    def test_dtypes_and_memory(self, news):
+        """Test compact dtypes and that the report shows the savings."""
+        compact = compact_news(news, string_storage='python')
+        assert isinstance(compact, CompactNewsFrame)
+        assert list(compact.columns) == ['headline', 'url', 'publisher', 'date', 'stock']
+        assert isinstance(compact['publisher'].dtype, pd.CategoricalDtype)
+        assert compact['hour'].dtype == np.int8
+        assert compact['year'].dtype == np.int16
+
+        report = memory_report(news, compact)
+        assert report.loc['date_only', 'after'] == 0
+        assert report.loc['total', 'after'] < report.loc['total', 'before'] / 2
+
+    def test_arrow_strings(self, news):
+        """Test headline/url become Arrow-backed strings."""
+        pytest.importorskip('pyarrow')
+        compact = compact_news(news, string_storage='pyarrow')
+        assert compact['headline'].dtype == pd.StringDtype('pyarrow')
+        assert compact['headline'].str.len().tolist() == news['headline'].str.len().tolist()
+
+    def test_notebook_computations_unchanged(self, news):
+        """Test value_counts and groupby cells give the same results."""
+        compact = compact_news(news)
+        for col in ['year', 'month', 'hour']:
+            pd.testing.assert_series_equal(compact[col].value_counts().sort_index(),
+                                           news[col].value_counts().sort_index(),
+                                           check_dtype=False, check_index_type=False)
+        assert compact['hour'].mode()[0] == news['hour'].mode()[0]
+        assert compact['day_of_week'].astype(str).tolist() == news['day_of_week'].tolist()
+
+        daily = compact.groupby('date_only').size().reset_index(name='article_count')
+        expected = news.groupby('date_only').size().reset_index(name='article_count')
+        assert daily['article_count'].tolist() == expected['article_count'].tolist()
+        assert (pd.to_datetime(daily['date_only']) == pd.to_datetime(expected['date_only'])).all()
+
+        pairs = compact.groupby(['publisher', 'stock']).size().reset_index(name='count')
+        expected = news.groupby(['publisher', 'stock']).size().reset_index(name='count')
+        assert pairs.astype(str).values.tolist() == expected.astype(str).values.tolist()
+
+        subset = compact[compact['hour'] < 12]
+        assert isinstance(subset, CompactNewsFrame)
+        assert subset[['year', 'headline']].shape == (int((news['hour'] < 12).sum()), 2)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,99 @@
+"""
+Tests for the lagged/rolling correlation engine.
+"""
+import pytest
+import pandas as pd
+import numpy as np
+from scipy import stats
+
+from src.correlation import lagged_correlations, permutation_test, rolling_correlations
+
+
+@pytest.fixture
+def sentiment_and_returns():
+    """Sentiment that leads returns by one day, with missing days."""
+    np.random.seed(7)
+    dates = pd.bdate_range('2020-01-01', periods=300)
+    symbols = ['AAPL', 'MSFT', 'NVDA']
+    returns = pd.DataFrame(np.random.randn(300, 3) * 0.02, index=dates, columns=symbols)
+    sentiment = pd.DataFrame(np.random.randn(300, 3), index=dates, columns=symbols)
+    sentiment['AAPL'] += 30 * returns['AAPL'].shift(-1).fillna(0)
+    sentiment = sentiment.mask(np.random.rand(300, 3) < 0.2)
+    return sentiment, returns
+
+
+class TestCorrelationEngine:
+    """Test agreement with scipy/pandas and the significance test."""
+
+    def test_lagged_matches_scipy(self, sentiment_and_returns):
+        """Test r, n and p-values against scipy for each method and lag."""
+        sentiment, returns = sentiment_and_returns
+        table = lagged_correlations(sentiment, returns, lags=[-2, 0, 1])
+        assert len(table) == 3 * 2 * 3
+
+        for row in table.itertuples():
+            x = sentiment[row.stock]
+            y = returns[row.stock].shift(-row.lag)
+            valid = x.notna() & y.notna()
+            func = stats.pearsonr if row.method == 'pearson' else stats.spearmanr
+            r, p = func(x[valid], y[valid])
+            assert row.n == valid.sum()
+            assert row.r == pytest.approx(r, abs=1e-10)
+            assert row.p_value == pytest.approx(p, rel=1e-6, abs=1e-300)
+
+    def test_rolling_matches_pandas(self, sentiment_and_returns):
+        """Test rolling correlations equal pandas rolling().corr()."""
+        sentiment, returns = sentiment_and_returns
+        result = rolling_correlations(sentiment, returns, window=40, lags=[-1, 2], min_periods=10)
+
+        for (stock, lag), group in result.groupby(['stock', 'lag']):
+            expected = sentiment[stock].rolling(40, min_periods=10).corr(returns[stock].shift(-lag))
+            expected = expected.dropna()
+            np.testing.assert_allclose(group.set_index('date')['r'].reindex(expected.index),
+                                       expected, rtol=1e-8)
+
+    def test_rolling_spearman_matches_scipy(self, sentiment_and_returns):
+        """Test rolling Spearman against spearmanr on each window, in any block size."""
+        sentiment, returns = sentiment_and_returns
+        sentiment, returns = sentiment.iloc[:80], returns.iloc[:80]
+        result = rolling_correlations(sentiment, returns, window=20, lags=[1], min_periods=8,
+                                      methods=('pearson', 'spearman'))
+        assert set(result['method']) == {'pearson', 'spearman'}
+        spearman = result[result['method'] == 'spearman'].set_index(['stock', 'date'])
+        expected_rows = 0
+        for stock in sentiment:
+            x, y = sentiment[stock], returns[stock].shift(-1)
+            for end in range(len(x)):
+                window = slice(max(0, end - 19), end + 1)
+                valid = x.iloc[window].notna() & y.iloc[window].notna()
+                if valid.sum() < 8:
+                    continue
+                expected_rows += 1
+                r = stats.spearmanr(x.iloc[window][valid], y.iloc[window][valid])[0]
+                row = spearman.loc[(stock, x.index[end])]
+                assert row['r'] == pytest.approx(r, abs=1e-10)
+                assert row['n'] == valid.sum()
+        assert len(spearman) == expected_rows
+
+        blocks = rolling_correlations(sentiment, returns, window=20, lags=[1], min_periods=8,
+                                      methods=('spearman',), max_cells=100)
+        pd.testing.assert_frame_equal(blocks, result[result['method'] == 'spearman'].reset_index(drop=True))
+
+    def test_permutation_test(self, sentiment_and_returns):
+        """Test the leading signal is significant and results ignore n_jobs."""
+        sentiment, returns = sentiment_and_returns
+        serial = permutation_test(sentiment, returns, lags=[0, 1], n_permutations=200, batch_size=50)
+        parallel = permutation_test(sentiment, returns, lags=[0, 1], n_permutations=200, batch_size=50,
+                                    n_jobs=2)
+
+        pd.testing.assert_frame_equal(serial, parallel)
+        sliced = permutation_test(sentiment, returns, lags=[0, 1], n_permutations=200, batch_size=50,
+                                  max_cells=250)
+        pd.testing.assert_frame_equal(serial, sliced)
+        lead = serial.set_index(['stock', 'lag'])
+        assert lead.loc[('AAPL', 1), 'p_perm'] == pytest.approx(1 / 201)
+        assert lead.loc[('MSFT', 1), 'p_perm'] > 0.01
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,81 @@
+"""
+Tests for the sparse publisher x stock coverage aggregation.
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.coverage import PublisherCoverage
+
+
+@pytest.fixture
+def news():
+    """Random articles with missing headlines, stocks, publishers and dates."""
+    rng = np.random.default_rng(3)
+    n = 2000
+    df = pd.DataFrame({
+        'headline': 'headline',
+        'publisher': rng.choice([f'pub{i}' for i in range(25)], n, p=np.arange(1, 26) / 325),
+        'stock': rng.choice([f'S{i}' for i in range(60)], n),
+        'date': pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 10**8, n), unit='s'),
+    })
+    df.loc[::37, 'headline'] = None
+    df.loc[::41, 'stock'] = None
+    df.loc[::43, 'publisher'] = None
+    df.loc[::47, 'date'] = pd.NaT
+    return df
+
+
+def notebook_publisher_stats(df):
+    """The notebook's groupby-based publisher_stats."""
+    stats = df.groupby('publisher').agg({
+        'headline': 'count', 'stock': 'nunique', 'date': ['min', 'max'],
+    }).reset_index()
+    stats.columns = ['publisher', 'article_count', 'unique_stocks', 'first_article', 'last_article']
+    stats = stats.sort_values('article_count', ascending=False, kind='stable')
+    stats['contribution_pct'] = (stats['article_count'] / len(df) * 100).round(2)
+    return stats
+
+
+class TestPublisherCoverage:
+    """Test agreement with the notebook's groupby/pivot code."""
+
+    def test_publisher_stats(self, news):
+        """Test statistics match the groupby aggregation."""
+        coverage = PublisherCoverage.from_frame(news)
+        expected = notebook_publisher_stats(news)
+        pd.testing.assert_frame_equal(coverage.publisher_stats().reset_index(drop=True),
+                                      expected.reset_index(drop=True), check_dtype=False)
+        assert len(coverage.publisher_stats(5)) == 5
+
+    def test_matrix_matches_pivot(self, news):
+        """Test the sparse matrix and dense slices against the zero-filled pivot."""
+        coverage = PublisherCoverage.from_frame(news)
+        pairs = news.groupby(['publisher', 'stock']).size().reset_index(name='count')
+        pivot = pairs.pivot(index='publisher', columns='stock', values='count').fillna(0)
+
+        assert coverage.shape == pivot.shape
+        np.testing.assert_array_equal(coverage.matrix.toarray(), pivot.to_numpy())
+        pd.testing.assert_frame_equal(coverage.pairs(), pairs, check_dtype=False)
+
+        top = coverage.top_publishers(10)
+        counts = news['publisher'].value_counts()
+        assert counts[top].tolist() == counts.head(10).tolist()
+        pd.testing.assert_frame_equal(coverage.coverage(drop_empty=False), pivot.loc[top],
+                                      check_names=False)
+
+    def test_top_stock_slice(self, news):
+        """Test n_stocks keeps the most covered stocks in column order."""
+        coverage = PublisherCoverage.from_frame(news)
+        block = coverage.coverage(publishers=['pub24', 'pub0'], n_stocks=5)
+        subset = news[news['publisher'].isin(['pub24', 'pub0'])]
+        counts = subset['stock'].value_counts()
+
+        assert block.index.tolist() == ['pub24', 'pub0']
+        assert block.columns.is_monotonic_increasing
+        assert sorted(block.sum().astype(int), reverse=True) == counts.head(5).tolist()
+        assert (coverage.coverage(publishers=['pub0']).to_numpy() > 0).all()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,60 @@
+"""
+Tests for the fixed-layout news date parser.
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.dates import parse_mixed_dates
+
+
+def reference_parse(values):
+    """Date parsing as done in task1_eda.ipynb."""
+    parsed = pd.to_datetime(pd.Series(values, dtype=object), format='mixed', errors='coerce', utc=True)
+    return parsed.dt.tz_localize(None)
+
+
+class TestParseMixedDates:
+    """Test parse_mixed_dates against pd.to_datetime(format='mixed')."""
+
+    def test_mixed_date_formats(self):
+        """Test the layouts from test_data_loading.test_mixed_date_formats."""
+        dates = [
+            '2020-01-01 10:30:54-04:00',
+            '2020-01-02 00:00:00',
+            '2020-01-03 15:45:20-04:00'
+        ]
+        parsed, unparsed = parse_mixed_dates(pd.Series(dates))
+
+        assert not parsed.isna().any()
+        assert parsed.dtype == 'datetime64[ns]'
+        assert len(unparsed) == 0
+        assert parsed.iloc[0] == pd.Timestamp('2020-01-01 14:30:54')
+        assert parsed.equals(reference_parse(dates))
+
+    def test_matches_pandas_on_random_dates(self):
+        """Test agreement with pandas on a random mix of both layouts."""
+        rng = np.random.default_rng(0)
+        seconds = rng.integers(0, 40 * 365 * 86400, 2000)
+        local = (pd.Timestamp('1990-01-01') + pd.to_timedelta(seconds, unit='s')).strftime('%Y-%m-%d %H:%M:%S')
+        offsets = rng.choice(['', '-04:00', '-05:00', '+05:30'], size=len(local))
+        values = [a + b for a, b in zip(local, offsets)]
+
+        parsed, unparsed = parse_mixed_dates(values)
+        assert parsed.equals(reference_parse(values))
+        assert len(unparsed) == 0
+
+    def test_unparseable_rows_reported(self):
+        """Test invalid values become NaT and are reported separately."""
+        values = pd.Series(['2020-02-30 00:00:00', 'not a date', None, '2020-06-05',
+                            '2020-06-05 10:00:00-04:00'], index=[10, 11, 12, 13, 14])
+        parsed, unparsed = parse_mixed_dates(values)
+
+        assert list(parsed.index) == [10, 11, 12, 13, 14]
+        assert parsed.isna().tolist() == [True, True, True, False, False]
+        assert unparsed.to_dict() == {10: '2020-02-30 00:00:00', 11: 'not a date'}
+        assert parsed[13] == pd.Timestamp('2020-06-05')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
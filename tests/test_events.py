@@ -0,0 +1,130 @@
+"""
+Tests for the event study of abnormal returns.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from src.events import EventStudy, market_returns, phrase_events
+from src.panel import PricePanel
+from src.synthetic import make_stock_frames
+
+
+@pytest.fixture
+def panel():
+    """Price panel with a short history for one symbol and a gap in another."""
+    frames = make_stock_frames(6, n_days=120, seed=5)
+    frames['B'] = frames['B'].iloc[30:]
+    frames['C'] = frames['C'].drop(frames['C'].index[60:63])
+    return PricePanel.from_frames(frames)
+
+
+@pytest.fixture
+def events(panel):
+    """Random midday events over the panel's symbols and dates."""
+    rng = np.random.default_rng(0)
+    n = 400
+    return pd.DataFrame({
+        'stock': panel.symbols[rng.integers(0, len(panel.symbols), n)],
+        'date': panel.dates[rng.integers(0, len(panel.dates), n)] + pd.Timedelta(hours=12),
+        'event_type': rng.choice(['upgrade', 'downgrade'], n),
+    })
+
+
+def reference_window(panel, stock, day, window):
+    """Abnormal returns of one event sliced from pandas frames."""
+    returns = pd.DataFrame(panel.daily_returns(), index=panel.dates, columns=panel.symbols)
+    abnormal = returns.sub(returns.mean(axis=1), axis=0)[stock]
+    row = panel.dates.get_loc(day)
+    first, last = window
+    values = [abnormal.iloc[row + k] if 0 <= row + k < len(abnormal) else np.nan for k in range(first, last + 1)]
+    return np.array(values)
+
+
+class TestEventStudy:
+    """Test event windows, abnormal returns and per-type aggregation."""
+
+    def test_windows_match_reference(self, panel, events):
+        """Test every event's abnormal returns against a per-event slice."""
+        study = EventStudy.from_events(events, panel, window=(-5, 10))
+        assert study.abnormal.shape == (len(study), 16)
+        assert study.offsets.tolist() == list(range(-5, 11))
+        for position, (_, event) in enumerate(study.events.iterrows()):
+            expected = reference_window(panel, event['stock'], event['trading_day'], (-5, 10))
+            np.testing.assert_allclose(study.abnormal[position], expected, equal_nan=True)
+            assert event['complete'] == (not np.isnan(expected).any())
+        complete = study.events['complete'].to_numpy()
+        np.testing.assert_allclose(study.events['car'][complete], study.abnormal[complete].sum(axis=1))
+        assert study.events.loc[~complete, 'car'].isna().all()
+
+    def test_session_assignment_and_deduplication(self, panel):
+        """Test after-close news moves to the next session and repeats collapse."""
+        day, next_day = panel.dates[50], panel.dates[51]
+        events = pd.DataFrame({
+            'stock': ['A', 'A', 'A', 'A', 'ZZZ'],
+            'date': [day + pd.Timedelta(hours=h) for h in (10, 11, 21, 22, 10)],
+            'event_type': ['upgrade'] * 5,
+        })
+        study = EventStudy.from_events(events, panel, window=(0, 1), naive_tz='America/New_York')
+        assert study.events['trading_day'].tolist() == [day, next_day]
+        assert study.events.index.tolist() == [0, 2]
+        assert len(EventStudy.from_events(events, panel, window=(0, 1), deduplicate=False,
+                                          naive_tz='America/New_York')) == 4
+
+    def test_market_benchmarks(self, panel, events):
+        """Test a benchmark symbol or returns Series replaces the panel mean."""
+        returns = panel.daily_returns()
+        by_symbol = EventStudy.from_events(events, panel, market='A')
+        series = pd.Series(returns[:, 0], index=panel.dates)
+        by_series = EventStudy.from_events(events, panel, market=series)
+        np.testing.assert_allclose(by_symbol.abnormal, by_series.abnormal, equal_nan=True)
+        assert np.nanmax(np.abs(by_symbol.abnormal[(by_symbol.events['stock'] == 'A').to_numpy()])) == 0
+
+        benchmark = market_returns(returns)
+        assert np.isnan(benchmark[0])
+        np.testing.assert_allclose(benchmark[1:], np.nanmean(returns[1:], axis=1))
+
+    def test_average_and_summary(self, panel, events):
+        """Test per-type CAR means, confidence intervals and t-tests."""
+        study = EventStudy.from_events(events, panel, window=(-2, 3))
+        average = study.average()
+        assert set(average['event_type']) == {'upgrade', 'downgrade'}
+        assert len(average) == 2 * 6
+
+        summary = study.summary(confidence=0.9)
+        for event_type, row in summary.iterrows():
+            cars = study.events.loc[study.events['event_type'] == event_type, 'car'].dropna()
+            test = stats.ttest_1samp(cars, 0.0)
+            low, high = stats.t.interval(0.9, len(cars) - 1, loc=cars.mean(), scale=stats.sem(cars))
+            assert row['n'] == len(cars)
+            assert row['mean_car'] == pytest.approx(cars.mean())
+            assert row['t_stat'] == pytest.approx(test.statistic)
+            assert row['p_value'] == pytest.approx(test.pvalue)
+            assert (row['car_low'], row['car_high']) == pytest.approx((low, high))
+            last = average[(average['event_type'] == event_type) & (average['offset'] == 3)].iloc[0]
+            assert last['mean_car'] == pytest.approx(row['mean_car'])
+
+        short = study.summary(by=None, car_window=(0, 1))
+        complete = study.events['complete'].to_numpy()
+        assert short.loc['all', 'mean_car'] == pytest.approx(study.abnormal[complete][:, 2:4].sum(axis=1).mean())
+        with pytest.raises(ValueError):
+            study.summary(car_window=(5, 8))
+        with pytest.raises(ValueError):
+            EventStudy.from_events(events, panel, window=(3, -3))
+
+    def test_phrase_events(self):
+        """Test headlines become one event per matched phrase."""
+        news = pd.DataFrame({
+            'headline': ['FDA Approval for drug', 'Analyst upgrade, raises price target', 'Quiet day'],
+            'date': pd.to_datetime(['2020-01-02 10:00', '2020-01-03 10:00', '2020-01-03 11:00']),
+            'stock': ['A', 'B', 'C'],
+        })
+        events = phrase_events(news)
+        assert events.index.tolist() == [0, 1, 1]
+        assert set(events.loc[1, 'event_type']) == {'upgrade', 'price target'}
+        assert events.loc[0, 'event_type'] == 'fda approval'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
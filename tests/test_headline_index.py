@@ -0,0 +1,85 @@
+"""
+Tests for the inverted headline index.
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.headline_index import HeadlineIndex
+
+
+@pytest.fixture
+def news_frame():
+    """Create news rows with repeated phrases across stocks and months."""
+    np.random.seed(3)
+    headlines = [
+        'NVDA price target raised to $300',
+        'Analyst cuts price target on Apple',
+        'Target price unchanged after earnings',
+        'Earnings beat: shares rise',
+        'Upgrade: Buy rating and price-target hike',
+        None,
+    ]
+    n = 300
+    return pd.DataFrame({
+        'headline': [headlines[i % len(headlines)] for i in range(n)],
+        'date': pd.Timestamp('2020-01-01') + pd.to_timedelta(np.random.randint(0, 180 * 86400, n), unit='s'),
+        'stock': np.random.choice(['AAPL', 'NVDA', 'TSLA'], n),
+    })
+
+
+def scan(df, pattern, stock=None, start=None, end=None):
+    """Reference answer from a full boolean scan of the frame."""
+    mask = df['headline'].str.lower().str.contains(pattern, na=False)
+    if stock is not None:
+        mask &= df['stock'] == stock
+    if start is not None:
+        mask &= df['date'] >= start
+    if end is not None:
+        mask &= df['date'] < end
+    return list(np.flatnonzero(mask))
+
+
+class TestHeadlineIndex:
+    """Test queries against full scans and persistence."""
+
+    def test_phrase_stock_and_date_range(self, news_frame):
+        """Test a phrase query with stock and date filters."""
+        index = HeadlineIndex.build(news_frame)
+        result = index.search('price target', stock='NVDA', start='2020-03-01', end='2020-04-01')
+
+        expected = scan(news_frame, r'\bprice[\W_]+target\b', 'NVDA', '2020-03-01', '2020-04-01')
+        assert sorted(result.index) == expected
+        assert len(expected) > 0
+        assert result['date'].is_monotonic_increasing
+        assert (result['stock'] == 'NVDA').all()
+
+    def test_and_or_queries(self, news_frame):
+        """Test AND and OR combinations, with a date range but no stock."""
+        index = HeadlineIndex.build(news_frame)
+
+        rows = index.query(['earnings', 'target'], mode='and')
+        assert sorted(index.positions[rows]) == scan(news_frame, r'target.*earnings')
+
+        rows = index.query(['earnings', 'upgrade'], mode='or', start='2020-02-01', end='2020-03-01')
+        assert sorted(index.positions[rows]) == scan(news_frame, r'earnings|upgrade',
+                                                     start='2020-02-01', end='2020-03-01')
+        assert len(index.query('nonexistent')) == 0
+        with pytest.raises(ValueError):
+            index.query('earnings', mode='xor')
+
+    def test_save_and_load(self, news_frame, tmp_path):
+        """Test a saved index answers queries identically after loading."""
+        index = HeadlineIndex.build(news_frame)
+        path = tmp_path / 'headlines.npz'
+        index.save(path)
+        loaded = HeadlineIndex.load(path)
+
+        np.testing.assert_array_equal(loaded.postings, index.postings)
+        assert list(loaded.vocabulary) == list(index.vocabulary)
+        pd.testing.assert_frame_equal(loaded.search('price target', stock='AAPL'),
+                                      index.search('price target', stock='AAPL'))
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,132 @@
+"""
+Tests for bounded-memory heavy-hitter counting.
+"""
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.heavy_hitters import SpaceSaving, stream_keywords, word_cloud
+from src.keywords import FINANCIAL_STOPWORDS, count_keywords
+from src.phrases import PhraseMatcher
+from src.synthetic import make_news
+
+
+STOP_WORDS = frozenset({'the', 'and', 'for', 'its', 'not', 'are', 'after', 'new'}) | FINANCIAL_STOPWORDS
+
+
+@pytest.fixture
+def headlines():
+    """Synthetic headlines with many distinct keywords."""
+    return make_news(3_000, n_symbols=300, n_publishers=40, seed=7)['headline']
+
+
+@pytest.fixture
+def zipf_items():
+    """Skewed integer stream and its exact counts."""
+    items = np.random.default_rng(0).zipf(1.3, 20_000).tolist()
+    return items, Counter(items)
+
+
+def check_bounds(sketch, exact):
+    """Assert the Space-Saving guarantees against exact counts."""
+    assert len(sketch) <= sketch.capacity
+    assert sketch.total == sum(exact.values())
+    assert sketch.floor <= sketch.total / sketch.capacity
+    for item, count in sketch.counts.items():
+        error = sketch.errors.get(item, 0)
+        assert count - error <= exact[item] <= count
+        assert error <= sketch.floor
+    for item, count in exact.items():
+        if item not in sketch:
+            assert count <= sketch.floor
+
+
+class TestSpaceSaving:
+    """Test error bounds, merging and exact mode."""
+
+    def test_bounds_with_chunked_updates(self, zipf_items):
+        """Test counts stay within their error bounds when fed chunk by chunk."""
+        items, exact = zipf_items
+        sketch = SpaceSaving(capacity=50)
+        for start in range(0, len(items), 1_000):
+            sketch.update(Counter(items[start:start + 1_000]))
+        check_bounds(sketch, exact)
+        assert not sketch.is_exact
+        assert [item for item, _ in sketch.top(3)] == [item for item, _ in exact.most_common(3)]
+        true_top = {item for item, _ in exact.most_common(10)}
+        assert {item for item, _ in sketch.guaranteed_top(10)} <= true_top
+
+    def test_merge_partial_sketches(self, zipf_items):
+        """Test merged worker summaries keep the same guarantees."""
+        items, exact = zipf_items
+        parts = [SpaceSaving(capacity=50).update(items[start:start + 3_000])
+                 for start in range(0, len(items), 3_000)]
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+        check_bounds(merged, exact)
+
+        count, error = merged.estimate(-1)
+        assert count == error == merged.floor
+
+    def test_exact_mode(self, zipf_items):
+        """Test capacity=None reproduces Counter, including tie order."""
+        items, exact = zipf_items
+        left = SpaceSaving(None).update(items[:7_000])
+        sketch = left.merge(SpaceSaving(None).update(items[7_000:]))
+        assert sketch.is_exact and sketch.floor == 0
+        assert sketch.top() == exact.most_common()
+        assert sketch.frequencies(5) == dict(exact.most_common(5))
+
+        frame = sketch.to_frame(3)
+        assert frame['count'].tolist() == [count for _, count in exact.most_common(3)]
+        assert (frame['error'] == 0).all() and (frame['lower_bound'] == frame['count']).all()
+
+    def test_invalid_capacity(self):
+        """Test non-positive capacities are rejected."""
+        with pytest.raises(ValueError, match='capacity'):
+            SpaceSaving(0)
+
+
+class TestStreamKeywords:
+    """Test keyword sketches against exact keyword counts."""
+
+    def test_exact_matches_count_keywords(self, headlines):
+        """Test the exact sketch equals count_keywords."""
+        expected = count_keywords(headlines, stop_words=STOP_WORDS)
+        sketch = stream_keywords(headlines, capacity=None, stop_words=STOP_WORDS, chunksize=500)
+        assert sketch.top() == expected.most_common()
+
+    def test_bounded_from_generator(self, headlines):
+        """Test a bounded sketch over a generator finds the top keywords."""
+        expected = count_keywords(headlines, stop_words=STOP_WORDS)
+        sketch = stream_keywords((text for text in headlines), capacity=100, stop_words=STOP_WORDS,
+                                 chunksize=400)
+        check_bounds(sketch, expected)
+        assert sketch.top(5) == expected.most_common(5)
+
+    def test_parallel_merge(self, headlines):
+        """Test worker-process sketches merge to the serial result."""
+        serial = stream_keywords(headlines, capacity=100, stop_words=STOP_WORDS, chunksize=500)
+        parallel = stream_keywords(headlines, capacity=100, stop_words=STOP_WORDS, chunksize=500, n_jobs=2)
+        assert parallel.top() == serial.top()
+        assert parallel.floor == serial.floor
+
+    def test_phrase_counts_from_generator(self, headlines):
+        """Test phrase counts accumulate per chunk over an iterator."""
+        matcher = PhraseMatcher()
+        streamed = matcher.counts(iter(headlines.tolist()), chunksize=250)
+        pd.testing.assert_series_equal(streamed, matcher.counts(headlines))
+
+    def test_word_cloud(self, headlines):
+        """Test the word cloud is drawn from the sketch frequencies."""
+        pytest.importorskip('wordcloud')
+        sketch = stream_keywords(headlines, capacity=200, stop_words=STOP_WORDS)
+        cloud = word_cloud(sketch.frequencies(50), width=200, height=100)
+        assert 0 < len(cloud.words_) <= 50
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
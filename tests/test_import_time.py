@@ -0,0 +1,70 @@
+"""
+Tests for lazy imports, the bundled stop words and the import-time report.
+"""
+import pytest
+
+import src
+from scripts.import_time import heavy_imports, main, measure_import, package_times, parse_importtime
+from src.keywords import ENGLISH_STOPWORDS, FINANCIAL_STOPWORDS, count_keywords, default_stop_words
+
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:       300 |       2300 |   scipy.sparse
+import time:      1000 |       5000 | src.phrases
+import time:        50 |         50 | json
+"""
+
+
+class TestImportReport:
+    """Test parsing and measuring ``-X importtime`` output."""
+
+    def test_parse_importtime(self):
+        """Test module names, seconds and nesting depth are parsed."""
+        timings = parse_importtime(IMPORTTIME_OUTPUT)
+        assert timings['module'].tolist() == ['_io', 'scipy.sparse', 'src.phrases', 'json']
+        assert timings['depth'].tolist() == [3, 2, 1, 1]
+        assert timings['cumulative_s'].tolist() == [0.00012, 0.0023, 0.005, 0.00005]
+        assert heavy_imports(timings) == ['scipy']
+        assert package_times(timings).index[0] == 'src'
+
+    def test_text_and_price_modules_skip_heavy_imports(self):
+        """Test importing analysis modules does not load SciPy or NLTK."""
+        for module in ('src.keywords', 'src.panel', 'src.correlation'):
+            seconds, timings = measure_import(module, repeat=1)
+            assert seconds > 0
+            assert heavy_imports(timings) == [], module
+            assert module in set(timings['module'])
+
+    def test_budget_exit_status(self, capsys):
+        """Test the CLI fails only when a module is over budget."""
+        assert main(['src', '--repeat', '1', '--budget', '60']) == 0
+        assert main(['src.keywords', '--repeat', '1', '--budget', '0.000001']) == 1
+        assert 'FAIL src.keywords' in capsys.readouterr().out
+
+
+class TestLazyPackage:
+    """Test PEP 562 package attributes and the bundled stop words."""
+
+    def test_lazy_attributes(self):
+        """Test entry points resolve to their modules and unknown names fail."""
+        from src.keywords import count_keywords as direct
+
+        assert src.count_keywords is direct
+        assert 'window_metrics' in dir(src)
+        with pytest.raises(AttributeError, match='no_such_name'):
+            src.no_such_name
+
+    def test_bundled_stop_words(self):
+        """Test the default stop words need no NLTK corpus."""
+        stop_words = default_stop_words()
+        assert len(ENGLISH_STOPWORDS) == 179
+        assert {'the', 'and', 'because', 'stock'} <= stop_words
+        assert FINANCIAL_STOPWORDS <= stop_words
+        counts = count_keywords(['The stock and the earnings beat, because of Apple'])
+        assert counts == {'earnings': 1, 'beat': 1, 'apple': 1}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
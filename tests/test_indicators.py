@@ -0,0 +1,134 @@
+"""
+Tests for the fused indicator engine.
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.indicators import (
+    IndicatorSpec,
+    add_indicators,
+    compute_indicators,
+    ema,
+    rolling_mean,
+)
+
+
+@pytest.fixture
+def long_stock_data():
+    """Create 400 days of OHLCV data so SMA_200 has values."""
+    np.random.seed(7)
+    n = 400
+    close = 100 + np.cumsum(np.random.randn(n) * 2)
+    df = pd.DataFrame({
+        'Open': close + np.random.randn(n),
+        'High': close + np.random.rand(n) * 5,
+        'Low': close - np.random.rand(n) * 5,
+        'Close': close,
+        'Volume': np.random.randint(1000000, 10000000, n),
+    }, index=pd.date_range('2020-01-01', periods=n, freq='D'))
+    return df
+
+
+def pandas_indicators(df):
+    """Pandas fallbacks from task2_quantitative_analysis.ipynb."""
+    df = df.copy()
+    df['SMA_20'] = df['Close'].rolling(window=20).mean()
+    df['SMA_50'] = df['Close'].rolling(window=50).mean()
+    df['SMA_200'] = df['Close'].rolling(window=200).mean()
+    df['EMA_12'] = df['Close'].ewm(span=12, adjust=False).mean()
+    df['EMA_26'] = df['Close'].ewm(span=26, adjust=False).mean()
+
+    delta = df['Close'].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    rs = gain / loss
+    df['RSI'] = 100 - (100 / (1 + rs))
+
+    ema_12 = df['Close'].ewm(span=12, adjust=False).mean()
+    ema_26 = df['Close'].ewm(span=26, adjust=False).mean()
+    df['MACD'] = ema_12 - ema_26
+    df['MACD_signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
+    df['MACD_histogram'] = df['MACD'] - df['MACD_signal']
+
+    df['BB_middle'] = df['Close'].rolling(window=20).mean()
+    std = df['Close'].rolling(window=20).std()
+    df['BB_upper'] = df['BB_middle'] + (std * 2)
+    df['BB_lower'] = df['BB_middle'] - (std * 2)
+
+    tr1 = df['High'] - df['Low']
+    tr2 = abs(df['High'] - df['Close'].shift())
+    tr3 = abs(df['Low'] - df['Close'].shift())
+    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    df['ATR'] = tr.rolling(window=14).mean()
+    return df
+
+
+class TestIndicatorEngine:
+    """Test compute_indicators against the notebook's pandas fallbacks."""
+
+    def test_matches_pandas_fallbacks(self, long_stock_data):
+        """Test every shared column agrees with the pandas calculation."""
+        expected = pandas_indicators(long_stock_data)
+        result = add_indicators(long_stock_data)
+
+        for column in expected.columns.difference(long_stock_data.columns):
+            np.testing.assert_allclose(result[column], expected[column], rtol=1e-10, atol=1e-10,
+                                       err_msg=column)
+
+    def test_block_layout(self, long_stock_data):
+        """Test columns and block shape for the default specs."""
+        columns, block = compute_indicators(long_stock_data)
+        assert block.shape == (len(long_stock_data), len(columns))
+        assert block.dtype == np.float64
+        assert columns[:5] == ['SMA_20', 'SMA_50', 'SMA_200', 'EMA_12', 'EMA_26']
+        assert np.array_equal(block[:, columns.index('SMA_20')],
+                              block[:, columns.index('BB_middle')], equal_nan=True)
+
+    def test_stochastic_range(self, long_stock_data):
+        """Test Stochastic %K and %D stay within 0-100."""
+        result = add_indicators(long_stock_data, [IndicatorSpec('stochastic')])
+        valid = result[['Stoch_K', 'Stoch_D']].dropna()
+        assert len(valid) > 0
+        assert ((valid >= 0) & (valid <= 100)).all().all()
+
+    def test_duplicate_columns_rejected(self, long_stock_data):
+        """Test specs that would overwrite each other raise ValueError."""
+        with pytest.raises(ValueError):
+            compute_indicators(long_stock_data, [IndicatorSpec('rsi', window=14),
+                                                 IndicatorSpec('rsi', window=7)])
+
+    def test_two_dimensional_input(self, long_stock_data):
+        """Test a (dates x symbols) panel gives the same result per column."""
+        close = long_stock_data['Close'].to_numpy()
+        panel = {'Close': np.column_stack([close, close * 2])}
+        columns, block = compute_indicators(panel, [IndicatorSpec('sma', window=20),
+                                                    IndicatorSpec('macd')])
+        single_columns, single = compute_indicators({'Close': close}, [IndicatorSpec('sma', window=20),
+                                                                       IndicatorSpec('macd')])
+        assert block.shape == (len(close), 2, len(columns))
+        np.testing.assert_allclose(block[:, 0, :], single, rtol=1e-12)
+
+
+class TestPrimitives:
+    """Test NaN handling of the shared primitives."""
+
+    def test_rolling_mean_with_gaps(self):
+        """Test windows containing NaN produce NaN like pandas."""
+        values = np.random.RandomState(0).randn(60, 3).cumsum(axis=0)
+        values[10, 1] = np.nan
+        values[:25, 2] = np.nan
+        expected = pd.DataFrame(values).rolling(window=5).mean().to_numpy()
+        np.testing.assert_allclose(rolling_mean(values, 5), expected, rtol=1e-10, atol=1e-12)
+
+    def test_ema_with_leading_and_interior_gaps(self):
+        """Test EMA matches ewm(adjust=False) with missing values."""
+        values = np.random.RandomState(1).randn(80, 3).cumsum(axis=0) + 50
+        values[:12, 1] = np.nan
+        values[40, 2] = np.nan
+        expected = pd.DataFrame(values).ewm(span=12, adjust=False).mean().to_numpy()
+        np.testing.assert_allclose(ema(values, 12), expected, rtol=1e-12)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,122 @@
+"""
+Tests for batched keyword extraction.
+"""
+from collections import Counter
+
+import pytest
+import pandas as pd
+from nltk.tokenize import NLTKWordTokenizer, sent_tokenize, word_tokenize
+from nltk.tokenize.punkt import PunktSentenceTokenizer
+
+from src.keywords import FINANCIAL_STOPWORDS, count_keywords, extract_keywords, tokenize_lines, top_keywords
+
+
+STOP_WORDS = frozenset({'the', 'and', 'for', 'its', 'not', 'are'}) | FINANCIAL_STOPWORDS
+
+HEADLINES = [
+    "Apple's Q3 Earnings Beat Estimates; Shares Rise 5%",
+    'Tesla stock falls after Musk says production "cannot" keep up',
+    'Analysts upgrade NVDA, raise price target to $500.',
+    "Why Amazon Isn't Worried About Competition...",
+    '(NASDAQ:MSFT) Microsoft and Google: Who Wins The AI Race?',
+    'Fed holds rates steady -- markets rally',
+    'Stocks Moving In Thursday\'s Pre-Market Session',
+    "Benzinga's Top Upgrades, Downgrades For March 3, 2020",
+    'J.P. Morgan says “buy” the dip in Inc. stocks.',
+    "They'll gonna wanna see 'em rally",
+    None,
+    'Earnings Scheduled For April 25, 2020',
+]
+
+MULTI_SENTENCE = [
+    'Apple beats estimates. Shares rise after hours',
+    'U.S. stocks close higher. Dow gains 200 points',
+    'Acme Inc. to acquire Widget Corp. for $2.5B. Deal expected to close in Q4',
+    'Why is Tesla down? Analysts weigh in! More at 11.',
+    'J.P. Morgan cuts target... Is the rally over?',
+    'Fed minutes (released Wed.) show split. Markets shrug',
+]
+
+
+def punkt_sentences(text):
+    """Sentences as split by word_tokenize, or untrained Punkt without the NLTK data."""
+    try:
+        return sent_tokenize(text)
+    except LookupError:
+        return PunktSentenceTokenizer().tokenize(text)
+
+
+def notebook_keywords(headlines, stop_words):
+    """Keyword counts as computed by the EDA notebook (per-headline loop)."""
+    tokenizer = NLTKWordTokenizer()
+    all_keywords = []
+    for text in headlines:
+        if pd.isna(text):
+            continue
+        tokens = [token for sentence in punkt_sentences(text.lower()) for token in tokenizer.tokenize(sentence)]
+        all_keywords.extend(token for token in tokens
+                            if token.isalpha() and len(token) > 2 and token not in stop_words)
+    return Counter(all_keywords)
+
+
+class TestKeywordExtraction:
+    """Test agreement with the notebook's word_tokenize-based extraction."""
+
+    def test_tokens_match_treebank_tokenizer(self):
+        """Test each line tokenizes exactly like NLTKWordTokenizer."""
+        lines = [h.lower() for h in HEADLINES if h is not None]
+        tokenized = tokenize_lines('\n'.join(lines)).split('\n')
+
+        tokenizer = NLTKWordTokenizer()
+        assert len(tokenized) == len(lines)
+        for line, result in zip(lines, tokenized):
+            assert result.split() == tokenizer.tokenize(line)
+
+    def test_counts_match_notebook(self):
+        """Test counts and top keywords equal the per-headline loop."""
+        headlines = pd.Series(HEADLINES * 7)
+        expected = notebook_keywords(headlines, STOP_WORDS)
+
+        counts = count_keywords(headlines, stop_words=STOP_WORDS, chunksize=5)
+        assert counts == expected
+        assert top_keywords(headlines, n=10, stop_words=STOP_WORDS) == expected.most_common(10)
+        assert 'stock' not in counts and "n't" not in counts
+
+    def test_multi_sentence_headlines(self):
+        """Test periods inside a headline end sentences as in word_tokenize."""
+        headlines = pd.Series(MULTI_SENTENCE + HEADLINES)
+        counts = count_keywords(headlines, stop_words=STOP_WORDS, chunksize=4)
+        assert counts == notebook_keywords(headlines, STOP_WORDS)
+        assert count_keywords(MULTI_SENTENCE, stop_words=STOP_WORDS)['estimates'] == 1
+        assert extract_keywords(MULTI_SENTENCE[0], STOP_WORDS) == \
+            ['apple', 'beats', 'estimates', 'shares', 'rise', 'after', 'hours']
+
+    def test_matches_word_tokenize(self):
+        """Test keywords equal word_tokenize's when the Punkt model is installed."""
+        try:
+            word_tokenize('Punkt. Installed')
+        except LookupError:
+            pytest.skip('NLTK punkt_tab data is not installed')
+        for text in MULTI_SENTENCE + [h for h in HEADLINES if h is not None]:
+            expected = [token for token in word_tokenize(text.lower())
+                        if token.isalpha() and len(token) > 2 and token not in STOP_WORDS]
+            assert extract_keywords(text, STOP_WORDS) == expected, text
+
+    def test_parallel_merge(self):
+        """Test chunks counted in worker processes merge to the same result."""
+        headlines = HEADLINES * 5
+        serial = count_keywords(headlines, stop_words=STOP_WORDS, chunksize=4)
+        parallel = count_keywords(headlines, stop_words=STOP_WORDS, chunksize=4, n_jobs=2)
+        assert parallel == serial
+        assert parallel.most_common() == serial.most_common()
+
+    def test_single_headline(self):
+        """Test the per-headline helper and missing values."""
+        assert extract_keywords("Apple's earnings beat estimates.", STOP_WORDS) == \
+            ['apple', 'earnings', 'beat', 'estimates']
+        assert extract_keywords(None, STOP_WORDS) == []
+        assert count_keywords([None, float('nan')], stop_words=STOP_WORDS) == Counter()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,99 @@
+"""
+Tests for multi-window financial metrics.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.metrics import DEFAULT_WINDOWS, METRIC_COLUMNS, window_metrics
+from src.panel import PricePanel
+from src.synthetic import make_stock_frames
+
+
+def reference_metrics(df, window):
+    """One symbol and window computed the notebook's way with pandas."""
+    df = df.dropna(subset=['Close'])
+    if window is not None:
+        df = df.iloc[-window:]
+    close = df['Close']
+    returns = close.pct_change()
+    drawdown = close / close.expanding().max() - 1
+
+    trough = int(np.argmin(drawdown.to_numpy()))
+    peak = int(np.argmax(close.to_numpy()[:trough + 1]))
+    later = np.flatnonzero(close.to_numpy()[trough + 1:] >= close.iloc[peak])
+    recovery = trough + 1 + later[0] if len(later) else None
+    flat = drawdown.min() == 0
+    return {
+        'Total_Return': ((1 + returns).cumprod() - 1).iloc[-1] * 100,
+        'Annualized_Return': ((close.iloc[-1] / close.iloc[0]) ** (252 / len(df)) - 1) * 100,
+        'Volatility': returns.std() * np.sqrt(252) * 100,
+        'Max_Drawdown': drawdown.min() * 100,
+        'Drawdown_Days': 0 if flat else (recovery if recovery is not None else len(df) - 1) - peak,
+        'Recovery_Days': 0 if flat else (recovery - trough if recovery is not None else np.nan),
+        'High': df['High'].max(),
+        'Low': df['Low'].min(),
+        'Avg_Volume': df['Volume'].mean(),
+        'Current_Price': close.iloc[-1],
+    }
+
+
+@pytest.fixture
+def frames():
+    """Price frames with different history lengths and an interior gap."""
+    frames = make_stock_frames(5, n_days=800, seed=3)
+    frames['B'] = frames['B'].iloc[100:]
+    frames['C'] = frames['C'].iloc[:-50].drop(frames['C'].index[200:260])
+    frames['D'] = frames['D'].iloc[-40:]
+    return frames
+
+
+class TestWindowMetrics:
+    """Test agreement with per-symbol, per-window pandas calculations."""
+
+    def test_matches_reference(self, frames):
+        """Test every metric of every symbol and window against pandas."""
+        metrics = window_metrics(PricePanel.from_frames(frames))
+        assert list(metrics.columns) == METRIC_COLUMNS
+        assert metrics.index.tolist() == [(symbol, window) for symbol in frames for window in DEFAULT_WINDOWS]
+
+        for symbol, df in frames.items():
+            for window, length in DEFAULT_WINDOWS.items():
+                row = metrics.loc[(symbol, window)]
+                if length is not None and length > len(df):
+                    assert row[METRIC_COLUMNS[1:]].isna().all()
+                    assert row['Observations'] == len(df)
+                    continue
+                for column, expected in reference_metrics(df, length).items():
+                    assert row[column] == pytest.approx(expected, rel=1e-9, nan_ok=True), (symbol, window, column)
+
+    def test_sharpe_and_full_history(self, frames):
+        """Test the full-history window and Sharpe ratio definition."""
+        metrics = window_metrics(PricePanel.from_frames(frames)).xs('all', level='Window')
+        assert metrics.loc['D', 'Observations'] == 40
+        np.testing.assert_allclose(metrics['Sharpe_Ratio'], metrics['Annualized_Return'] / metrics['Volatility'])
+
+    def test_drawdown_duration_and_recovery(self):
+        """Test peak-to-recovery and trough-to-recovery days on a known path."""
+        close = pd.DataFrame({
+            'X': [100, 110, 99, 88, 95, 111, 120],
+            'Y': [100, 101, 102, 103, 104, 105, 106],
+            'Z': [100, 90, 80, 85, 82, 81, 84],
+        }, dtype=float)
+        metrics = window_metrics(close, windows={'all': None}).xs('all', level='Window')
+        assert metrics.loc['X', 'Max_Drawdown'] == pytest.approx(-20.0)
+        assert metrics.loc['X', ['Drawdown_Days', 'Recovery_Days']].tolist() == [4, 2]
+        assert metrics.loc['Y', ['Max_Drawdown', 'Drawdown_Days', 'Recovery_Days']].tolist() == [0, 0, 0]
+        assert metrics.loc['Z', 'Drawdown_Days'] == 6 and np.isnan(metrics.loc['Z', 'Recovery_Days'])
+        assert np.isnan(metrics.loc['Z', 'Avg_Volume'])
+
+    def test_window_drawdowns_restart_at_window_start(self):
+        """Test a drawdown before the window does not count inside it."""
+        close = pd.DataFrame({'X': [100.0, 50.0, 60.0, 55.0, 70.0]})
+        metrics = window_metrics(close, windows={'3': 3, 'all': None})['Max_Drawdown']
+        assert metrics[('X', 'all')] == pytest.approx(-50.0)
+        assert metrics[('X', '3')] == pytest.approx((55 / 60 - 1) * 100)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
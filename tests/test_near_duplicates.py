@@ -0,0 +1,91 @@
+"""
+Tests for MinHash/LSH near-duplicate headline clustering.
+"""
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.near_duplicates import NearDuplicateClusters, shingle_hashes
+from src.synthetic import make_news
+
+
+HEADLINES = pd.Series([
+    'Stocks That Hit 52-Week Highs On Friday',
+    'Stocks That Hit 52-Week Highs On Thursday',
+    None,
+    'Apple Beats Earnings Estimates',
+    'Tesla Recalls 10,000 Cars Over Faulty Brakes',
+    'apple beats earnings estimates!',
+    'Stocks That Hit 52-Week Highs On Friday',
+    'Apple Beats Earnings Estimates',
+], index=range(10, 18))
+
+
+def brute_force_labels(headlines, threshold):
+    """Cluster ids from comparing every pair of distinct texts."""
+    texts = list(pd.unique(headlines))
+    shingles = [shingle_hashes(text) for text in texts]
+    parent = list(range(len(texts)))
+
+    def find(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+
+    for i, j in itertools.combinations(range(len(texts)), 2):
+        if len(shingles[i] & shingles[j]) / len(shingles[i] | shingles[j]) >= threshold:
+            parent[find(j)] = find(i)
+    roots = [find(i) for i in range(len(texts))]
+    return pd.factorize(np.asarray(roots)[pd.Index(texts).get_indexer(headlines)])[0]
+
+
+class TestNearDuplicateClusters:
+    """Test cluster assignment, representatives and agreement with pairwise comparison."""
+
+    def test_syndicated_variants(self):
+        """Test day variants and case/punctuation variants share a cluster."""
+        clusters = NearDuplicateClusters.from_headlines(HEADLINES)
+        assert clusters.labels.tolist() == [0, 0, -1, 1, 2, 1, 0, 1]
+        assert clusters.labels.index.equals(HEADLINES.index)
+        assert clusters.sizes.tolist() == [3, 3, 1]
+        assert clusters.representatives.tolist() == [
+            'Stocks That Hit 52-Week Highs On Friday', 'Apple Beats Earnings Estimates',
+            'Tesla Recalls 10,000 Cars Over Faulty Brakes']
+
+    def test_representatives_and_first_rows(self):
+        """Test per-row representatives, first-in-cluster mask and summary."""
+        clusters = NearDuplicateClusters.from_headlines(HEADLINES)
+        representative = clusters.representative_headlines()
+        assert representative[11] == 'Stocks That Hit 52-Week Highs On Friday'
+        assert pd.isna(representative[12])
+        assert clusters.first_in_cluster().tolist() == [True, False, False, True, True, False, False, False]
+        assert clusters.summary(1)['representative'].tolist() == ['Stocks That Hit 52-Week Highs On Friday']
+
+    def test_matches_pairwise_comparison(self):
+        """Test LSH clusters equal connected components of all similar pairs."""
+        headlines = make_news(600, n_symbols=30, n_publishers=10, seed=4)['headline']
+        clusters = NearDuplicateClusters.from_headlines(headlines, threshold=0.7)
+        np.testing.assert_array_equal(clusters.labels.to_numpy(), brute_force_labels(headlines, 0.7))
+
+    def test_parallel_chunks(self):
+        """Test hashing in worker processes gives the serial clusters."""
+        headlines = make_news(2_000, n_symbols=50, n_publishers=10, seed=5)['headline']
+        serial = NearDuplicateClusters.from_headlines(headlines, chunksize=300)
+        parallel = NearDuplicateClusters.from_headlines(headlines, chunksize=300, n_jobs=2)
+        pd.testing.assert_series_equal(parallel.labels, serial.labels)
+        pd.testing.assert_series_equal(parallel.representatives, serial.representatives)
+
+    def test_edge_cases(self):
+        """Test empty input, texts without words and invalid banding."""
+        empty = NearDuplicateClusters.from_headlines([])
+        assert len(empty) == 0 and empty.labels.empty
+        clusters = NearDuplicateClusters.from_headlines(['!!!', '???', '!!!'])
+        assert clusters.labels.tolist() == [0, 1, 0]
+        with pytest.raises(ValueError, match='multiple of bands'):
+            NearDuplicateClusters.from_headlines(HEADLINES, num_perm=30, bands=16)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,132 @@
+"""
+Tests for the chunked news loader and its columnar cache.
+"""
+import os
+
+import pytest
+import pandas as pd
+
+from src.news_loader import (
+    is_cache_valid,
+    iter_news_chunks,
+    load_news,
+    news_cache_path,
+)
+
+
+@pytest.fixture
+def news_csv(tmp_path):
+    """Write a small raw_analyst_ratings-style CSV to disk."""
+    df = pd.DataFrame({
+        'Unnamed: 0': range(6),
+        'headline': ['Apple Reports Strong Earnings', 'Price Target Raised', None,
+                     'FDA Approval for New Drug', 'Stocks That Hit 52-Week Highs', 'Café earnings'],
+        'url': [f'https://example.com/article{i}' for i in range(6)],
+        'publisher': ['Publisher B', 'Publisher A', 'Publisher B', None, 'Publisher C', 'Publisher A'],
+        'date': ['2020-06-05 10:30:54-04:00', '2020-06-05 00:00:00', '2020-06-06 09:00:00-04:00',
+                 'not a date', '2020-06-08 00:00:00', '2020-06-09 16:15:00-04:00'],
+        'stock': ['AAPL', 'MSFT', 'AAPL', 'GOOG', 'MSFT', 'AAPL'],
+    })
+    path = tmp_path / 'raw_analyst_ratings.csv'
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def reference_load(path):
+    """Preprocessing as done in task1_eda.ipynb."""
+    df = pd.read_csv(path)
+    df = df.drop('Unnamed: 0', axis=1)
+    df['date'] = pd.to_datetime(df['date'], format='mixed', errors='coerce', utc=True)
+    df = df.dropna(subset=['date'])
+    df['date'] = df['date'].dt.tz_localize(None)
+    return df.reset_index(drop=True)
+
+
+class TestNewsCache:
+    """Test building and reading the columnar news cache."""
+
+    @pytest.mark.parametrize('string_storage', ['python', 'pyarrow'])
+    def test_cache_matches_reference(self, news_csv, string_storage):
+        """Test cached load matches the notebook preprocessing."""
+        if string_storage == 'pyarrow':
+            pytest.importorskip('pyarrow')
+        expected = reference_load(news_csv)
+        df = load_news(news_csv, chunksize=2, string_storage=string_storage)
+
+        assert 'Unnamed: 0' not in df.columns
+        assert df['date'].dtype == 'datetime64[ns]'
+        assert isinstance(df['publisher'].dtype, pd.CategoricalDtype)
+        assert isinstance(df['stock'].dtype, pd.CategoricalDtype)
+        assert (df['date'] == expected['date']).all()
+        assert df['stock'].astype(object).tolist() == expected['stock'].tolist()
+        assert df['headline'].isna().tolist() == expected['headline'].isna().tolist()
+        assert df['headline'].dropna().tolist() == expected['headline'].dropna().tolist()
+        assert df['publisher'].isna().sum() == expected['publisher'].isna().sum()
+
+    def test_categories_are_sorted(self, news_csv):
+        """Test categories are sorted across chunks like astype('category')."""
+        df = load_news(news_csv, chunksize=1)
+        assert list(df['publisher'].cat.categories) == ['Publisher A', 'Publisher B', 'Publisher C']
+
+    def test_cache_invalidated_on_change(self, news_csv):
+        """Test the cache is rebuilt when the source file changes."""
+        load_news(news_csv)
+        cache_path = news_cache_path(news_csv)
+        assert is_cache_valid(news_csv, cache_path)
+
+        with open(news_csv, 'a', encoding='utf-8') as f:
+            f.write('6,New headline,https://example.com/x,Publisher D,2020-06-10 00:00:00,NVDA\n')
+        os.utime(news_csv, ns=(0, os.stat(news_csv).st_mtime_ns + 1_000_000))
+        assert not is_cache_valid(news_csv, cache_path)
+
+        df = load_news(news_csv)
+        assert df['stock'].iloc[-1] == 'NVDA'
+        assert is_cache_valid(news_csv, cache_path)
+
+    def test_dtypes_match_uncached_load(self, tmp_path):
+        """Test cached columns keep the source dtypes whatever the first chunk holds."""
+        df = pd.DataFrame({
+            'headline': [None, None, 'Upgrade', 'Downgrade', 'Beat', 'Miss'],
+            'date': ['2020-06-05 10:00:00'] * 6,
+            'stock': ['AAPL'] * 6,
+            'count': [1, 2, 3, 4, 5, 6],
+            'score': [1, 2, 3, None, 5, 6],
+            'label': [1, 2, 'x', 'y', 'z', 'w'],
+        })
+        path = str(tmp_path / 'news.csv')
+        df.to_csv(path, index=False)
+        with pytest.raises(ValueError, match='label'):
+            load_news(path, chunksize=2)
+
+        dtype = {'label': str}
+        cached = load_news(path, chunksize=2, string_storage='python', dtype=dtype)
+        uncached = load_news(path, chunksize=2, use_cache=False, dtype=dtype)
+        assert cached['count'].dtype == uncached['count'].dtype == 'int64'
+        assert cached['score'].dtype == uncached['score'].dtype == 'float64'
+        assert cached['count'].tolist() == uncached['count'].tolist()
+        assert cached['score'].isna().tolist() == uncached['score'].isna().tolist()
+        assert cached['headline'].tolist()[2:] == ['Upgrade', 'Downgrade', 'Beat', 'Miss']
+        assert cached['label'].tolist() == uncached['label'].tolist() == ['1', '2', 'x', 'y', 'z', 'w']
+
+    def test_load_without_cache(self, news_csv, tmp_path):
+        """Test use_cache=False does not write a cache directory."""
+        df = load_news(news_csv, use_cache=False)
+        assert len(df) == 5
+        assert not os.path.exists(news_cache_path(news_csv))
+
+
+class TestNewsChunks:
+    """Test chunked iteration over the news CSV."""
+
+    def test_iter_chunks(self, news_csv):
+        """Test chunks are normalized and cover every valid row."""
+        chunks = list(iter_news_chunks(news_csv, chunksize=4))
+        assert len(chunks) == 2
+        assert sum(len(chunk) for chunk in chunks) == 5
+        for chunk in chunks:
+            assert 'Unnamed: 0' not in chunk.columns
+            assert chunk['date'].dtype == 'datetime64[ns]'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,97 @@
+"""
+Tests for the multi-symbol price panel.
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.indicators import IndicatorSpec, add_indicators
+from src.panel import PricePanel
+
+
+@pytest.fixture
+def stock_frames():
+    """Create per-symbol frames with different histories and a missing day."""
+    np.random.seed(0)
+    calendar = pd.bdate_range('2020-01-01', periods=120)
+    frames = {}
+    for k, symbol in enumerate(['AAPL', 'META', 'NVDA']):
+        dates = calendar[k * 20:]
+        close = 100 + np.cumsum(np.random.randn(len(dates)))
+        frames[symbol] = pd.DataFrame({
+            'Open': close + 0.5,
+            'High': close + 1,
+            'Low': close - 1,
+            'Close': close,
+            'Volume': np.random.randint(1000000, 10000000, len(dates)),
+        }, index=pd.DatetimeIndex(dates, name='Date'))
+    frames['NVDA'] = frames['NVDA'].drop(frames['NVDA'].index[30])
+    return frames
+
+
+class TestPricePanel:
+    """Test PricePanel construction and vectorized calculations."""
+
+    def test_alignment_and_masking(self, stock_frames):
+        """Test the calendar is the union of dates and gaps are NaN."""
+        panel = PricePanel.from_frames(stock_frames)
+
+        assert panel.shape == (120, 3, 5)
+        assert list(panel.symbols) == ['AAPL', 'META', 'NVDA']
+        assert panel.mask[:, 0].all()
+        assert not panel.mask[:20, 1].any()
+        assert panel.mask.sum(axis=0).tolist() == [120, 100, 79]
+        pd.testing.assert_frame_equal(panel.to_frame('NVDA'), stock_frames['NVDA'].astype(float),
+                                      check_freq=False)
+
+    def test_returns_match_per_symbol_pandas(self, stock_frames):
+        """Test daily and cumulative returns match the notebook's per-symbol code."""
+        panel = PricePanel.from_frames(stock_frames)
+        returns = panel.field_frame(panel.daily_returns())
+        cumulative = panel.field_frame(panel.cumulative_returns())
+
+        for symbol, df in stock_frames.items():
+            daily = df['Close'].pct_change()
+            np.testing.assert_allclose(returns.loc[df.index, symbol], daily, rtol=1e-12)
+            np.testing.assert_allclose(cumulative.loc[df.index, symbol],
+                                       (1 + daily).cumprod() - 1, rtol=1e-12)
+        assert returns['NVDA'].isna().sum() == 120 - 79 + 1
+
+    def test_indicators_for_all_symbols(self, stock_frames):
+        """Test panel indicators equal per-symbol engine output, gaps included."""
+        specs = [IndicatorSpec('sma', window=20), IndicatorSpec('macd'), IndicatorSpec('rsi'),
+                 IndicatorSpec('bollinger'), IndicatorSpec('atr'), IndicatorSpec('stochastic')]
+        panel = PricePanel.from_frames(stock_frames).with_indicators(specs)
+        columns = [column for spec in specs for column in spec.columns()]
+
+        for symbol in ['META', 'NVDA']:
+            expected = add_indicators(stock_frames[symbol], specs)
+            result = panel.to_frame(symbol)
+            for column in columns:
+                np.testing.assert_allclose(result[column], expected[column], rtol=1e-10, err_msg=column)
+
+    def test_volatility_skips_missing_days(self, stock_frames):
+        """Test rolling volatility runs over each symbol's own trading days."""
+        panel = PricePanel.from_frames(stock_frames)
+        volatility = panel.field_frame(panel.volatility(window=10))
+        for symbol, df in stock_frames.items():
+            expected = df['Close'].pct_change().rolling(10).std() * np.sqrt(252)
+            np.testing.assert_allclose(volatility.loc[df.index, symbol], expected, rtol=1e-10)
+        assert volatility['NVDA'].notna().sum() == 79 - 10
+
+    def test_from_long(self):
+        """Test building a panel from a long (date, symbol) table."""
+        df = pd.DataFrame({
+            'Date': ['2020-01-02', '2020-01-01', '2020-01-01'],
+            'Symbol': ['MSFT', 'MSFT', 'GOOG'],
+            'Close': [11.0, 10.0, 20.0],
+        })
+        panel = PricePanel.from_long(df)
+        assert list(panel.symbols) == ['GOOG', 'MSFT']
+        assert panel['Close'][0].tolist() == [20.0, 10.0]
+        assert np.isnan(panel['Close'][1, 0])
+        assert panel.daily_returns()[1, 1] == pytest.approx(0.1)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
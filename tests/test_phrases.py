@@ -0,0 +1,69 @@
+"""
+Tests for the single-pass phrase matcher.
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.phrases import SIGNIFICANT_PHRASES, PhraseMatcher, count_phrases
+
+
+HEADLINES = pd.Series([
+    'FDA Approval for new drug',
+    'Price target raised to $200; analyst upgrade',
+    'Earnings report exceeds expectations',
+    '52-week high reached today',
+    None,
+    'Stock split: 52-week low, then 52-WEEK HIGH',
+    'Analysts see pricetarget cut after downgrade',
+    'Bullish or bearish? Ratings, ratings, ratings',
+])
+
+
+class TestPhraseMatcher:
+    """Test agreement with per-phrase str.contains scans."""
+
+    def test_significant_phrases_detection(self):
+        """Test the expectations of the notebook-style phrase test."""
+        headlines = [
+            "FDA approval for new drug",
+            "Price target raised to $200",
+            "Earnings report exceeds expectations",
+            "52-week high reached today"
+        ]
+        counts = count_phrases(headlines, ['fda approval', 'price target', 'earnings', '52-week high'])
+
+        assert counts['fda approval'] == 1
+        assert counts['price target'] == 1
+        assert counts['earnings'] == 1
+        assert counts['52-week high'] == 1
+
+    def test_counts_match_str_contains(self):
+        """Test counts equal str.contains for overlapping and nested phrases."""
+        phrases = list(SIGNIFICANT_PHRASES) + ['price', 'target', 'ratings', 'week', 'a']
+        counts = count_phrases(HEADLINES, phrases, chunksize=3)
+
+        expected = [HEADLINES.str.lower().str.contains(p, na=False).sum() for p in phrases]
+        assert counts.tolist() == expected
+        assert list(counts.index) == phrases
+
+    def test_hit_matrix(self):
+        """Test the sparse hit matrix rows, columns and totals."""
+        matcher = PhraseMatcher(['52-week high', '52-week', 'upgrade'])
+        hits = matcher.hit_matrix(HEADLINES)
+
+        assert hits.shape == (len(HEADLINES), 3)
+        assert hits[5].toarray().tolist() == [[True, True, False]]
+        assert hits[4].nnz == 0
+        np.testing.assert_array_equal(np.asarray(hits.sum(axis=0)).ravel(),
+                                      matcher.counts(HEADLINES).to_numpy())
+
+    def test_invalid_phrases(self):
+        """Test empty phrases are rejected and duplicates collapsed."""
+        with pytest.raises(ValueError):
+            PhraseMatcher(['ipo', ''])
+        assert len(PhraseMatcher(['ipo', 'ipo', 'merger'])) == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
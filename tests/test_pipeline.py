@@ -0,0 +1,115 @@
+"""
+Tests for the incremental pipeline runner.
+"""
+import importlib
+import os
+
+import pytest
+import pandas as pd
+
+from scripts.pipeline import Pipeline, build_pipeline, load_output, main
+from src.synthetic import make_news, make_stock_frames
+
+
+def word_scorer(text):
+    """Deterministic stand-in for TextBlob: +1 for 'Beat'/'Upgrades', -1 for 'Miss'/'Lowers'."""
+    polarity = sum(text.count(word) for word in ('Beat', 'Upgrades')) - \
+        sum(text.count(word) for word in ('Miss', 'Lowers'))
+    return float(polarity), 0.0
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Three stock CSVs and a news CSV covering the same period."""
+    for symbol, frame in make_stock_frames(3, n_days=120, start='2020-01-01').items():
+        frame.to_csv(tmp_path / f'{symbol}.csv')
+    news = make_news(600, n_symbols=3, seed=3)
+    offsets = pd.to_timedelta(range(len(news)), unit='h') * 4
+    news['date'] = (pd.Timestamp('2020-01-01 13:00:00') + offsets).astype(str)
+    news.to_csv(tmp_path / 'news.csv', index=False)
+    return tmp_path
+
+
+def build(data_dir):
+    paths = {symbol: str(data_dir / f'{symbol}.csv') for symbol in 'ABC'}
+    return build_pipeline(paths, str(data_dir / 'news.csv'), cache_dir=str(data_dir / 'stages'),
+                          scorer='tests.test_pipeline:word_scorer', lags=[0, 1], max_workers=2)
+
+
+class TestPipeline:
+    """Test DAG execution, stage caching and invalidation."""
+
+    def test_incremental_runs(self, data_dir):
+        """Test a rerun is fully cached and a changed CSV reruns only its branch."""
+        first = build(data_dir).run()
+        assert all(item['status'] == 'ran' for item in first.values())
+        assert len(first) == 3 * 4 + 6
+
+        assert all(item['status'] == 'cached' for item in build(data_dir).run().values())
+
+        frame = pd.read_csv(data_dir / 'B.csv')
+        frame.loc[len(frame) - 1, 'Close'] *= 1.1
+        frame.to_csv(data_dir / 'B.csv', index=False)
+        ran = {key for key, item in build(data_dir).run().items() if item['status'] == 'ran'}
+        assert ran == {'prices:B', 'prices_clean:B', 'indicators:B', 'metrics:B',
+                       'metrics_summary', 'daily_sentiment', 'correlation'}
+
+    def test_outputs(self, data_dir):
+        """Test stage outputs and loading them from the cache."""
+        pipeline = build(data_dir)
+        pipeline.run(targets=['correlation', 'metrics_summary'])
+
+        table = load_output('correlation', str(data_dir / 'stages'))
+        assert set(table['stock']) == {'A', 'B', 'C'} and set(table['lag']) == {0, 1}
+        summary = load_output('metrics_summary', str(data_dir / 'stages'))
+        assert summary['Symbol'].tolist() == ['A', 'B', 'C']
+        frame, metrics = load_output('metrics:A', str(data_dir / 'stages'))
+        assert {'SMA_20', 'RSI', 'Daily_Return', 'Volatility'} <= set(frame.columns)
+        assert metrics['Total_Return'] == pytest.approx(frame['Cumulative_Return'].iloc[-1] * 100)
+        daily = load_output('daily_sentiment', str(data_dir / 'stages'))
+        assert daily['article_count'].sum() > 0
+
+    def test_edited_stage_reruns(self, tmp_path, monkeypatch):
+        """Test changing a stage's code or a helper it calls reruns it and its dependents."""
+        monkeypatch.syspath_prepend(str(tmp_path))
+        (tmp_path / 'edited_base.py').write_text('def base():\n    return 1\n')
+
+        def run(body, helper='return value'):
+            (tmp_path / 'edited_helpers.py').write_text(f'def adjust(value):\n    {helper}\n')
+            (tmp_path / 'edited_stages.py').write_text(
+                f'from edited_helpers import adjust\n\n\ndef double(value):\n    {body}\n')
+            importlib.reload(importlib.import_module('edited_helpers'))
+            module = importlib.reload(importlib.import_module('edited_stages'))
+            base = importlib.import_module('edited_base')
+            pipeline = Pipeline(str(tmp_path / 'stages'))
+            pipeline.add('base', base.base)
+            pipeline.add('double', module.double, inputs=['base'])
+            return {key: item['status'] for key, item in pipeline.run().items()}
+
+        assert run('return adjust(value * 2)') == {'base': 'ran', 'double': 'ran'}
+        assert run('return adjust(value * 2)') == {'base': 'cached', 'double': 'cached'}
+        assert run('return adjust(value * 2 + 100)') == {'base': 'cached', 'double': 'ran'}
+        assert load_output('double', str(tmp_path / 'stages')) == 102
+        assert run('return adjust(value * 2 + 100)', 'return -value') == {'base': 'cached', 'double': 'ran'}
+        assert load_output('double', str(tmp_path / 'stages')) == -102
+
+    def test_plan_and_failures(self, data_dir, tmp_path, capsys):
+        """Test dry runs, target selection and stage errors."""
+        args = ['--news', str(data_dir / 'news.csv'), '--data-dir', str(data_dir), '--symbols', 'A', 'B',
+                '--cache-dir', str(data_dir / 'cli'), '--scorer', 'tests.test_pipeline:word_scorer']
+        assert main(args + ['--dry-run', '--targets', 'metrics:A']) == 0
+        assert capsys.readouterr().out.split() == ['run', 'prices:A', 'run', 'prices_clean:A',
+                                                   'run', 'indicators:A', 'run', 'metrics:A']
+        assert main(args) == 0
+        assert os.path.exists(data_dir / 'cli' / 'correlation.pkl')
+
+        pipeline = Pipeline(str(tmp_path / 'failing'))
+        pipeline.add('broken', int, params={'x': 'not a number'})
+        with pytest.raises(RuntimeError, match='broken'):
+            pipeline.run()
+        with pytest.raises(ValueError):
+            pipeline.add('orphan', int, inputs=['missing'])
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
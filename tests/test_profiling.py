@@ -0,0 +1,80 @@
+"""
+Tests for the per-stage profiling hooks.
+"""
+import json
+
+import pytest
+import numpy as np
+
+from src import profiling
+from src.profiling import instrument, profile_report, stage, summary
+from src.synthetic import make_news
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    """Leave instrumentation disabled and empty after each test."""
+    yield
+    profiling.disable()
+    profiling.reset()
+
+
+@instrument(rows=0)
+def allocate(values):
+    """Allocate about 8 bytes per value and return their sum."""
+    return np.ones(len(values) * 1000).sum()
+
+
+class TestProfiling:
+    """Test stage records, memory peaks, cProfile capture and the disabled path."""
+
+    def test_disabled_records_nothing(self):
+        """Test decorated functions and stages are pass-throughs when disabled."""
+        with stage('idle') as current:
+            current.rows = 10
+        assert allocate([1, 2]) == 2000
+        assert profiling.records() == []
+        assert list(summary().columns) == profiling.SUMMARY_COLUMNS
+
+    def test_nested_stages(self, tmp_path):
+        """Test rows, nesting, peak memory and the JSON-lines log."""
+        log_file = tmp_path / 'stages.jsonl'
+        with profiling.profiling(log_file=str(log_file)) as session:
+            with stage('outer', rows=3):
+                allocate(list(range(1000)))
+                allocate(list(range(10)))
+            with pytest.raises(ZeroDivisionError):
+                with stage('broken'):
+                    1 / 0
+
+        records = session.records()
+        assert [r['stage'] for r in records] == ['allocate', 'allocate', 'outer', 'broken']
+        assert records[0]['rows'] == 1000 and records[0]['parent'] == 'outer'
+        assert records[0]['peak_mb'] == pytest.approx(7.6, abs=0.5)
+        assert records[2]['peak_mb'] >= records[0]['peak_mb']
+        assert records[3]['error'] == 'ZeroDivisionError'
+        assert [json.loads(line)['stage'] for line in log_file.read_text().splitlines()] == \
+            [r['stage'] for r in records]
+
+        table = session.summary().set_index('stage')
+        assert table.loc['allocate', 'calls'] == 2
+        assert table.loc['allocate', 'rows'] == 1010
+        assert table.loc['outer', 'wall_s'] >= table.loc['allocate', 'wall_s']
+
+    def test_cprofile_capture(self):
+        """Test one library stage is captured with cProfile on demand."""
+        from src.keywords import count_keywords
+
+        headlines = make_news(200)['headline']
+        with profiling.profiling(memory=False, profile='count_keywords'):
+            count_keywords(headlines, stop_words=set())
+            allocate([1])
+
+        assert 'count_chunk' in profile_report('count_keywords')
+        with pytest.raises(KeyError):
+            profile_report('allocate')
+        assert summary().set_index('stage').loc['count_keywords', 'rows'] == 200
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
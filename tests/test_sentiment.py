@@ -0,0 +1,96 @@
+"""
+Tests for the batched, cached sentiment engine.
+"""
+import os
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.sentiment import DEFAULT_CACHE_PATH, SentimentCache, score_headlines
+
+
+CALLS = []
+
+
+def keyword_scorer(text):
+    """Deterministic stand-in for TextBlob that records each call."""
+    CALLS.append(text)
+    lowered = text.lower()
+    polarity = ('beat' in lowered or 'high' in lowered) - ('miss' in lowered or 'low' in lowered)
+    return float(polarity), len(text) / 100.0
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    """Clear the scorer call log before each test."""
+    CALLS.clear()
+
+
+HEADLINES = pd.Series([
+    'Stocks That Hit 52-Week Highs On Friday',
+    'Apple earnings beat estimates',
+    'Stocks That Hit 52-Week Highs On Friday',
+    None,
+    'Tesla deliveries miss forecasts',
+    'Stocks That Hit 52-Week Highs On Friday',
+], index=[10, 11, 12, 13, 14, 15])
+
+
+class TestScoreHeadlines:
+    """Test deduplication, caching and alignment of scores."""
+
+    def test_scores_aligned_and_deduplicated(self):
+        """Test each distinct headline is scored once and scores align to rows."""
+        scores, stats = score_headlines(HEADLINES, scorer=keyword_scorer, cache=None)
+
+        assert len(CALLS) == 3
+        assert list(scores.index) == list(HEADLINES.index)
+        assert list(scores.columns) == ['polarity', 'subjectivity']
+        assert scores.loc[[10, 12, 15], 'polarity'].tolist() == [1.0, 1.0, 1.0]
+        assert scores.loc[14, 'polarity'] == -1.0
+        assert scores.loc[13].isna().all()
+        assert stats['rows'] == 6 and stats['unique'] == 3 and stats['scored'] == 3
+        assert stats['hit_rate'] == 0.0
+        assert stats['headlines_per_second'] > 0
+
+    def test_persistent_cache_scores_only_new_text(self, tmp_path):
+        """Test a re-run with new data only scores never-seen headlines."""
+        path = str(tmp_path / 'sentiment.sqlite')
+        first, _ = score_headlines(HEADLINES, scorer=keyword_scorer, cache=path)
+        CALLS.clear()
+
+        more = pd.concat([HEADLINES, pd.Series(['Dividend raised'], index=[16])])
+        second, stats = score_headlines(more, scorer=keyword_scorer, cache=path)
+
+        assert CALLS == ['Dividend raised']
+        assert stats['cache_hits'] == 3 and stats['hit_rate'] == pytest.approx(0.75)
+        pd.testing.assert_frame_equal(second.loc[HEADLINES.index], first)
+        with SentimentCache(path) as cache:
+            assert len(cache) == 4
+
+    def test_default_cache_is_anchored_at_project_root(self):
+        """Test the default cache path does not depend on the working directory."""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        assert DEFAULT_CACHE_PATH == os.path.join(root, '.cache', 'sentiment.sqlite')
+
+    def test_cache_namespaced_by_scorer(self):
+        """Test results of different scorers never mix in one cache."""
+        cache = SentimentCache(':memory:')
+        score_headlines(HEADLINES, scorer=keyword_scorer, cache=cache, name='v1')
+        _, stats = score_headlines(HEADLINES, scorer=keyword_scorer, cache=cache, name='v2')
+        assert stats['scored'] == 3
+        assert len(cache) == 6
+
+    def test_parallel_batches(self):
+        """Test process-pool scoring returns the same scores."""
+        headlines = pd.Series([f'Headline {i % 7} beat' for i in range(40)])
+        serial, _ = score_headlines(headlines, scorer=keyword_scorer, cache=None)
+        parallel, stats = score_headlines(headlines, scorer=keyword_scorer, cache=None,
+                                          n_jobs=2, batch_size=2)
+        np.testing.assert_array_equal(parallel.to_numpy(), serial.to_numpy())
+        assert stats['scored'] == 7
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,71 @@
+"""
+Tests for the parallel stock CSV loader.
+"""
+import os
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.stock_loader import load_stocks, stock_cache_path
+
+
+@pytest.fixture
+def stock_dir(tmp_path, sample_stock_data):
+    """Write three valid stock CSVs and one with a missing column."""
+    for symbol in ['AAPL', 'MSFT', 'NVDA']:
+        sample_stock_data.reset_index().to_csv(tmp_path / f'{symbol}.csv', index=False)
+    sample_stock_data.reset_index().drop(columns=['Volume']).to_csv(tmp_path / 'BAD.csv', index=False)
+    return tmp_path
+
+
+class TestLoadStocks:
+    """Test concurrent loading, validation and caching."""
+
+    def test_load_symbols(self, stock_dir, sample_stock_data):
+        """Test symbols load in order with the notebook's dtypes."""
+        stock_data, errors = load_stocks(['NVDA', 'AAPL'], data_dir=str(stock_dir))
+
+        assert list(stock_data) == ['NVDA', 'AAPL']
+        assert errors == {}
+        df = stock_data['AAPL']
+        assert pd.api.types.is_datetime64_any_dtype(df.index)
+        assert all(pd.api.types.is_numeric_dtype(df[col]) for col in ['Open', 'High', 'Low', 'Close', 'Volume'])
+        np.testing.assert_allclose(df['Close'], sample_stock_data['Close'])
+
+    def test_errors_reported_per_file(self, stock_dir):
+        """Test missing files and missing columns are reported, not raised."""
+        stock_data, errors = load_stocks(['AAPL', 'BAD', 'GOOG'], data_dir=str(stock_dir))
+
+        assert list(stock_data) == ['AAPL']
+        assert 'Volume' in errors['BAD']
+        assert errors['GOOG'].startswith('File not found')
+
+    def test_glob_pattern(self, stock_dir):
+        """Test loading every CSV matched by a glob pattern."""
+        stock_data, errors = load_stocks(pattern=str(stock_dir / '*.csv'), use_processes=True,
+                                         max_workers=2)
+        assert sorted(stock_data) == ['AAPL', 'MSFT', 'NVDA']
+        assert list(errors) == ['BAD']
+
+    def test_cache_reused_until_file_changes(self, stock_dir):
+        """Test the cached parse is reused and refreshed after a change."""
+        path = str(stock_dir / 'AAPL.csv')
+        load_stocks(['AAPL'], data_dir=str(stock_dir))
+        cache_path = stock_cache_path(path)
+        assert os.path.exists(cache_path)
+        first_mtime = os.stat(cache_path).st_mtime_ns
+
+        load_stocks(['AAPL'], data_dir=str(stock_dir))
+        assert os.stat(cache_path).st_mtime_ns == first_mtime
+
+        df = pd.read_csv(path)
+        df.loc[0, 'Close'] = 1.0
+        df.to_csv(path, index=False)
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+        stock_data, _ = load_stocks(['AAPL'], data_dir=str(stock_dir))
+        assert stock_data['AAPL']['Close'].iloc[0] == 1.0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
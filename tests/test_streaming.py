@@ -0,0 +1,80 @@
+"""
+Tests for incremental (streaming) indicator state.
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.indicators import IndicatorSpec, compute_indicators
+from src.streaming import StreamingIndicators
+
+
+@pytest.fixture
+def price_history():
+    """Create 300 days of High/Low/Close prices."""
+    np.random.seed(3)
+    n = 300
+    close = 100 + np.cumsum(np.random.randn(n))
+    return pd.DataFrame({
+        'High': close + np.random.rand(n) * 3,
+        'Low': close - np.random.rand(n) * 3,
+        'Close': close,
+    }, index=pd.date_range('2020-01-01', periods=n, freq='D'))
+
+
+def assert_matches_batch(values, columns, row):
+    """Compare a dict of streamed values with one row of the batch block."""
+    for j, column in enumerate(columns):
+        expected = row[j]
+        if np.isnan(expected):
+            assert np.isnan(values[column]), column
+        else:
+            assert values[column] == pytest.approx(expected, rel=1e-9, abs=1e-9), column
+
+
+class TestStreamingIndicators:
+    """Test StreamingIndicators against the batch indicator engine."""
+
+    def test_seed_then_update_matches_batch(self, price_history):
+        """Test O(1) updates after seeding reproduce the batch values."""
+        columns, block = compute_indicators(price_history)
+        stream = StreamingIndicators().seed(price_history.iloc[:250])
+
+        for i in range(250, len(price_history)):
+            bar = price_history.iloc[i]
+            values = stream.update(bar['Close'], bar['High'], bar['Low'])
+            assert_matches_batch(values, columns, block[i])
+
+    def test_update_from_empty_state(self, price_history):
+        """Test warm-up NaNs match the batch engine when streaming from bar one."""
+        specs = [IndicatorSpec('sma', window=5), IndicatorSpec('rsi', window=3),
+                 IndicatorSpec('bollinger', window=5), IndicatorSpec('atr', window=3)]
+        history = price_history.iloc[:20]
+        columns, block = compute_indicators(history, specs)
+        stream = StreamingIndicators(specs)
+
+        for i in range(len(history)):
+            bar = history.iloc[i]
+            values = stream.update(bar['Close'], bar['High'], bar['Low'])
+            assert_matches_batch(values, columns, block[i])
+
+    def test_snapshot_and_restore(self, price_history, tmp_path):
+        """Test a restored state continues exactly like the original."""
+        stream = StreamingIndicators().seed(price_history.iloc[:200])
+        path = tmp_path / 'AAPL.json'
+        stream.save(path)
+        restored = StreamingIndicators.load(path)
+
+        for i in range(200, 220):
+            bar = price_history.iloc[i]
+            original = stream.update(bar['Close'], bar['High'], bar['Low'])
+            resumed = restored.update(bar['Close'], bar['High'], bar['Low'])
+            assert original.keys() == resumed.keys()
+            for column in original:
+                assert np.isnan(original[column]) and np.isnan(resumed[column]) \
+                    or original[column] == resumed[column]
+        assert restored.n_bars == 220
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
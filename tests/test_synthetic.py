@@ -0,0 +1,75 @@
+"""
+Tests for the synthetic data generators and the benchmark suite.
+"""
+import pytest
+import pandas as pd
+
+from scripts.benchmark import BenchmarkConfig, compare_to_baseline, main, run_benchmarks
+from src.dates import parse_mixed_dates
+from src.panel import PricePanel
+from src.synthetic import make_news, make_returns, make_stock_frames, make_symbols
+
+
+class TestSyntheticData:
+    """Test generated data has the requested size and shape."""
+
+    def test_news_parameters(self):
+        """Test row count, cardinalities, duplicate ratio and date-format mix."""
+        news = make_news(5000, n_symbols=40, n_publishers=15, duplicate_ratio=0.4, offset_ratio=0.25, seed=1)
+
+        assert list(news.columns) == ['Unnamed: 0', 'headline', 'url', 'publisher', 'date', 'stock']
+        assert len(news) == 5000
+        assert news['stock'].nunique() == 40
+        assert news['publisher'].nunique() <= 15
+        assert news['headline'].duplicated().mean() == pytest.approx(0.4, abs=0.01)
+        assert news['date'].str.endswith('-04:00').mean() == pytest.approx(0.25, abs=0.03)
+
+        parsed, unparsed = parse_mixed_dates(news['date'])
+        assert len(unparsed) == 0 and parsed.notna().all()
+        pd.testing.assert_frame_equal(news, make_news(5000, 40, 15, 0.4, 0.25, seed=1))
+
+    def test_prices_and_returns(self):
+        """Test OHLC consistency and symbol naming."""
+        frames = make_stock_frames(30, n_days=60)
+        assert len(frames) == 30 and len(set(make_symbols(1000))) == 1000
+        for frame in frames.values():
+            assert len(frame) == 60
+            assert (frame['High'] >= frame[['Open', 'Close']].max(axis=1)).all()
+            assert (frame['Low'] <= frame[['Open', 'Close']].min(axis=1)).all()
+        assert PricePanel.from_frames(frames).shape[:2] == (60, 30)
+        assert make_returns(100, 3).shape == (100, 3)
+
+
+class TestBenchmarkSuite:
+    """Test stage timing, the JSON results and regression flagging."""
+
+    def test_run_and_compare(self, tmp_path):
+        """Test a small run records every stage and flags slowdowns."""
+        config = BenchmarkConfig(rows=500, symbols=5, days=40, publishers=5)
+        results = run_benchmarks(config, repeat=1)
+        assert set(results['stages']) == {'load_news', 'load_news_cached', 'parse_dates', 'keywords',
+                                          'keyword_sketch', 'phrases', 'near_duplicates', 'indicators',
+                                          'metrics', 'window_metrics', 'event_study', 'backtest'}
+        assert all(stage['throughput'] > 0 and stage['peak_mb'] > 0 for stage in results['stages'].values())
+
+        slower = {'stages': {'keywords': {'seconds': 2.0, 'peak_mb': 10.0},
+                             'phrases': {'seconds': 1.0, 'peak_mb': 10.0}}}
+        baseline = {'stages': {'keywords': {'seconds': 1.0, 'peak_mb': 10.0},
+                               'phrases': {'seconds': 1.0, 'peak_mb': 5.0},
+                               'metrics': {'seconds': 1.0, 'peak_mb': 1.0}}}
+        regressions = compare_to_baseline(slower, baseline, threshold=0.2)
+        assert [(r['stage'], r['metric']) for r in regressions] == [('keywords', 'seconds'), ('phrases', 'peak_mb')]
+        assert compare_to_baseline(slower, baseline, threshold=1.5) == []
+
+    def test_cli_baseline(self, tmp_path):
+        """Test writing a baseline and comparing a run against it."""
+        baseline = tmp_path / 'baseline.json'
+        args = ['--rows', '200', '--symbols', '3', '--days', '30', '--stages', 'phrases,metrics', '--repeat', '1',
+                '--baseline', str(baseline)]
+        assert main(args + ['--update-baseline']) == 0
+        assert baseline.exists()
+        assert main(args + ['--threshold', '100']) == 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,107 @@
+"""
+Tests for the temporal rollup cube.
+"""
+import os
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.temporal import TemporalCube, cube_cache_path, load_cube
+
+
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+@pytest.fixture
+def news():
+    """Random naive UTC timestamps over three years with a few NaT rows."""
+    rng = np.random.default_rng(11)
+    n = 5000
+    df = pd.DataFrame({
+        'date': pd.Timestamp('2019-03-10') + pd.to_timedelta(rng.integers(0, 3 * 365 * 86400, n), unit='s'),
+        'stock': rng.choice(['AAPL', 'MSFT', 'NVDA', 'TSLA'], n),
+    })
+    df.loc[::97, 'date'] = pd.NaT
+    return df
+
+
+class TestTemporalCube:
+    """Test derived series against the notebook's value_counts/groupby code."""
+
+    def test_series_match_notebook(self, news):
+        """Test yearly, monthly, weekday, hourly, daily and month series."""
+        cube = TemporalCube.from_frame(news)
+        dates = news['date'].dropna()
+
+        pd.testing.assert_series_equal(cube.by_year(), dates.dt.year.rename('year').value_counts().sort_index(),
+                                       check_dtype=False, check_index_type=False)
+        pd.testing.assert_series_equal(cube.by_month(), dates.dt.month.rename('month').value_counts().sort_index(),
+                                       check_dtype=False, check_index_type=False)
+        pd.testing.assert_series_equal(cube.by_hour(), dates.dt.hour.rename('hour').value_counts().sort_index(),
+                                       check_dtype=False, check_index_type=False)
+        weekdays = dates.dt.day_name().rename('day_of_week').value_counts().reindex(DAY_ORDER)
+        pd.testing.assert_series_equal(cube.by_weekday(), weekdays, check_dtype=False)
+
+        daily = dates.groupby(dates.dt.normalize()).size()
+        np.testing.assert_array_equal(cube.daily().index, daily.index)
+        np.testing.assert_array_equal(cube.daily(), daily)
+        assert cube.daily(include_empty=True).sum() == len(dates)
+
+        monthly = dates.groupby(dates.dt.to_period('M')).size()
+        assert cube.monthly().index.equals(monthly.index)
+        np.testing.assert_array_equal(cube.monthly(), monthly)
+
+    def test_groups_and_time_zone(self, news):
+        """Test per-group series and local-time day/hour boundaries."""
+        cube = TemporalCube.from_frame(news, by='stock', tz='America/New_York')
+        local = news['date'].dt.tz_localize('UTC').dt.tz_convert('America/New_York')
+
+        aapl = local[news['stock'] == 'AAPL'].dropna()
+        np.testing.assert_array_equal(cube.by_hour('AAPL'), aapl.dt.hour.value_counts().sort_index())
+        both = local[news['stock'].isin(['AAPL', 'TSLA'])].dropna()
+        np.testing.assert_array_equal(cube.daily(['AAPL', 'TSLA']),
+                                      both.groupby(both.dt.date).size())
+        with pytest.raises(KeyError):
+            cube.hourly('GOOG')
+
+    def test_incremental_update_and_persistence(self, news, tmp_path):
+        """Test updating with new days equals a full build and survives save/load."""
+        full = TemporalCube.from_frame(news, by='stock')
+        recent = news['date'] >= pd.Timestamp('2021-01-01')
+        cube = TemporalCube.from_frame(news[recent & (news['stock'] != 'NVDA')], by='stock')
+        cube.update(news[~recent]).update(news[recent & (news['stock'] == 'NVDA')])
+
+        assert cube.start_day == full.start_day
+        np.testing.assert_array_equal(cube.counts, full.counts)
+        assert cube.groups.equals(full.groups)
+        assert (cube.group_counts != full.group_counts).nnz == 0
+
+        path = str(tmp_path / 'cube.npz')
+        cube.save(path)
+        loaded = TemporalCube.load(path)
+        np.testing.assert_array_equal(loaded.counts, cube.counts)
+        pd.testing.assert_series_equal(loaded.by_hour('NVDA'), cube.by_hour('NVDA'))
+
+    def test_load_cube_cache(self, tmp_path):
+        """Test the cube is cached next to the news cache and rebuilt on change."""
+        path = tmp_path / 'raw_analyst_ratings.csv'
+        pd.DataFrame({
+            'headline': ['a', 'b', 'c'],
+            'publisher': ['P', 'P', 'Q'],
+            'date': ['2020-06-05 10:30:54-04:00', '2020-06-05 00:00:00', '2020-06-08 00:00:00'],
+            'stock': ['AAPL', 'MSFT', 'AAPL'],
+        }).to_csv(path, index=False)
+
+        cube = load_cube(str(path), by='publisher')
+        assert os.path.exists(cube_cache_path(str(path), by='publisher'))
+        assert cube.daily().tolist() == [2, 1]
+        assert load_cube(str(path), by='publisher').by_hour('P').tolist() == [1, 1]
+
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('d,Q,2020-06-09 09:00:00,MSFT\n')
+        assert load_cube(str(path), by='publisher').daily().tolist() == [2, 1, 1]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])